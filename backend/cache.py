@@ -0,0 +1,116 @@
+# Copyright 2026 Coreframe Systems (Nexus Protocol)
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#        http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+
+"""
+🏛️ NEXUS SUMMARY CACHE (Phase 1.4.x)
+
+Bounded in-process LRU cache (optional TTL) for hot, rarely-changing reads
+such as vault summaries polled by healthchecks and open Mini App sessions.
+
+CONSISTENCY MODEL:
+The writer invalidates affected keys after every commit. A read that started
+before an invalidation must not repopulate the cache with pre-commit data, so
+callers capture `epoch` before reading and pass it to `put()`; stale fills are
+discarded. The cache is only touched from the event loop (no locking).
+
+Processes that do not commit themselves (multi-process followers, see
+workers.py) pass a `version` callable instead: a cheap read of the shared
+ledger version. Any change since the last lookup clears the whole cache (and
+bumps `epoch`, so fills that straddle the change are discarded too).
+"""
+
+import os
+import time
+from collections import OrderedDict
+from typing import Any, Callable, Dict, Hashable, Iterable, Optional
+
+SUMMARY_CACHE_SIZE = max(0, int(os.getenv("NEXUS_SUMMARY_CACHE_SIZE", "10000")))
+SUMMARY_CACHE_TTL_S = max(0.0, float(os.getenv("NEXUS_SUMMARY_CACHE_TTL_S", "0")))  # 0 = no expiry
+
+_MISSING = object()
+
+
+class LRUCache:
+    def __init__(
+        self, maxsize: int = SUMMARY_CACHE_SIZE, ttl: float = SUMMARY_CACHE_TTL_S,
+        version: Optional[Callable[[], int]] = None,
+    ):
+        self.maxsize = maxsize
+        self.ttl = ttl
+        self.version = version
+        self.epoch = 0
+        self._seen_version: Optional[int] = None
+        self._data: "OrderedDict[Hashable, tuple]" = OrderedDict()
+        self.hits = self.misses = self.evictions = self.expirations = self.invalidations = 0
+
+    def get(self, key: Hashable, default: Any = None) -> Any:
+        self._sync()
+        entry = self._data.get(key, _MISSING)
+        if entry is _MISSING:
+            self.misses += 1
+            return default
+        value, expires_at = entry
+        if expires_at and expires_at <= time.monotonic():
+            del self._data[key]
+            self.expirations += 1
+            self.misses += 1
+            return default
+        self._data.move_to_end(key)
+        self.hits += 1
+        return value
+
+    def put(self, key: Hashable, value: Any, epoch: Optional[int] = None) -> bool:
+        """Stores `value` unless an invalidation happened since `epoch` was read."""
+        self._sync()
+        if self.maxsize <= 0 or (epoch is not None and epoch != self.epoch):
+            return False
+        expires_at = time.monotonic() + self.ttl if self.ttl else 0.0
+        self._data[key] = (value, expires_at)
+        self._data.move_to_end(key)
+        while len(self._data) > self.maxsize:
+            self._data.popitem(last=False)
+            self.evictions += 1
+        return True
+
+    def invalidate(self, keys: Iterable[Hashable]) -> None:
+        self.epoch += 1
+        for key in keys:
+            if self._data.pop(key, _MISSING) is not _MISSING:
+                self.invalidations += 1
+
+    def clear(self) -> None:
+        self.epoch += 1
+        self._data.clear()
+
+    def _sync(self) -> None:
+        if self.version is None:
+            return
+        current = self.version()
+        if current != self._seen_version:
+            self._seen_version = current
+            self.clear()
+
+    def stats(self) -> Dict[str, Any]:
+        lookups = self.hits + self.misses
+        return {
+            "size": len(self._data),
+            "maxsize": self.maxsize,
+            "ttl_s": self.ttl,
+            "hits": self.hits,
+            "misses": self.misses,
+            "hit_rate": round(self.hits / lookups, 4) if lookups else 0.0,
+            "evictions": self.evictions,
+            "expirations": self.expirations,
+            "invalidations": self.invalidations,
+        }
@@ -0,0 +1,99 @@
+# Copyright 2026 Coreframe Systems (Nexus Protocol)
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#        http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+
+"""
+🏛️ NEXUS PAGINATION CURSORS (Phase 1.4.x)
+
+`/api/transactions` hands out one opaque token per direction instead of a raw
+`{ts, id}` pair: `next_cursor` pages to older rows, `newer_cursor` fetches
+what committed after the newest row the client holds (incremental refresh).
+
+FORMAT:
+`<payload>.<tag>`, both base64url. The payload is `[direction, ts, id]` with
+`ts` in the vault's stored representation (TEXT or integer microseconds, see
+timestamps.py). Older pages seek on `(ts, id)`; newer pages on `id` alone,
+because ids follow commit order and timestamps do not. The tag is a truncated HMAC-SHA256 over the sovereign id and
+the payload. A token is therefore only valid for the id it was issued to and
+cannot be edited into an arbitrary index probe.
+
+KEY:
+`NEXUS_CURSOR_SECRET`. Unset, each process draws a random key at startup:
+cursors then expire on restart and are not portable between nodes, and a
+client that gets `INVALID_CURSOR` simply reloads its first page. Workers of
+one multi-process node share a random key file instead (`share_key`), since
+consecutive pages may be served by different processes.
+"""
+
+import os
+import hmac
+import json
+import base64
+import hashlib
+from typing import Any, Tuple
+
+OLDER, NEWER = "older", "newer"
+CURSOR_SECRET = os.getenv("NEXUS_CURSOR_SECRET", "")
+TAG_BYTES = 16
+
+_key = CURSOR_SECRET.encode() or os.urandom(32)
+_DIRECTIONS = {OLDER: "o", NEWER: "n"}
+_CODES = {code: direction for direction, code in _DIRECTIONS.items()}
+
+
+def share_key(path: str) -> None:
+    """
+    Adopts the key stored at `path`, creating it (0600) if missing. The
+    caller serializes this across processes; a configured secret wins.
+    """
+    global _key
+    if CURSOR_SECRET:
+        return
+    try:
+        with open(path, "rb") as f:
+            key = f.read()
+    except FileNotFoundError:
+        key = b""
+    if len(key) < 32:
+        key = os.urandom(32)
+        fd = os.open(path, os.O_WRONLY | os.O_CREAT | os.O_TRUNC, 0o600)
+        with os.fdopen(fd, "wb") as f:
+            f.write(key)
+    _key = key
+
+def _b64(data: bytes) -> str:
+    return base64.urlsafe_b64encode(data).decode().rstrip("=")
+
+def _unb64(text: str) -> bytes:
+    return base64.urlsafe_b64decode(text + "=" * (-len(text) % 4))
+
+def _tag(user_id: str, payload: str) -> str:
+    digest = hmac.new(_key, f"{user_id}.{payload}".encode(), hashlib.sha256).digest()
+    return _b64(digest[:TAG_BYTES])
+
+def encode_cursor(user_id: str, direction: str, ts: Any, row_id: int) -> str:
+    payload = _b64(json.dumps([_DIRECTIONS[direction], ts, row_id], separators=(",", ":")).encode())
+    return f"{payload}.{_tag(user_id, payload)}"
+
+def decode_cursor(token: str, user_id: str) -> Tuple[str, Any, int]:
+    """Returns (direction, ts, id); raises ValueError("INVALID_CURSOR")."""
+    try:
+        payload, tag = token.split(".")
+        if not hmac.compare_digest(tag, _tag(user_id, payload)):
+            raise ValueError("bad tag")
+        code, ts, row_id = json.loads(_unb64(payload))
+        if not isinstance(ts, (str, int)) or isinstance(ts, bool) or not isinstance(row_id, int):
+            raise ValueError("bad position")
+        return _CODES[code], ts, row_id
+    except (ValueError, KeyError, TypeError) as e:
+        raise ValueError("INVALID_CURSOR") from e
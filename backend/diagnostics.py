@@ -0,0 +1,250 @@
+# Copyright 2026 Coreframe Systems (Nexus Protocol)
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#        http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+
+"""
+🏛️ NEXUS DIAGNOSTICS (Phase 1.4.x)
+
+Opt-in production diagnostics, enabled with `NEXUS_DIAGNOSTICS=true`:
+
+1. Request profiler: a random `NEXUS_PROFILE_SAMPLE` fraction of HTTP
+   requests runs under cProfile. Stats are aggregated across samples and
+   written to `<dir>/profile.pstats` (plus a readable `profile.txt`) every
+   `NEXUS_PROFILE_FLUSH` samples and at shutdown. cProfile follows the event
+   loop thread only, so one request is profiled at a time and any coroutine
+   interleaved with it is counted too; SQL time is covered by (2).
+2. Slow-query log: vault connections get an SQLite trace callback (statement
+   start) and a progress handler (statement still executing). A statement
+   that executes longer than `NEXUS_SLOW_QUERY_MS` is appended to
+   `<dir>/slow_queries.jsonl` with its `EXPLAIN QUERY PLAN`, which is run once
+   the connection is idle again (never inside an SQLite callback).
+3. tracemalloc on demand via `/api/diagnostics/tracemalloc/{start,snapshot,stop}`;
+   each snapshot reports the top allocation sites and the growth since the
+   previous one, and is dumped to disk for offline comparison.
+
+When the flag is off, no middleware is installed and no callback is
+registered: the request and query paths are exactly the undiagnosed ones.
+"""
+
+import os
+import json
+import time
+import random
+import logging
+import cProfile
+import pstats
+import sqlite3
+import threading
+import tracemalloc
+from typing import Optional, List, Dict, Any
+
+_logger = logging.getLogger("nexus.diagnostics")
+
+# --- 1. TUNABLES (Environment Overridable) ---
+DIAGNOSTICS = os.getenv("NEXUS_DIAGNOSTICS", "false").lower() == "true"
+DIAG_DIR = os.getenv("NEXUS_DIAG_DIR", os.path.join(os.path.dirname(os.path.abspath(__file__)), "diagnostics"))
+PROFILE_SAMPLE = min(1.0, max(0.0, float(os.getenv("NEXUS_PROFILE_SAMPLE", "0.01"))))
+PROFILE_FLUSH = max(1, int(os.getenv("NEXUS_PROFILE_FLUSH", "50")))
+SLOW_QUERY_MS = float(os.getenv("NEXUS_SLOW_QUERY_MS", "50"))
+PROGRESS_OPS = 1000  # SQLite VM instructions between progress-handler calls
+TRACEMALLOC_FRAMES = 16
+TRACEMALLOC_TOP = 25
+
+EXPLAINABLE = ("SELECT", "WITH", "INSERT", "UPDATE", "DELETE", "REPLACE")
+
+
+# --- 2. REQUEST PROFILER ---
+class RequestProfiler:
+    """ASGI wrapper that profiles a sampled fraction of HTTP requests."""
+
+    def __init__(self, app, sample: float = PROFILE_SAMPLE, flush_every: int = PROFILE_FLUSH, directory: str = DIAG_DIR):
+        self.app = app
+        self.sample = sample
+        self.flush_every = flush_every
+        self.directory = directory
+        self.samples = 0
+        self._stats: Optional[pstats.Stats] = None
+        self._active = False
+        self._pending = 0
+        profiler_registry.append(self)
+
+    async def __call__(self, scope, receive, send):
+        if scope["type"] != "http" or self._active or random.random() >= self.sample:
+            return await self.app(scope, receive, send)
+        self._active = True
+        profile = cProfile.Profile()
+        profile.enable()
+        try:
+            await self.app(scope, receive, send)
+        finally:
+            profile.disable()
+            self._active = False
+            self._add(profile)
+
+    def _add(self, profile: cProfile.Profile) -> None:
+        if self._stats is None:
+            self._stats = pstats.Stats(profile)
+        else:
+            self._stats.add(profile)
+        self.samples += 1
+        self._pending += 1
+        if self._pending >= self.flush_every:
+            self.flush()
+
+    def flush(self) -> Optional[str]:
+        """Writes the aggregated stats; returns the .pstats path (None if nothing was sampled)."""
+        if self._stats is None:
+            return None
+        os.makedirs(self.directory, exist_ok=True)
+        path = os.path.join(self.directory, "profile.pstats")
+        self._stats.dump_stats(path)
+        with open(os.path.join(self.directory, "profile.txt"), "w") as f:
+            f.write(f"# {self.samples} sampled requests (sample={self.sample})\n")
+            pstats.Stats(path, stream=f).sort_stats("cumulative").print_stats(60)
+        self._pending = 0
+        return path
+
+profiler_registry: List[RequestProfiler] = []
+
+
+# --- 3. SLOW-QUERY LOG ---
+class _Statement:
+    __slots__ = ("sql", "started", "last_seen")
+
+    def __init__(self, sql: str, now: float):
+        self.sql, self.started, self.last_seen = sql, now, now
+
+
+class SlowQueryLog:
+    """
+    Per-connection statement timing from SQLite callbacks. A statement's
+    execution time is measured from its trace callback to the last progress
+    callback it produced, so time the caller spends between fetches is not
+    charged to SQLite.
+    """
+
+    def __init__(self, threshold_ms: float = SLOW_QUERY_MS, directory: str = DIAG_DIR):
+        self.threshold = threshold_ms / 1000.0
+        self.directory = directory
+        self.logged = 0
+        self._current: Dict[int, _Statement] = {}
+        self._pending: Dict[int, List[Dict[str, Any]]] = {}
+        self._lock = threading.Lock()  # Guards the log file only
+
+    def attach(self, conn: sqlite3.Connection) -> None:
+        key = id(conn)
+        self._pending[key] = []
+
+        def on_statement(sql: str) -> None:
+            now = time.perf_counter()
+            self._close(key)
+            self._current[key] = _Statement(sql, now)
+
+        def on_progress() -> int:
+            current = self._current.get(key)
+            if current is not None:
+                current.last_seen = time.perf_counter()
+            return 0  # Never interrupt the statement
+
+        conn.set_trace_callback(on_statement)
+        conn.set_progress_handler(on_progress, PROGRESS_OPS)
+
+    def _close(self, key: int) -> None:
+        current = self._current.pop(key, None)
+        if current is None:
+            return
+        elapsed = current.last_seen - current.started
+        if elapsed >= self.threshold:
+            self._pending[key].append({"sql": current.sql, "ms": round(elapsed * 1000, 3)})
+
+    def flush(self, conn: sqlite3.Connection) -> None:
+        """Runs while the connection is idle: explains and writes any slow statements."""
+        key = id(conn)
+        self._close(key)
+        pending = self._pending.get(key)
+        if not pending:
+            return
+        self._pending[key] = []
+        conn.set_trace_callback(None)  # EXPLAIN must not time itself
+        try:
+            for entry in pending:
+                entry["plan"] = self._explain(conn, entry["sql"])
+                entry["at"] = time.strftime("%Y-%m-%d %H:%M:%S", time.gmtime())
+                _logger.warning(f"🐢 SLOW_QUERY {entry['ms']}ms: {entry['sql'][:200]}")
+        finally:
+            self.attach(conn)
+        os.makedirs(self.directory, exist_ok=True)
+        with self._lock:
+            with open(os.path.join(self.directory, "slow_queries.jsonl"), "a") as f:
+                for entry in pending:
+                    f.write(json.dumps(entry) + "\n")
+            self.logged += len(pending)
+
+    @staticmethod
+    def _explain(conn: sqlite3.Connection, sql: str) -> List[str]:
+        if not sql.lstrip().upper().startswith(EXPLAINABLE):
+            return []
+        try:
+            return [row[-1] for row in conn.execute("EXPLAIN QUERY PLAN " + sql)]
+        except sqlite3.Error as e:
+            return [f"EXPLAIN_FAILED: {e}"]
+
+slow_log: Optional[SlowQueryLog] = SlowQueryLog() if DIAGNOSTICS else None
+
+
+# --- 4. TRACEMALLOC ON DEMAND ---
+_last_snapshot: Optional[tracemalloc.Snapshot] = None
+
+def tracemalloc_action(action: str, top: int = TRACEMALLOC_TOP, directory: Optional[str] = None) -> Dict[str, Any]:
+    """`start` begins tracing, `snapshot` reports top sites (and growth since the last snapshot), `stop` ends it."""
+    global _last_snapshot
+    if action == "start":
+        if not tracemalloc.is_tracing():
+            tracemalloc.start(TRACEMALLOC_FRAMES)
+        _last_snapshot = None
+        return {"tracing": True}
+    if action == "stop":
+        tracemalloc.stop()
+        _last_snapshot = None
+        return {"tracing": False}
+    if action != "snapshot":
+        raise ValueError("UNKNOWN_ACTION")
+    if not tracemalloc.is_tracing():
+        raise ValueError("TRACEMALLOC_NOT_STARTED")
+
+    snapshot = tracemalloc.take_snapshot().filter_traces((
+        tracemalloc.Filter(False, tracemalloc.__file__),
+        tracemalloc.Filter(False, "<frozen importlib._bootstrap*>"),
+    ))
+    directory = directory or DIAG_DIR
+    os.makedirs(directory, exist_ok=True)
+    path = os.path.join(directory, f"tracemalloc_{time.strftime('%Y%m%d_%H%M%S', time.gmtime())}.dump")
+    snapshot.dump(path)
+    current, peak = tracemalloc.get_traced_memory()
+    report = {
+        "tracing": True,
+        "traced_bytes": current,
+        "peak_bytes": peak,
+        "dump": path,
+        "top": [_site(stat.traceback, stat.size, stat.count) for stat in snapshot.statistics("lineno")[:top]],
+        "growth": None,
+    }
+    if _last_snapshot is not None:
+        diff = snapshot.compare_to(_last_snapshot, "lineno")[:top]
+        report["growth"] = [dict(_site(d.traceback, d.size, d.count), size_diff=d.size_diff) for d in diff]
+    _last_snapshot = snapshot
+    return report
+
+def _site(traceback: tracemalloc.Traceback, size: int, count: int) -> Dict[str, Any]:
+    frame = traceback[0]
+    return {"site": f"{frame.filename}:{frame.lineno}", "size": size, "count": count}
@@ -0,0 +1,137 @@
+# Copyright 2026 Coreframe Systems (Nexus Protocol)
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#        http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+
+"""
+🏛️ NEXUS HISTORY EXPORT (Phase 1.4.x)
+
+Streams a sovereign's full history (newest first) as NDJSON or CSV in
+constant memory. The stream walks the `(user_id, timestamp DESC, id DESC)`
+index in keyset chunks of `NEXUS_EXPORT_CHUNK` rows, each a short pooled
+read (hot segment, then archive files), so an export never pins a reader
+connection or a WAL snapshot for its whole duration. New splits are always
+newer than the cursor, so a chunked walk still emits each row exactly once.
+
+INTEGRITY:
+Every emitted row is appended to a running Merkle accumulator (same leaf
+hash as `page_merkle_root`, over the stored representation). The stream
+ends with a trailer carrying the root over everything emitted. Integer
+vaults also emit the stored minor units (`*_minor` columns) next to the
+major-unit values, so a client can recompute every leaf from the export.
+
+RESUME:
+Every chunk is followed by a checkpoint carrying the cursor of its last row
+and an opaque `resume` token (cursor + accumulator state). Passing the token
+back (`?resume=`) continues after that row, and the final root then covers
+the whole export as if it had never been interrupted.
+
+NDJSON: one JSON object per row; `{"_checkpoint": {...}}` and a final
+`{"_end": {...}}` line. CSV: a header, one line per row; checkpoints and the
+trailer are `#`-prefixed comment lines (e.g. `pandas.read_csv(comment="#")`).
+"""
+
+import io
+import os
+import csv
+import json
+import base64
+from typing import Optional, AsyncIterator, Dict, Any, List
+
+from backend.merkle import MerkleFrontier, hash_leaf
+from backend.segments import read_history
+from backend.timestamps import render
+
+EXPORT_CHUNK = max(1, int(os.getenv("NEXUS_EXPORT_CHUNK", "1000")))
+EXPORT_FORMATS = {"ndjson": "application/x-ndjson", "csv": "text/csv"}
+
+# Ledger column order (SELECT * FROM transactions)
+COLUMNS = ("id", "user_id", "amount", "creator_share", "user_pool_share", "network_fee", "timestamp")
+# Stored integers of an integer vault, appended after COLUMNS (leaf preimage = these + timestamp)
+MINOR_COLUMNS = ("amount_minor", "creator_share_minor", "user_pool_share_minor", "network_fee_minor")
+
+
+# --- 1. RESUME TOKENS ---
+def encode_resume(cursor_ts: Any, cursor_id: int, acc: MerkleFrontier) -> str:
+    state = {"ts": cursor_ts, "id": cursor_id, "n": acc.size, "f": acc.frontier}
+    return base64.urlsafe_b64encode(json.dumps(state, separators=(",", ":")).encode()).decode().rstrip("=")
+
+def decode_resume(token: str) -> Dict[str, Any]:
+    """Returns {cursor_ts, cursor_id, acc}; raises ValueError("INVALID_RESUME_TOKEN")."""
+    try:
+        state = json.loads(base64.urlsafe_b64decode(token + "=" * (-len(token) % 4)))
+        frontier = {int(level): str(node) for level, node in state["f"].items()}
+        acc = MerkleFrontier(int(state["n"]), frontier)
+        if sum(1 << level for level in frontier) != acc.size:
+            raise ValueError("frontier does not match size")
+        ts = state["ts"]  # Stored representation: TEXT or integer microseconds
+        return {"cursor_ts": ts if isinstance(ts, int) else str(ts), "cursor_id": int(state["id"]), "acc": acc}
+    except (ValueError, KeyError, TypeError, AttributeError) as e:
+        raise ValueError("INVALID_RESUME_TOKEN") from e
+
+
+# --- 2. STREAM ---
+async def stream_export(
+    pool: Any,
+    user_id: str,
+    fmt: str,
+    scale: int,
+    cursor_ts: Optional[Any] = None,
+    cursor_id: Optional[int] = None,
+    acc: Optional[MerkleFrontier] = None,
+    chunk: Optional[int] = None,
+    unit: Optional[str] = None,
+) -> AsyncIterator[str]:
+    """Yields one encoded text block per chunk, then the trailer."""
+    chunk = chunk or EXPORT_CHUNK
+    acc = acc or MerkleFrontier()
+    resumed = acc.size > 0
+    emitted = 0
+    columns = COLUMNS + MINOR_COLUMNS if scale else COLUMNS
+    if fmt == "csv" and not resumed:
+        yield _csv_lines([columns])
+
+    while True:
+        rows = await pool.read(read_history, user_id, cursor_ts, cursor_id, chunk, True, unit)
+        if not rows:
+            break
+        for row in rows:
+            acc.append(hash_leaf(row[2:]))  # amount .. timestamp, as stored
+        cursor_ts, cursor_id = rows[-1][6], rows[-1][0]
+        if scale:
+            rows = [(*row[:2], *(v / scale for v in row[2:6]), render(row[6]), *row[2:6]) for row in rows]
+        else:
+            rows = [(*row[:6], render(row[6])) for row in rows]
+        emitted += len(rows)
+        checkpoint = {
+            "cursor": {"ts": render(cursor_ts), "id": cursor_id},
+            "rows": acc.size,
+            "resume": encode_resume(cursor_ts, cursor_id, acc),
+        }
+        if fmt == "csv":
+            yield _csv_lines(rows) + f"# checkpoint {json.dumps(checkpoint, separators=(',', ':'))}\n"
+        else:
+            yield "".join(json.dumps(dict(zip(columns, row))) + "\n" for row in rows) + \
+                json.dumps({"_checkpoint": checkpoint}) + "\n"
+        if len(rows) < chunk:
+            break
+
+    trailer = {"rows": acc.size, "emitted": emitted, "merkle_root": acc.root(), "amount_scale": scale, "complete": True}
+    if fmt == "csv":
+        yield f"# end {json.dumps(trailer, separators=(',', ':'))}\n"
+    else:
+        yield json.dumps({"_end": trailer}) + "\n"
+
+def _csv_lines(rows: List[Any]) -> str:
+    buffer = io.StringIO()
+    csv.writer(buffer, lineterminator="\n").writerows(rows)
+    return buffer.getvalue()
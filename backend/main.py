@@ -27,18 +27,36 @@ This node performs:
 """
 
 import os
+import hmac
+import math
 import sqlite3
 import re
-import hashlib
-from datetime import datetime, timezone
+import time
+from datetime import datetime, timedelta, timezone
 from contextlib import asynccontextmanager
 from typing import Optional, List, Dict, Any
 from fastapi import FastAPI, HTTPException, Depends, Request, Response, Query
 from fastapi.middleware.cors import CORSMiddleware
-from fastapi.staticfiles import StaticFiles
-from fastapi.responses import FileResponse, JSONResponse
-from pydantic import BaseModel
+from fastapi.responses import JSONResponse, PlainTextResponse, StreamingResponse
+from pydantic import BaseModel, ValidationError
 from dotenv import load_dotenv
+from backend.vault import VaultUnavailable
+from backend.shards import (
+    VAULT_SHARDS, ShardedVault, check_layout, describe_vault, init_vault, resolve_reshard_id, shard_paths,
+)
+from backend.cache import LRUCache
+from backend.units import AMOUNT_SCALE, MAX_MINOR, to_minor, to_major, split_minor
+from backend.timestamps import MICROS, TIMESTAMP_UNIT, now_stored, render as render_ts, to_stored
+from backend.cursors import NEWER, OLDER, decode_cursor, encode_cursor, share_key
+from backend.segments import read_history, read_totals
+from backend.merkle import compute_leaf_hash, generate_merkle_root, leaf_hashes, read_root, read_proof
+from backend.metrics import CONTENT_TYPE, MERKLE_SECONDS, PAGE_ROWS, REGISTRY, MetricsMiddleware, render
+from backend import diagnostics
+from backend.static_assets import StaticManifest
+from backend.export import EXPORT_FORMATS, decode_resume, stream_export
+from backend import snapshots
+from backend import workers
+from backend.rollups import GRANULARITIES, NODE_SCOPE, ROLLUP_MAX_BUCKETS, bucket_of, read_rollups
 
 # --- 1. SOVEREIGN BOOTSTRAP ---
 load_dotenv()
@@ -54,91 +72,189 @@ CLIENT_BUILD_DIR = os.path.abspath(os.path.join(BASE_DIR, "..", "client", "build
 PHASE_DEV = os.getenv("PHASE_DEV", "false").lower() == "true"
 DEV_NAMESPACE_ID = "999"
 
+# Operator routes (/api/admin/...): shared token, optionally pinned to sovereign ids
+ADMIN_TOKEN = os.getenv("NEXUS_ADMIN_TOKEN", "")  # Unset = no operator access over HTTP
+ADMIN_IDS = {uid.strip() for uid in os.getenv("NEXUS_ADMIN_IDS", "").split(",") if uid.strip()}
+
+# Upper bound on /api/execute_split/batch items (one request = one transaction)
+MAX_BATCH_ITEMS = max(1, int(os.getenv("NEXUS_MAX_BATCH_ITEMS", "1000")))
+
 class SplitRequest(BaseModel):
     amount: float
     nonce: Optional[int] = None
 
+class SplitBatchRequest(BaseModel):
+    # Items stay raw so one malformed entry is reported per-item, not as a 422 for the batch
+    items: List[Any]
+    all_or_nothing: bool = False
+
 # --- 2. CRYPTOGRAPHIC PRIMITIVES (Merkle Anchoring) ---
-def compute_leaf_hash(row: Dict[str, Any]) -> str:
-    """
-    Deterministic serialization for Merkle feasibility.
-    Optimized for speed: Uses pipe-delimited string concatenation.
-    """
-    payload = "|".join([
-        str(row["amount"]),
-        str(row["creator_share"]),
-        str(row["user_pool_share"]),
-        str(row["network_fee"]),
-        str(row["timestamp"]) 
-    ])
-    return hashlib.sha256(payload.encode("utf-8")).hexdigest()
-
-def generate_merkle_root(hashes: List[str]) -> Optional[str]:
-    """
-    Reduces a list of transaction hashes to a single Merkle Root.
-    Used for verifying page integrity without re-downloading entire history.
-    """
-    if not hashes: return None
-    nodes = hashes[:]
-    while len(nodes) > 1:
-        if len(nodes) % 2 != 0: 
-            nodes.append(nodes[-1]) # Handle odd number of leaves
-        level = []
-        for i in range(0, len(nodes), 2):
-            combined = nodes[i] + nodes[i+1]
-            level.append(hashlib.sha256(combined.encode("utf-8")).hexdigest())
-        nodes = level
-    return nodes[0]
+# Leaf/page hashing and the ledger-wide accumulator live in backend/merkle.py
+# so the vault writer and the research anchor share one definition.
 
 # --- 3. LIFESPAN: DATABASE HARDENING ---
+vault = ShardedVault()  # One pool + group-commit writer per shard file (K=1: the classic vault)
+vault_scale = 0  # Minor units per major unit (0 = legacy REAL ledger); read from the vault
+vault_ts_unit = "text"  # Ledger timestamp storage ("us" = INTEGER microseconds); read from the vault
+summary_cache = LRUCache()
+static_assets = StaticManifest()  # Flutter build, indexed once at startup (see static_assets.py)
+snapshot_service = snapshots.SnapshotService()  # Online backups on their own thread (see snapshots.py)
+coordinator = workers.WorkerCoordinator()  # NEXUS_WORKERS > 1: one elected writer, follower readers (see workers.py)
+
+def _invalidate_summaries(rows) -> None:
+    # Write-through: drop committed users' totals before their callers resume
+    summary_cache.invalidate({row[0] for row in rows})
+
+vault.add_commit_listener(_invalidate_summaries)
+vault.add_commit_listener(coordinator.on_commit)  # Other workers' caches (shared ledger version)
+
+# Requests followers forward to the elected writer (see workers.py)
+async def _ipc_submit(message: Dict[str, Any]) -> List[int]:
+    return await vault.writers[message["shard"]].submit_many([tuple(row) for row in message["rows"]])
+
+async def _ipc_snapshot_start(message: Dict[str, Any]) -> Dict[str, Any]:
+    snapshot_service.start(vault.paths, snapshots.snapshot_root(DB_PATH))
+    return _snapshot_status()
+
+async def _ipc_snapshot_status(message: Dict[str, Any]) -> Dict[str, Any]:
+    return _snapshot_status()
+
+def _snapshot_status() -> Dict[str, Any]:
+    # Paths relative to the snapshot root / vault directory: never expose the host layout
+    status = snapshot_service.status()
+    if status["last"]:
+        status["last"] = dict(status["last"], path=os.path.relpath(status["last"]["path"], snapshots.snapshot_root(DB_PATH)))
+    if status["last_error"]:
+        status["last_error"] = status["last_error"].replace(os.path.dirname(os.path.abspath(DB_PATH)) + os.sep, "")
+    return status
+
+IPC_HANDLERS = {"submit": _ipc_submit, "snapshot_start": _ipc_snapshot_start, "snapshot_status": _ipc_snapshot_status}
+
+async def _start_writers() -> None:
+    """Group-commit writers, the follower socket and the snapshot schedule (writer processes only)."""
+    await vault.start()
+    await coordinator.serve(IPC_HANDLERS)
+    if snapshots.SNAPSHOT_INTERVAL_S:
+        snapshot_service.schedule(lambda: vault.paths, snapshots.snapshot_root(DB_PATH))
+        print(f"📸 [BACKUP] Online snapshot every {snapshots.SNAPSHOT_INTERVAL_S:g}s → "
+              f"{snapshots.snapshot_root(DB_PATH)} (keep {snapshots.SNAPSHOT_KEEP})")
+
+async def _promote() -> None:
+    # Failover: the writer exited and this follower won the election
+    vault.reset_writers()
+    summary_cache.version = None
+    summary_cache.clear()
+    await _start_writers()
+    print(f"👑 [WORKERS] pid {os.getpid()} promoted to vault writer")
+
+def _wal_sizes():
+    # Sampled at scrape time: a WAL that keeps growing means checkpoints are starved by readers
+    for i, path in enumerate(vault.paths):
+        wal = path + "-wal"
+        yield (str(i),), os.path.getsize(wal) if os.path.exists(wal) else 0
+
+REGISTRY.gauge("nexus_vault_wal_bytes", "Size of each shard's write-ahead log file.", ("shard",), _wal_sizes)
+
+
 @asynccontextmanager
 async def lifespan(app: FastAPI):
     """
     Initializes the SQLite Vault with production-grade hardening.
     Enables WAL mode for concurrency and Auto-Vacuum for long-term health.
     """
-    conn = sqlite3.connect(DB_PATH)
-    try:
-        # Performance & Safety Pragmas
-        conn.execute("PRAGMA journal_mode=WAL;")  # Write-Ahead Logging for concurrency
-        conn.execute("PRAGMA synchronous=NORMAL;") # Balance between safety and speed
-        conn.execute("PRAGMA foreign_keys=ON;")    # Enforce relational integrity
-        conn.execute("PRAGMA auto_vacuum=INCREMENTAL;") # Keep DB file size efficient
-
-        # Core Ledger Table
-        conn.execute("""
-            CREATE TABLE IF NOT EXISTS transactions (
-                id INTEGER PRIMARY KEY AUTOINCREMENT, 
-                user_id TEXT NOT NULL, 
-                amount REAL NOT NULL, 
-                creator_share REAL NOT NULL, 
-                user_pool_share REAL NOT NULL, 
-                network_fee REAL NOT NULL, 
-                timestamp TEXT NOT NULL
-            )
-        """)
-        
-        # Critical Index for O(1) Cursor Pagination
-        # Prevents full-table scans during history retrieval
-        conn.execute("CREATE INDEX IF NOT EXISTS idx_tx_user_ts_id ON transactions (user_id, timestamp DESC, id DESC);")
-        conn.commit()
-    except sqlite3.Error as e:
-        print(f"🔥 [CRITICAL] Vault Initialization Failed: {e}")
-        raise e
-    finally:
-        conn.close()
+    global vault_scale, vault_ts_unit
+    scales, ts_units = set(), set()
+    # Multi-process: workers boot one at a time; the first elects itself writer and runs the DDL
+    with coordinator.startup(DB_PATH):
+        check_layout(DB_PATH, VAULT_SHARDS)  # Never boot next to rows written with another K
+        paths = shard_paths(DB_PATH, VAULT_SHARDS)
+        for path in paths:
+            conn = sqlite3.connect(path)
+            try:
+                # Performance & Safety Pragmas, Ledger, Index, Balances, Segments, Merkle
+                # (followers only read the units the writer recorded)
+                state = init_vault(conn, AMOUNT_SCALE, TIMESTAMP_UNIT) if coordinator.writes else describe_vault(conn)
+            except sqlite3.Error as e:
+                print(f"🔥 [CRITICAL] Vault Initialization Failed: {e}")
+                raise e
+            finally:
+                conn.close()
+            if state["balances_built"]:
+                print(f"🧮 [OK] Balances Materialized From Ledger: {path}")
+            if state["rollups_built"]:
+                print(f"📅 [OK] Hour/Day Rollups Built From Ledger: {path}")
+            if state["merkle_built"]:
+                print(f"🌳 [OK] Merkle Frontier Built From Ledger: {path}")
+            scales.add(state["scale"])
+            ts_units.add(state["ts_unit"])
+        if coordinator.role != workers.SINGLE:
+            share_key(coordinator.files["cursor_key"])  # Any worker may serve the next page
+
+    # Storage Units: fixed per vault file (REAL legacy or INTEGER minor units)
+    if len(scales) != 1:
+        raise RuntimeError(f"VAULT_SCALE_MISMATCH: shards store scales {sorted(scales)}")
+    vault_scale = scales.pop()
+    if AMOUNT_SCALE and AMOUNT_SCALE != vault_scale:
+        print(f"⚠️ [UNITS] Vault stores scale={vault_scale}; NEXUS_AMOUNT_SCALE={AMOUNT_SCALE} ignored. "
+              "Run 'scripts/vault_admin.py migrate-minor-units' to convert.")
+
+    # Timestamp Storage: fixed per vault file (TEXT legacy or INTEGER microseconds)
+    if len(ts_units) != 1:
+        raise RuntimeError(f"VAULT_TS_UNIT_MISMATCH: shards store timestamps as {sorted(ts_units)}")
+    vault_ts_unit = ts_units.pop()
+    if TIMESTAMP_UNIT != vault_ts_unit:
+        print(f"⚠️ [TIME] Vault stores {vault_ts_unit} timestamps; NEXUS_TIMESTAMP_UNIT={TIMESTAMP_UNIT} ignored. "
+              "Run 'scripts/vault_admin.py migrate-timestamps' to convert.")
     
+    # Long-lived connections: bounded reader pool + one writer (group-committed)
+    summary_cache.clear()
+    if os.path.exists(CLIENT_BUILD_DIR):
+        gateway = static_assets.load(CLIENT_BUILD_DIR)
+        print(f"🌐 [GATEWAY] {gateway['files']} client files indexed: {gateway['bytes'] / 1024:.0f} KiB "
+              f"→ {gateway['compressed_bytes'] / 1024:.0f} KiB compressed{' (br+gzip)' if gateway['brotli'] else ' (gzip)'}")
+    vault.open(paths)
+    coordinator.bind(vault, _promote)
+    if coordinator.writes:
+        await _start_writers()
+    else:
+        vault.use_writers([workers.RemoteWriter(coordinator, i) for i in range(len(paths))])
+        summary_cache.version = coordinator.version.read  # Commits land in another process
+
     print(f"🏛️ [OK] Nexus Sovereign Node Active: {NODE_ID}")
     print(f"🛡️ [SEC] Ingress Policy: Cloudflare Zero Trust (Strict)")
-    print(f"📂 [PATH] Database Anchored: {DB_PATH}")
+    print(f"📂 [PATH] Database Anchored: {DB_PATH}" + (f" ({vault.shards} shards)" if vault.shards > 1 else ""))
+    print(f"💱 [UNITS] Amount Storage: {'INTEGER x' + str(vault_scale) if vault_scale else 'REAL (legacy)'}")
+    print(f"🕒 [TIME] Timestamp Storage: {'INTEGER µs since epoch' if vault_ts_unit == MICROS else 'TEXT (legacy)'}")
+    print(f"🗄️ [IO] Reader Pool: {vault.pools[0].size} connections per shard")
+    if coordinator.writes:
+        print(f"✍️ [IO] Group Commit: batch={vault.writers[0].batch_size} linger={vault.writers[0].linger * 1000:g}ms")
+    if coordinator.role != workers.SINGLE:
+        print(f"🧵 [WORKERS] {coordinator.workers} processes; pid {os.getpid()} is the {coordinator.role} "
+              f"(writes via {coordinator.files['socket']})")
+    if diagnostics.DIAGNOSTICS:
+        print(f"🩺 [DIAG] Profiling {diagnostics.PROFILE_SAMPLE:.1%} of requests, "
+              f"slow queries >= {diagnostics.SLOW_QUERY_MS:g}ms → {diagnostics.DIAG_DIR}")
     yield
     
-    # Graceful Shutdown: Attempt to checkpoint WAL
+    # Flush queued splits and release pooled connections before the WAL is checkpointed
+    await coordinator.stop_serving()  # Followers' in-flight writes are answered first
+    await snapshot_service.stop()
+    await vault.stop()
+    vault.close()
+    writes = coordinator.writes
+    coordinator.close()  # Releases the election only after the writers flushed
+    summary_cache.version = None
+    for profiler in diagnostics.profiler_registry:
+        profiler.flush()
+
+    # Graceful Shutdown: Attempt to checkpoint WAL (the writer's job; followers may still be reading)
     try:
-        conn = sqlite3.connect(DB_PATH)
-        conn.execute("PRAGMA wal_checkpoint(TRUNCATE);")
-        conn.close()
-        print("💤 [OK] Vault Checkpointed & Closed.")
+        if writes:
+            for path in paths:
+                conn = sqlite3.connect(path)
+                conn.execute("PRAGMA wal_checkpoint(TRUNCATE);")
+                conn.close()
+            print("💤 [OK] Vault Checkpointed & Closed.")
     except Exception: 
         pass
 
@@ -163,12 +279,19 @@ app.add_middleware(
     allow_headers=["Authorization", "Content-Type", "X-Nexus-TMA", "X-Nexus-Backup-ID"],
 )
 
+# Opt-in sampled request profiler (not installed at all unless NEXUS_DIAGNOSTICS=true)
+if diagnostics.DIAGNOSTICS:
+    app.add_middleware(diagnostics.RequestProfiler)
+
+# Outermost layer: per-route latency and in-flight count for /api/metrics
+app.add_middleware(MetricsMiddleware)
+
+@app.exception_handler(VaultUnavailable)
+async def vault_unavailable_handler(request: Request, exc: VaultUnavailable):
+    # Fail closed but retryable: the vault is offline or every reader is busy
+    return JSONResponse(status_code=503, content={"detail": str(exc)})
+
 # --- 5. UTILITIES ---
-def get_db_connection():
-    """Returns a connection tailored for high-throughput reads."""
-    conn = sqlite3.connect(DB_PATH, timeout=10.0) # Lower timeout to fail fast under extreme load
-    conn.row_factory = sqlite3.Row
-    return conn
 
 def resolve_sovereign_id(provided_id: Optional[str]) -> str:
     """Sanitizes and resolves the Sovereign Identity."""
@@ -179,6 +302,26 @@ def resolve_sovereign_id(provided_id: Optional[str]) -> str:
     # Ensure ID is alphanumeric (basic injection prevention)
     return clean_id if clean_id.isalnum() else DEV_NAMESPACE_ID
 
+def apply_policy(amount: float) -> Optional[tuple]:
+    """
+    60/30/10 split in the vault's storage units: (amount, creator, pool, fee),
+    or None if the amount is not a positive, representable magnitude.
+    """
+    if not amount > 0 or not math.isfinite(amount):
+        return None
+    if vault_scale:
+        minor = to_minor(amount, vault_scale)
+        # Above 2^63 - 1 SQLite cannot bind it: the writer would fail the whole batch
+        return (minor, *split_minor(minor)) if 0 < minor <= MAX_MINOR else None
+    # Deterministic Math (Float precision handled via rounding)
+    return amount, round(amount * 0.60, 2), round(amount * 0.30, 2), round(amount * 0.10, 2)
+
+MONEY_COLUMNS = ("amount", "creator_share", "user_pool_share", "network_fee")
+
+def split_view(row: tuple) -> Dict[str, float]:
+    return {"creator": to_major(row[2], vault_scale), "pool": to_major(row[3], vault_scale),
+            "fee": to_major(row[4], vault_scale)}
+
 # --- 6. MULTICHAIN GUARD (The Doorman) ---
 async def multichain_guard(request: Request) -> Dict[str, Any]:
     """
@@ -203,6 +346,24 @@ async def multichain_guard(request: Request) -> Dict[str, Any]:
     # 3. Default Fallback (Fail-Safe)
     return {"verified": False, "user_id": DEV_NAMESPACE_ID, "adapter": "guest"}
 
+def is_admin(request: Request, auth: Dict[str, Any]) -> bool:
+    """Operator credential: NEXUS_ADMIN_TOKEN (X-Nexus-Admin-Token or Bearer), plus an id in NEXUS_ADMIN_IDS if set."""
+    if not ADMIN_TOKEN:
+        return False
+    token = request.headers.get("X-Nexus-Admin-Token", "")
+    bearer = request.headers.get("Authorization", "")
+    if not token and bearer.lower().startswith("bearer "):
+        token = bearer[7:].strip()
+    if not hmac.compare_digest(token.encode(), ADMIN_TOKEN.encode()):
+        return False
+    return not ADMIN_IDS or (auth.get("verified") is True and auth.get("user_id") in ADMIN_IDS)
+
+async def admin_guard(request: Request, auth: dict = Depends(multichain_guard)) -> Dict[str, Any]:
+    """Dependency for operator-only routes (403 ADMIN_REQUIRED otherwise)."""
+    if not is_admin(request, auth):
+        raise HTTPException(status_code=403, detail="ADMIN_REQUIRED")
+    return auth
+
 # --- 7. DETERMINISTIC API ROUTES ---
 
 @app.get("/api/vault_summary")
@@ -210,20 +371,14 @@ async def multichain_guard(request: Request) -> Dict[str, Any]:
 async def get_summary(user_id: Optional[str] = None, auth: dict = Depends(multichain_guard)):
     """Aggregates vault state for a specific identity."""
     target_id = resolve_sovereign_id(user_id or auth.get("user_id"))
-    
-    conn = get_db_connection()
-    try:
-        # Optimized Summation Query
-        row = conn.execute("""
-            SELECT 
-                COALESCE(SUM(creator_share), 0) as c, 
-                COALESCE(SUM(user_pool_share), 0) as p 
-            FROM transactions 
-            WHERE user_id = ?
-        """, (target_id,)).fetchone()
-        return {"creator_total": round(row['c'], 2), "pool_total": round(row['p'], 2)}
-    finally:
-        conn.close()
+    totals = summary_cache.get(target_id)
+    if totals is None:
+        epoch = summary_cache.epoch  # Discards this fill if a commit lands mid-read
+        # Hot balance row + sealed-segment totals (backend/segments.py)
+        row = await vault.pool(target_id).read(read_totals, target_id)
+        totals = (to_major(row['c'], vault_scale), to_major(row['p'], vault_scale))
+        summary_cache.put(target_id, totals, epoch)
+    return {"creator_total": totals[0], "pool_total": totals[1]}
 
 @app.post("/api/execute_split")
 async def execute_split(payload: SplitRequest, auth: dict = Depends(multichain_guard)):
@@ -231,40 +386,90 @@ async def execute_split(payload: SplitRequest, auth: dict = Depends(multichain_g
     The Core Policy Engine: Enforces the 60/30/10 Economic Split.
     This logic is immutable and hard-coded for Phase 1.
     """
-    if payload.amount <= 0:
+    split = apply_policy(payload.amount)
+    if split is None:
         raise HTTPException(status_code=400, detail="INVALID_MAGNITUDE")
     
     uid = resolve_sovereign_id(auth.get("user_id"))
     
-    # Deterministic Math (Float precision handled via rounding)
-    c = round(payload.amount * 0.60, 2)
-    p = round(payload.amount * 0.30, 2)
-    f = round(payload.amount * 0.10, 2)
-    
-    # Sanity Check: Ensure parts sum to total (accounting for rounding drift)
-    # In a real bank, we'd store integers (cents), but for this Phase 1 protocol, floats are spec.
-    
-    conn = get_db_connection()
+    # Integer vaults split exactly (fee takes the remainder); legacy REAL vaults
+    # round each share to cents, which may drift from the total by a cent.
+    ts = now_stored(vault_ts_unit)
+    row = (uid, *split, ts)
+    # Resolves only once the batch carrying this row has been committed
+    await vault.writer(uid).submit(row)
+    return {
+        "status": "committed", 
+        "resolved_id": uid, 
+        "policy": "60/30/10", 
+        "split": split_view(row),
+        "timestamp": render_ts(ts)
+    }
+
+def _validate_batch_item(item: Any) -> Any:
+    """Returns the item's split (see `apply_policy`), or an error code string if rejected."""
     try:
-        ts = datetime.now(timezone.utc).strftime("%Y-%m-%d %H:%M:%S")
-        conn.execute(
-            "INSERT INTO transactions (user_id, amount, creator_share, user_pool_share, network_fee, timestamp) VALUES (?, ?, ?, ?, ?, ?)",
-            (uid, payload.amount, c, p, f, ts)
-        )
-        conn.commit()
-        return {
-            "status": "committed", 
-            "resolved_id": uid, 
-            "policy": "60/30/10", 
-            "split": {"creator": c, "pool": p, "fee": f},
-            "timestamp": ts
-        }
-    finally:
-        conn.close()
+        amount = SplitRequest.model_validate(item).amount
+    except ValidationError:
+        return "INVALID_PAYLOAD"
+    split = apply_policy(amount)
+    return "INVALID_MAGNITUDE" if split is None else split
+
+@app.post("/api/execute_split/batch")
+async def execute_split_batch(payload: SplitBatchRequest, auth: dict = Depends(multichain_guard)):
+    """
+    Bulk Policy Engine: applies the 60/30/10 split to every item and commits
+    all accepted rows in a single vault transaction. Results are returned in
+    request order. Invalid items are rejected individually unless
+    `all_or_nothing` is set, in which case any rejection commits nothing.
+    """
+    if len(payload.items) > MAX_BATCH_ITEMS:
+        raise HTTPException(status_code=400, detail="BATCH_TOO_LARGE")
+
+    uid = resolve_sovereign_id(auth.get("user_id"))
+    checked = [_validate_batch_item(item) for item in payload.items]
+    accepted = [(i, v) for i, v in enumerate(checked) if not isinstance(v, str)]
+    rejected = len(checked) - len(accepted)
+    abort = payload.all_or_nothing and rejected > 0
+
+    # Same deterministic math as /api/execute_split, one pass over the batch
+    ts = now_stored(vault_ts_unit)
+    shown = render_ts(ts)
+    rows = [] if abort else [(uid, *split, ts) for _, split in accepted]
+    # Resolves once every row is durable (all rows share one transaction)
+    tx_ids = await vault.writer(uid).submit_many(rows) if rows else []
+
+    splits = iter(zip(rows, tx_ids))
+    results: List[Dict[str, Any]] = []
+    for i, v in enumerate(checked):
+        if isinstance(v, str) or abort:
+            error = v if isinstance(v, str) else "BATCH_ABORTED"
+            results.append({"index": i, "status": "rejected", "error": error})
+        else:
+            row, tx_id = next(splits)
+            results.append({
+                "index": i,
+                "status": "committed",
+                "tx_id": tx_id,
+                "split": split_view(row),
+                "timestamp": shown,
+            })
+
+    committed = len(rows)
+    return {
+        "status": "committed" if committed and not rejected else ("partial" if committed else "rejected"),
+        "resolved_id": uid,
+        "shard": vault.shard(uid),  # tx_ids are per shard (see /api/proof)
+        "policy": "60/30/10",
+        "committed": committed,
+        "rejected": len(checked) - committed,
+        "results": results,
+    }
 
 @app.get("/api/transactions")
 async def get_transactions(
     limit: int = Query(50, ge=1, le=100),
+    cursor: Optional[str] = None,
     cursor_ts: Optional[str] = None,
     cursor_id: Optional[int] = None,
     auth: dict = Depends(multichain_guard)
@@ -272,88 +477,310 @@ async def get_transactions(
     """
     Fetches transaction history using Cursor-Based Pagination.
     Scales to 10M+ rows without performance degradation.
+    `cursor` is an opaque token from a previous page: `next_cursor` continues
+    into older rows, `newer_cursor` returns rows committed since (newest
+    first, up to `limit`; `has_more` means call again with the new token).
+    `cursor_ts` / `cursor_id` are the deprecated raw form of `next_cursor`.
+    In an integer vault each item also carries the stored `*_minor` values,
+    which (with `timestamp`) are what `page_merkle_root` and proofs hash.
     """
     uid = resolve_sovereign_id(auth.get("user_id"))
-    params = [uid]
+    direction = OLDER
+    try:
+        if cursor:
+            direction, cursor_ts, cursor_id = decode_cursor(cursor, uid)
+        elif cursor_ts:
+            cursor_ts = to_stored(cursor_ts, vault_ts_unit)
+    except ValueError:
+        raise HTTPException(status_code=400, detail="INVALID_CURSOR")
+    newer = direction == NEWER
+
+    # Cursor Logic: Fetch records OLDER (or NEWER) than the cursor, hot segment
+    # first, continuing into sealed archive segments (same index, same ordering)
+    # Fetch one extra to detect "next page"
+    rows_raw = await vault.pool(uid).read(
+        read_history, uid, cursor_ts, cursor_id, limit + 1, False, vault_ts_unit, newer
+    )
+
+    has_more = len(rows_raw) > limit
+    rows = rows_raw[:limit]
+    if newer:
+        rows.reverse()  # Fetched in commit order, from the cursor up
     
-    # Base Query using Index
-    query = "SELECT * FROM transactions WHERE user_id = ?"
+    PAGE_ROWS.labels().observe(len(rows))
     
-    # Cursor Logic: Fetch records OLDER than the cursor
-    if cursor_ts and cursor_id:
-        query += " AND (timestamp < ? OR (timestamp = ? AND id < ?))"
-        params.extend([cursor_ts, cursor_ts, cursor_id])
+    # Calculate Merkle Root for this page of data (leaves hash the canonical timestamp text)
+    start = time.perf_counter()
+    page_root = generate_merkle_root(leaf_hashes(rows))
+    MERKLE_SECONDS.labels("page").observe(time.perf_counter() - start)
+
+    # Tokens carry stored positions; items carry canonical text timestamps
+    next_cursor = newer_cursor = None
+    if has_more and not newer:
+        next_cursor = encode_cursor(uid, OLDER, rows[-1]["timestamp"], rows[-1]["id"])
+    if rows:
+        last = max(rows, key=lambda row: row["id"])  # Newer pages follow commit order (ids)
+        newer_cursor = encode_cursor(uid, NEWER, last["timestamp"], last["id"])
+    elif newer:
+        newer_cursor = cursor  # Nothing new yet: poll again from the same position
+    for row in rows:
+        row["timestamp"] = render_ts(row["timestamp"])
+        if vault_scale:
+            for col in MONEY_COLUMNS:  # Stored integers stay alongside: they are the leaf preimage
+                row[col + "_minor"] = row[col]
+                row[col] = row[col] / vault_scale
+
+    return {
+        "items": rows, 
+        "next_cursor": next_cursor, 
+        "newer_cursor": newer_cursor,
+        "has_more": has_more,
+        "page_merkle_root": page_root,
+        "amount_scale": vault_scale
+    }
+
+ROLLUP_DEFAULT_SPAN = {"hour": 24, "day": 30}  # Buckets returned when no range is given
+ROLLUP_STEP = {"hour": 3600, "day": 86400}
+
+def _rollup_bound(value: str, end: bool = False) -> datetime:
+    """ISO date/timestamp -> naive UTC; a bare date as `end` covers that whole day. Raises ValueError."""
+    moment = datetime.fromisoformat(value)
+    if moment.tzinfo is not None:
+        moment = moment.astimezone(timezone.utc).replace(tzinfo=None)
+    if end and len(value.strip()) <= 10:
+        moment = moment.replace(hour=23, minute=59, second=59)
+    return moment
+
+@app.get("/api/rollups")
+async def get_rollups(
+    request: Request,
+    granularity: str = Query("day"),
+    start: Optional[str] = None,
+    end: Optional[str] = None,
+    scope: str = Query("user"),
+    auth: dict = Depends(multichain_guard)
+):
+    """
+    Hourly or daily split totals for the resolved sovereign (`scope=user`) or
+    the whole node (`scope=node`, operators only), served from precomputed
+    rollup rows. `start` / `end` are inclusive ISO dates or timestamps (UTC
+    unless they carry an offset); a bare `end` date includes that whole day.
+    """
+    if granularity not in GRANULARITIES:
+        raise HTTPException(status_code=400, detail="INVALID_GRANULARITY")
+    if scope not in ("user", "node"):
+        raise HTTPException(status_code=400, detail="INVALID_SCOPE")
+    if scope == "node" and not is_admin(request, auth):
+        raise HTTPException(status_code=403, detail="ADMIN_REQUIRED")  # Node-wide totals are operator data
+    try:
+        end_dt = _rollup_bound(end, end=True) if end else datetime.now(timezone.utc).replace(tzinfo=None)
+        start_dt = _rollup_bound(start) if start else \
+            end_dt - timedelta(seconds=ROLLUP_STEP[granularity] * (ROLLUP_DEFAULT_SPAN[granularity] - 1))
+    except ValueError:
+        raise HTTPException(status_code=400, detail="INVALID_RANGE")
+    first = bucket_of(granularity, start_dt.strftime("%Y-%m-%d %H:%M:%S"))
+    last = bucket_of(granularity, end_dt.strftime("%Y-%m-%d %H:%M:%S"))
+    span = (datetime.fromisoformat(last) - datetime.fromisoformat(first)).total_seconds() // ROLLUP_STEP[granularity] + 1
+    if span < 1:
+        raise HTTPException(status_code=400, detail="INVALID_RANGE")
+    if span > ROLLUP_MAX_BUCKETS:
+        raise HTTPException(status_code=400, detail="ROLLUP_RANGE_TOO_LARGE")
+
+    if scope == "user":
+        uid = resolve_sovereign_id(auth.get("user_id"))
+        rows = await vault.pool(uid).read(read_rollups, uid, granularity, first, last)
+    else:
+        # Node-wide rows are per shard file: merge bucket by bucket
+        merged: Dict[str, List[Any]] = {}
+        for pool in vault.pools:
+            for bucket, *totals in await pool.read(read_rollups, NODE_SCOPE, granularity, first, last):
+                current = merged.setdefault(bucket, [0, 0, 0, 0, 0])
+                for i, value in enumerate(totals):
+                    current[i] += value
+        rows = [(bucket, *merged[bucket]) for bucket in sorted(merged)]
+
+    buckets = [
+        {"bucket": bucket, "tx_count": count, "amount": to_major(amount, vault_scale),
+         "creator": to_major(creator, vault_scale), "pool": to_major(pool_share, vault_scale),
+         "fee": to_major(fee, vault_scale)}
+        for bucket, count, amount, creator, pool_share, fee in rows
+    ]
+    return {
+        "granularity": granularity,
+        "scope": scope,
+        "start": first,
+        "end": last,
+        "buckets": buckets,
+        "amount_scale": vault_scale
+    }
+
+@app.get("/api/export")
+async def export_history(
+    format: str = Query("ndjson", pattern="^(ndjson|csv)$"),
+    cursor_ts: Optional[str] = None,
+    cursor_id: Optional[int] = None,
+    resume: Optional[str] = None,
+    auth: dict = Depends(multichain_guard)
+):
+    """
+    Streams the caller's full history (newest first) as NDJSON or CSV in
+    constant memory, ending with a Merkle root over every emitted row.
+    `resume` (from the last checkpoint) continues a dropped export.
+    """
+    uid = resolve_sovereign_id(auth.get("user_id"))
+    acc = None
+    if resume:
+        try:
+            state = decode_resume(resume)
+        except ValueError as e:
+            raise HTTPException(status_code=400, detail=str(e))
+        cursor_ts, cursor_id, acc = state["cursor_ts"], state["cursor_id"], state["acc"]
+    elif cursor_ts:
+        try:
+            cursor_ts = to_stored(cursor_ts, vault_ts_unit)
+        except ValueError:
+            raise HTTPException(status_code=400, detail="INVALID_CURSOR")
+
+    stream = stream_export(vault.pool(uid), uid, format, vault_scale, cursor_ts, cursor_id, acc, None, vault_ts_unit)
+    return StreamingResponse(
+        stream,
+        media_type=EXPORT_FORMATS[format],
+        headers={"Content-Disposition": f'attachment; filename="nexus_{uid}.{format}"', "Cache-Control": "no-store"},
+    )
+
+@app.get("/api/ledger_root")
+async def get_ledger_root():
+    """Current ledger-wide Merkle root, maintained incrementally by the writer."""
+    roots = [await pool.read(read_root) for pool in vault.pools]
+    if len(roots) == 1:
+        return roots[0]
+    # Sharded vault: one accumulator per shard, anchored together in shard order
+    return {
+        "root": generate_merkle_root([r["root"] or "" for r in roots]),
+        "tree_size": sum(r["tree_size"] for r in roots),
+        "shards": roots,
+    }
+
+@app.get("/api/proof/{tx_id}")
+async def get_proof(tx_id: int, shard: int = Query(0, ge=0), layout: Optional[int] = Query(None, ge=1)):
+    """
+    O(log N) inclusion proof: audit path from the transaction's leaf hash
+    (as computed by `compute_leaf_hash`) to the current ledger-wide root.
+    On a sharded vault, ids are per shard and the root is that shard's root.
 
-    query += " ORDER BY timestamp DESC, id DESC LIMIT ?"
-    params.append(limit + 1) # Fetch one extra to detect "next page"
+    `layout=K` marks an id handed out before a reshard from K shards: it is
+    resolved through `reshard_map`, and the proof names the row's current
+    `tx_id` and `shard`.
+    """
+    if layout is not None and layout != vault.shards:
+        if shard >= layout:
+            raise HTTPException(status_code=404, detail="TX_NOT_ANCHORED")
+        for index, pool in enumerate(vault.pools):
+            new_id = await pool.read(resolve_reshard_id, layout, shard, tx_id)
+            if new_id is not None:
+                tx_id, shard = new_id, index
+                break
+        else:
+            raise HTTPException(status_code=404, detail="TX_NOT_ANCHORED")
+    if shard >= vault.shards:
+        raise HTTPException(status_code=404, detail="TX_NOT_ANCHORED")
+    proof = await vault.pools[shard].read(read_proof, tx_id)
+    if proof is None:
+        raise HTTPException(status_code=404, detail="TX_NOT_ANCHORED")
+    if layout is not None:
+        proof["shard"] = shard
+    return proof
+
+@app.get("/api/node_stats")
+async def get_node_stats(admin: dict = Depends(admin_guard)):
+    """Operational counters for sizing the vault (pool checkouts, wait times, cache efficiency)."""
+    return {"node_id": NODE_ID, "shards": vault.shards, "pool": vault.stats(), "summary_cache": summary_cache.stats(),
+            "worker": coordinator.stats()}
+
+@app.get("/api/metrics")
+async def get_metrics(admin: dict = Depends(admin_guard)):
+    """Prometheus text exposition: route, vault and Merkle latency histograms, WAL size, in-flight requests."""
+    return PlainTextResponse(render(), media_type=CONTENT_TYPE)
 
-    conn = get_db_connection()
+@app.get("/api/diagnostics")
+async def get_diagnostics(admin: dict = Depends(admin_guard)):
+    """Opt-in diagnostics status (NEXUS_DIAGNOSTICS): profiled samples and slow-query count."""
+    if not diagnostics.DIAGNOSTICS:
+        raise HTTPException(status_code=404, detail="DIAGNOSTICS_DISABLED")
+    return {
+        "directory": diagnostics.DIAG_DIR,
+        "profile_sample": diagnostics.PROFILE_SAMPLE,
+        "profiled_requests": sum(p.samples for p in diagnostics.profiler_registry),
+        "slow_query_ms": diagnostics.SLOW_QUERY_MS,
+        "slow_queries": diagnostics.slow_log.logged if diagnostics.slow_log else 0,
+        "tracemalloc": diagnostics.tracemalloc.is_tracing(),
+    }
+
+@app.post("/api/diagnostics/tracemalloc/{action}")
+async def tracemalloc_control(
+    action: str, top: int = Query(diagnostics.TRACEMALLOC_TOP, ge=1, le=200), admin: dict = Depends(admin_guard)
+):
+    """start | snapshot | stop. Snapshots report top allocation sites and growth since the previous one."""
+    if not diagnostics.DIAGNOSTICS:
+        raise HTTPException(status_code=404, detail="DIAGNOSTICS_DISABLED")
     try:
-        rows_raw = [dict(row) for row in conn.execute(query, params).fetchall()]
-        
-        has_more = len(rows_raw) > limit
-        rows = rows_raw[:limit] 
-        
-        # Calculate Merkle Root for this page of data
-        leaf_hashes = [compute_leaf_hash(r) for r in rows]
-        page_root = generate_merkle_root(leaf_hashes)
-        
-        next_cursor = None
-        if has_more:
-            next_cursor = {
-                "ts": rows[-1]["timestamp"], 
-                "id": rows[-1]["id"]
-            }
-
-        return {
-            "items": rows, 
-            "next_cursor": next_cursor, 
-            "page_merkle_root": page_root
-        }
-    finally:
-        conn.close()
+        return diagnostics.tracemalloc_action(action, top)
+    except ValueError as e:
+        raise HTTPException(status_code=400, detail=str(e))
+
+@app.post("/api/admin/snapshot", status_code=202)
+async def trigger_snapshot(admin: dict = Depends(admin_guard)):
+    """Starts an online snapshot of every shard (NEXUS_SNAPSHOTS); poll GET for completion."""
+    if not snapshots.SNAPSHOTS:
+        raise HTTPException(status_code=404, detail="SNAPSHOTS_DISABLED")
+    try:
+        if not coordinator.writes:
+            return await coordinator.call("snapshot_start")  # The elected writer owns snapshots
+        snapshot_service.start(vault.paths, snapshots.snapshot_root(DB_PATH))
+    except VaultUnavailable:
+        raise
+    except RuntimeError as e:
+        raise HTTPException(status_code=409, detail=str(e))
+    return _snapshot_status()
+
+@app.get("/api/admin/snapshot")
+async def snapshot_status(admin: dict = Depends(admin_guard)):
+    """Progress of the running snapshot and the manifest of the last completed one."""
+    if not snapshots.SNAPSHOTS:
+        raise HTTPException(status_code=404, detail="SNAPSHOTS_DISABLED")
+    if not coordinator.writes:
+        return await coordinator.call("snapshot_status")
+    return _snapshot_status()
 
 # --- 8. SOVEREIGN FRONTEND GATEWAY (SPA Support) ---
+# Served from the in-memory manifest built at startup: no per-request syscalls,
+# precompressed variants, strong ETags (304s) and immutable fingerprinted assets.
 
-# Check if client build exists before mounting
-if os.path.exists(CLIENT_BUILD_DIR):
-    # Mount /static for assets (JS, CSS, Images, Fonts)
-    # This handles requests like /static/main.dart.js or /assets/...
-    app.mount("/static", StaticFiles(directory=CLIENT_BUILD_DIR), name="static")
-    
-    # Root Route -> Index.html
-    @app.get("/")
-    async def serve_root():
-        return FileResponse(os.path.join(CLIENT_BUILD_DIR, "index.html"))
-
-    # Manifest and Service Worker routes (Critical for PWA/TMA)
-    @app.get("/manifest.json")
-    async def serve_manifest():
-        return FileResponse(os.path.join(CLIENT_BUILD_DIR, "manifest.json"))
-        
-    @app.get("/flutter_bootstrap.js")
-    async def serve_bootstrap():
-        return FileResponse(os.path.join(CLIENT_BUILD_DIR, "flutter_bootstrap.js"))
+GATEWAY_MISSING = "NEXUS_GATEWAY_ERROR: Client Artifacts Missing"
+
+# /static/... for assets (JS, CSS, Images, Fonts), same files as the root paths
+@app.get("/static/{path_name:path}")
+async def serve_static(path_name: str, request: Request):
+    asset = static_assets.lookup(path_name)
+    if asset is None:
+        raise HTTPException(status_code=404, detail="Not Found")
+    return static_assets.respond(asset, request.headers)
 
 # Catch-All Fallback for SPA Routing (Flutter Deep Links)
-# Any route not matched above falls through to here.
+# Any route not matched above falls through to here: "/", manifest.json,
+# flutter_bootstrap.js and every other build file, else index.html.
 @app.api_route("/{path_name:path}", methods=["GET"])
-async def catch_all_spa(path_name: str):
+async def catch_all_spa(path_name: str, request: Request):
     if path_name.startswith("api/"):
         raise HTTPException(status_code=404, detail="Endpoint Not Found")
     
-    # Security: Prevent Directory Traversal
-    # Resolve the requested path relative to the build directory
-    requested_path = os.path.normpath(os.path.join(CLIENT_BUILD_DIR, path_name))
-    
-    # Check if the file exists within the jail (CLIENT_BUILD_DIR)
-    if os.path.commonpath([requested_path, CLIENT_BUILD_DIR]) == CLIENT_BUILD_DIR:
-        if os.path.isfile(requested_path):
-            return FileResponse(requested_path)
+    # Security: only files indexed from CLIENT_BUILD_DIR exist here (no traversal possible)
+    asset = static_assets.lookup(path_name)
+    if asset is not None:
+        return static_assets.respond(asset, request.headers)
     
     # Fallback to index.html for unknown frontend routes (Client-side routing)
-    index_path = os.path.join(CLIENT_BUILD_DIR, "index.html")
-    if os.path.exists(index_path):
-        return FileResponse(index_path)
+    if static_assets.index is not None:
+        return static_assets.respond(static_assets.index, request.headers)
     
-    return Response("NEXUS_GATEWAY_ERROR: Client Artifacts Missing", status_code=503)
\ No newline at end of file
+    return Response(GATEWAY_MISSING, status_code=503)
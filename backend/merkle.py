@@ -0,0 +1,337 @@
+# Copyright 2026 Coreframe Systems (Nexus Protocol)
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#        http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+
+"""
+🏛️ NEXUS MERKLE MODULE (Phase 1.4.x)
+
+Cryptographic primitives for the Sovereign Ledger plus an incremental,
+persisted Merkle accumulator over the whole `transactions` table.
+
+TREE SEMANTICS (unchanged from research/merkle_anchor.py):
+Leaves are SHA-256 over the pipe-joined row values, in id order, with the
+timestamp in its canonical UTC text form (timestamps.render), so TEXT and
+integer-microsecond vaults hash the same row identically. Each level
+is reduced pairwise over the concatenated hex digests; an odd trailing node
+is paired with itself (duplicate-last-node rule).
+
+ACCUMULATOR:
+The frontier keeps one completed perfect-subtree root per set bit of the
+leaf count (<= 64 nodes). Appending a leaf is a binary-counter carry, and the
+duplicate-last-node root is folded from the frontier in O(log N). The writer
+persists the frontier and the current root in the same transaction as the
+rows it covers, so the global root is always a single-row read.
+
+BATCHED ENGINE:
+Page and ledger roots share one bulk path: leaves are hashed in a single pass
+over value tuples and each level is reduced pairwise in one comprehension.
+The legacy preimage of a parent is the concatenated *hex* of its children, so
+every node must stay hex-encoded for roots to remain byte-identical; see
+scripts/bench_merkle_hashing.py for why raw-digest buffers do not pay off.
+
+INCLUSION PROOFS:
+Every completed perfect-subtree node is also persisted in `merkle_nodes`
+(32-byte BLOB digests, keyed by level and index), and `merkle_leaves` maps a
+transaction id to its leaf position. An audit path is then O(log N) primary
+key lookups; the only nodes never stored are the trailing partial nodes,
+which are folded from the frontier exactly as the root is.
+"""
+
+import hashlib
+import sqlite3
+from typing import Optional, List, Dict, Any, Iterable, Sequence, Tuple
+
+from backend.timestamps import render
+
+# Ledger columns that enter a leaf, in serialization order
+LEAF_COLUMNS = ("amount", "creator_share", "user_pool_share", "network_fee", "timestamp")
+
+# --- 1. PRIMITIVES ---
+def hash_leaf(values: Iterable[Any]) -> str:
+    """Leaf hash over pipe-delimited values (delimiter blocks concatenation collisions); the last is the timestamp."""
+    *money, ts = values
+    return hashlib.sha256("|".join([*map(str, money), render(ts)]).encode("utf-8")).hexdigest()
+
+def hash_pair(left: str, right: str) -> str:
+    return hashlib.sha256((left + right).encode("utf-8")).hexdigest()
+
+def compute_leaf_hash(row: Dict[str, Any]) -> str:
+    """
+    Deterministic serialization for Merkle feasibility.
+    Optimized for speed: Uses pipe-delimited string concatenation.
+    """
+    return hash_leaf(row[column] for column in LEAF_COLUMNS)
+
+def leaf_hashes_from_tuples(rows: Iterable[Sequence[Any]]) -> List[str]:
+    """Batched `hash_leaf` over value tuples ordered as LEAF_COLUMNS."""
+    sha256, join = hashlib.sha256, "|".join
+    return [
+        sha256(join([str(a), str(c), str(p), str(f), render(ts)]).encode("utf-8")).hexdigest()
+        for a, c, p, f, ts in rows
+    ]
+
+def leaf_hashes(rows: Sequence[Dict[str, Any]]) -> List[str]:
+    """Batched `compute_leaf_hash` for a page of row dicts."""
+    sha256, join = hashlib.sha256, "|".join
+    return [
+        sha256(join([
+            str(r["amount"]), str(r["creator_share"]), str(r["user_pool_share"]),
+            str(r["network_fee"]), render(r["timestamp"]),
+        ]).encode("utf-8")).hexdigest()
+        for r in rows
+    ]
+
+def reduce_level(nodes: List[str]) -> List[str]:
+    """One tree level: pairs adjacent hex nodes (duplicate-last-node rule) into parents."""
+    if len(nodes) % 2:
+        nodes = nodes + [nodes[-1]]
+    sha256, pairs = hashlib.sha256, iter(nodes)
+    return [sha256((left + right).encode("utf-8")).hexdigest() for left, right in zip(pairs, pairs)]
+
+def generate_merkle_root(hashes: List[str]) -> Optional[str]:
+    """
+    Reduces a list of transaction hashes to a single Merkle Root.
+    Used for verifying page integrity without re-downloading entire history.
+    """
+    if not hashes: return None
+    nodes = hashes
+    while len(nodes) > 1:
+        nodes = reduce_level(nodes)
+    return nodes[0]
+
+
+# --- 2. INCREMENTAL ACCUMULATOR ---
+class MerkleFrontier:
+    """Append-only Merkle accumulator: O(log N) state, O(log N) append and root."""
+
+    def __init__(self, size: int = 0, frontier: Optional[Dict[int, str]] = None, last_tx_id: int = 0):
+        self.size = size
+        self.frontier: Dict[int, str] = dict(frontier or {})
+        self.last_tx_id = last_tx_id
+
+    def copy(self) -> "MerkleFrontier":
+        return MerkleFrontier(self.size, self.frontier, self.last_tx_id)
+
+    def append(self, leaf: str, tx_id: int = 0) -> List[Tuple[int, int, str]]:
+        """Appends a leaf; returns every completed node as (level, index, hash), leaf first."""
+        pos = self.size
+        created = [(0, pos, leaf)]
+        node, level = leaf, 0
+        while level in self.frontier:  # Carry: merge equal-height subtrees
+            node = hash_pair(self.frontier.pop(level), node)
+            level += 1
+            created.append((level, pos >> level, node))
+        self.frontier[level] = node
+        self.size += 1
+        self.last_tx_id = tx_id or self.last_tx_id
+        return created
+
+    def partials(self) -> Dict[int, str]:
+        """Trailing partial (padded) node per level, as produced by the root fold."""
+        carries: Dict[int, str] = {}
+        carry, level = None, 0
+        while (1 << level) < self.size:
+            if carry is not None:
+                carries[level] = carry
+            node = self.frontier.get(level)
+            if node is not None:
+                carry = hash_pair(node, node if carry is None else carry)
+            elif carry is not None:
+                carry = hash_pair(carry, carry)
+            level += 1
+        if carry is not None:
+            carries[level] = carry
+        return carries
+
+    def root(self) -> Optional[str]:
+        """Folds the frontier into the duplicate-last-node root of all appended leaves."""
+        if self.size == 0:
+            return None
+        top = (self.size - 1).bit_length()
+        return self.partials().get(top) or self.frontier[top]
+
+    def __eq__(self, other: object) -> bool:
+        return (
+            isinstance(other, MerkleFrontier)
+            and self.size == other.size
+            and self.frontier == other.frontier
+        )
+
+
+# --- 3. PERSISTENCE (caller owns the transaction) ---
+NODE_INSERT_SQL = "INSERT OR REPLACE INTO merkle_nodes (level, idx, hash) VALUES (?, ?, ?)"
+LEAF_INSERT_SQL = "INSERT OR REPLACE INTO merkle_leaves (tx_id, pos) VALUES (?, ?)"
+BUILD_CHUNK = 10000
+
+def ensure_merkle(conn: sqlite3.Connection) -> bool:
+    """Creates the accumulator tables; builds them from the ledger when new. Returns True if built."""
+    exists = conn.execute(
+        "SELECT 1 FROM sqlite_master WHERE type = 'table' AND name = 'merkle_nodes'"
+    ).fetchone()
+    conn.execute("""
+        CREATE TABLE IF NOT EXISTS merkle_frontier (
+            level INTEGER PRIMARY KEY,
+            hash TEXT NOT NULL
+        )
+    """)
+    conn.execute("""
+        CREATE TABLE IF NOT EXISTS merkle_state (
+            id INTEGER PRIMARY KEY CHECK (id = 1),
+            size INTEGER NOT NULL,
+            last_tx_id INTEGER NOT NULL,
+            root TEXT
+        )
+    """)
+    conn.execute("""
+        CREATE TABLE IF NOT EXISTS merkle_nodes (
+            level INTEGER NOT NULL,
+            idx INTEGER NOT NULL,
+            hash BLOB NOT NULL,
+            PRIMARY KEY (level, idx)
+        ) WITHOUT ROWID
+    """)
+    conn.execute("""
+        CREATE TABLE IF NOT EXISTS merkle_leaves (
+            tx_id INTEGER PRIMARY KEY,
+            pos INTEGER NOT NULL
+        )
+    """)
+    if exists:
+        return False
+    save_frontier(conn, build_frontier(conn, persist=True))
+    return True
+
+def load_frontier(conn: sqlite3.Connection) -> MerkleFrontier:
+    state = conn.execute("SELECT size, last_tx_id FROM merkle_state WHERE id = 1").fetchone()
+    if state is None:
+        return MerkleFrontier()
+    frontier = {level: node for level, node in conn.execute("SELECT level, hash FROM merkle_frontier")}
+    return MerkleFrontier(state[0], frontier, state[1])
+
+def save_frontier(conn: sqlite3.Connection, acc: MerkleFrontier) -> None:
+    conn.execute("DELETE FROM merkle_frontier")
+    conn.executemany("INSERT INTO merkle_frontier (level, hash) VALUES (?, ?)", acc.frontier.items())
+    conn.execute(
+        "INSERT OR REPLACE INTO merkle_state (id, size, last_tx_id, root) VALUES (1, ?, ?, ?)",
+        (acc.size, acc.last_tx_id, acc.root()),
+    )
+
+def save_nodes(conn: sqlite3.Connection, nodes: List[Tuple[int, int, str]], leaves: List[Tuple[int, int]]) -> None:
+    """Persists completed tree nodes and the tx_id -> leaf position map."""
+    conn.executemany(NODE_INSERT_SQL, [(level, idx, bytes.fromhex(h)) for level, idx, h in nodes])
+    conn.executemany(LEAF_INSERT_SQL, leaves)
+
+def build_frontier(
+    conn: sqlite3.Connection, persist: bool = False, rows: Optional[Iterable[Sequence[Any]]] = None
+) -> MerkleFrontier:
+    """
+    Streams the ledger in id order (bounded memory) into a fresh accumulator.
+    `rows` overrides the source with (id, *LEAF_COLUMNS) tuples (e.g. archive
+    segments + hot vault, see segments.iter_ledger).
+    With `persist`, the stored node and leaf tables are rewritten in chunks as well.
+    """
+    acc = MerkleFrontier()
+    if persist:
+        conn.execute("DELETE FROM merkle_nodes")
+        conn.execute("DELETE FROM merkle_leaves")
+    nodes: List[Tuple[int, int, str]] = []
+    leaves: List[Tuple[int, int]] = []
+    if rows is None:
+        rows = conn.execute(f"SELECT id, {', '.join(LEAF_COLUMNS)} FROM transactions ORDER BY id ASC")
+    for row in rows:
+        created = acc.append(hash_leaf(row[1:]), row[0])
+        if persist:
+            nodes.extend(created)
+            leaves.append((row[0], acc.size - 1))
+            if len(leaves) >= BUILD_CHUNK:
+                save_nodes(conn, nodes, leaves)
+                nodes, leaves = [], []
+    if persist and leaves:
+        save_nodes(conn, nodes, leaves)
+    return acc
+
+def verify_frontier(
+    conn: sqlite3.Connection, rows: Optional[Iterable[Sequence[Any]]] = None
+) -> Tuple[bool, MerkleFrontier, MerkleFrontier]:
+    """Rebuilds from the ledger and compares with the stored accumulator: (match, rebuilt, stored)."""
+    rebuilt, stored = build_frontier(conn, rows=rows), load_frontier(conn)
+    return rebuilt == stored, rebuilt, stored
+
+def read_root(conn: sqlite3.Connection) -> Dict[str, Any]:
+    row = conn.execute("SELECT root, size, last_tx_id FROM merkle_state WHERE id = 1").fetchone()
+    if row is None:
+        return {"root": None, "tree_size": 0, "last_tx_id": 0}
+    return {"root": row[0], "tree_size": row[1], "last_tx_id": row[2]}
+
+
+# --- 4. INCLUSION PROOFS ---
+def read_proof(conn: sqlite3.Connection, tx_id: int) -> Optional[Dict[str, Any]]:
+    """
+    Builds the audit path for `tx_id` from persisted nodes, bound to the root and
+    tree size of the same read snapshot. Returns None if the id is not in the tree.
+    """
+    conn.execute("BEGIN")  # One snapshot: nodes, frontier and root must agree
+    try:
+        leaf = conn.execute("SELECT pos FROM merkle_leaves WHERE tx_id = ?", (tx_id,)).fetchone()
+        acc = load_frontier(conn)
+        if leaf is None or leaf[0] >= acc.size:
+            return None
+        pos, size = leaf[0], acc.size
+
+        # Plan: for each level, the sibling (or self when duplicated) and its own node
+        wanted, steps, level, count = set(), [], 0, size
+        while count > 1:
+            idx = pos >> level
+            sibling = idx ^ 1 if (idx ^ 1) < count else idx  # Duplicate-last-node rule
+            steps.append((level, idx, sibling))
+            wanted.update({(level, idx), (level, sibling)})
+            count = (count + 1) // 2
+            level += 1
+        wanted.add((0, pos))
+
+        # Point lookups on the (level, idx) primary key: ~2 per level, each O(log N)
+        stored: Dict[Tuple[int, int], str] = {}
+        for key in sorted(wanted):
+            found = conn.execute("SELECT hash FROM merkle_nodes WHERE level = ? AND idx = ?", key).fetchone()
+            if found is not None:
+                stored[key] = found[0].hex()
+    finally:
+        conn.rollback()
+
+    partials = acc.partials()
+
+    def node(lvl: int, idx: int) -> str:
+        # Full subtrees are stored; only the trailing padded node is folded from the frontier
+        if ((idx + 1) << lvl) <= size:
+            return stored[(lvl, idx)]
+        return partials[lvl]
+
+    path = []
+    for lvl, idx, sibling in steps:
+        path.append({"hash": node(lvl, sibling), "side": "left" if sibling < idx else "right"})
+
+    return {
+        "tx_id": tx_id,
+        "leaf_index": pos,
+        "leaf_hash": stored[(0, pos)],
+        "path": path,
+        "root": acc.root(),
+        "tree_size": size,
+    }
+
+def verify_proof(leaf_hash: str, path: List[Dict[str, str]], root: str) -> bool:
+    """Client-side check: folds the audit path from the leaf and compares with `root`."""
+    node = leaf_hash
+    for step in path:
+        node = hash_pair(step["hash"], node) if step["side"] == "left" else hash_pair(node, step["hash"])
+    return node == root
@@ -0,0 +1,249 @@
+# Copyright 2026 Coreframe Systems (Nexus Protocol)
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#        http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+
+"""
+🏛️ NEXUS METRICS (Phase 1.4.x)
+
+Fixed-bucket histograms for latency and size distributions. An observation is
+one bisect over a short tuple and three increments: cheap enough to leave on.
+Quantiles are reported as the upper bound of the bucket that contains them.
+
+CONCURRENCY MODEL:
+Node-wide metrics are observed from the event loop, the reader executor and
+the writer thread at once. Instead of a lock per observation, every thread
+records into its own `Histogram` shard (a `threading.local`); the registry
+takes a lock only when a thread records into a series for the first time.
+A scrape merges the shards. It may miss observations that are still in
+progress, which is acceptable for monitoring and never blocks a recorder.
+
+`render()` emits the Prometheus text exposition format (version 0.0.4),
+served by `/api/metrics`.
+"""
+
+import threading
+from time import perf_counter as _perf_counter
+from bisect import bisect_left
+from typing import Dict, Any, Sequence, List, Tuple, Callable, Iterable
+
+# Seconds: 100us .. 10s, roughly 2.5x apart
+LATENCY_BUCKETS = (
+    0.0001, 0.00025, 0.0005, 0.001, 0.0025, 0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0,
+)
+# Rows per page / per batch
+ROW_BUCKETS = (0, 1, 2, 5, 10, 25, 50, 100, 250, 500, 1000)
+
+CONTENT_TYPE = "text/plain; version=0.0.4; charset=utf-8"
+
+
+class Histogram:
+    def __init__(self, bounds: Sequence[float] = LATENCY_BUCKETS):
+        self.bounds = tuple(bounds)
+        self.counts = [0] * (len(self.bounds) + 1)  # Last bucket is +Inf
+        self.sum = 0.0
+        self.count = 0
+
+    def observe(self, value: float) -> None:
+        self.counts[bisect_left(self.bounds, value)] += 1
+        self.sum += value
+        self.count += 1
+
+    def merge(self, other: "Histogram") -> None:
+        for i, n in enumerate(list(other.counts)):
+            self.counts[i] += n
+        self.sum += other.sum
+        self.count += other.count
+
+    def quantile(self, q: float) -> float:
+        if not self.count:
+            return 0.0
+        rank, seen = q * self.count, 0
+        for i, n in enumerate(self.counts):
+            seen += n
+            if seen >= rank:
+                return self.bounds[i] if i < len(self.bounds) else float("inf")
+        return float("inf")
+
+    def snapshot(self) -> Dict[str, Any]:
+        return {
+            "count": self.count,
+            "sum": round(self.sum, 6),
+            "mean": round(self.sum / self.count, 6) if self.count else 0.0,
+            "p50": self.quantile(0.50),
+            "p90": self.quantile(0.90),
+            "p99": self.quantile(0.99),
+        }
+
+
+class ThreadHistogram:
+    """A histogram series recorded per thread without locks; merged on read."""
+
+    def __init__(self, bounds: Sequence[float] = LATENCY_BUCKETS):
+        self.bounds = tuple(bounds)
+        self._local = threading.local()
+        self._shards: List[Histogram] = []
+        self._lock = threading.Lock()
+
+    def observe(self, value: float) -> None:
+        shard = getattr(self._local, "shard", None)
+        if shard is None:
+            shard = self._local.shard = Histogram(self.bounds)
+            with self._lock:  # Once per thread, never per observation
+                self._shards.append(shard)
+        shard.observe(value)
+
+    def merged(self) -> Histogram:
+        total = Histogram(self.bounds)
+        with self._lock:
+            shards = list(self._shards)
+        for shard in shards:
+            total.merge(shard)
+        return total
+
+
+# --- 1. REGISTRY ---
+class HistogramFamily:
+    """A named histogram with one `ThreadHistogram` per label-value tuple."""
+
+    def __init__(self, name: str, help_text: str, labels: Tuple[str, ...] = (), bounds: Sequence[float] = LATENCY_BUCKETS):
+        self.name = name
+        self.help = help_text
+        self.label_names = labels
+        self.bounds = tuple(bounds)
+        self._series: Dict[Tuple[str, ...], ThreadHistogram] = {}
+        self._lock = threading.Lock()
+
+    def labels(self, *values: str) -> ThreadHistogram:
+        series = self._series.get(values)
+        if series is None:
+            with self._lock:
+                series = self._series.setdefault(values, ThreadHistogram(self.bounds))
+        return series
+
+    def collect(self) -> List[Tuple[Tuple[str, ...], Histogram]]:
+        with self._lock:
+            items = list(self._series.items())
+        return [(values, series.merged()) for values, series in sorted(items)]
+
+
+class GaugeFamily:
+    """A gauge read at scrape time from `fn()`, which yields (label values, value) pairs."""
+
+    def __init__(self, name: str, help_text: str, labels: Tuple[str, ...], fn: Callable[[], Iterable[Tuple[Tuple[str, ...], float]]]):
+        self.name = name
+        self.help = help_text
+        self.label_names = labels
+        self.fn = fn
+
+
+class Registry:
+    def __init__(self):
+        self._families: Dict[str, Any] = {}
+
+    def histogram(self, name: str, help_text: str, labels: Tuple[str, ...] = (), bounds: Sequence[float] = LATENCY_BUCKETS) -> HistogramFamily:
+        return self._families.setdefault(name, HistogramFamily(name, help_text, labels, bounds))
+
+    def gauge(self, name: str, help_text: str, labels: Tuple[str, ...], fn: Callable) -> GaugeFamily:
+        self._families[name] = GaugeFamily(name, help_text, labels, fn)
+        return self._families[name]
+
+    def render(self) -> str:
+        lines: List[str] = []
+        for family in self._families.values():
+            kind = "histogram" if isinstance(family, HistogramFamily) else "gauge"
+            lines.append(f"# HELP {family.name} {family.help}")
+            lines.append(f"# TYPE {family.name} {kind}")
+            if kind == "gauge":
+                try:
+                    samples = list(family.fn())
+                except Exception:
+                    samples = []  # A failing probe must not break the scrape
+                for values, value in samples:
+                    lines.append(f"{family.name}{_labels(family.label_names, values)} {_number(value)}")
+                continue
+            for values, hist in family.collect():
+                cumulative = 0
+                for bound, n in zip(family.bounds + (float("inf"),), hist.counts):
+                    cumulative += n
+                    le = _labels(family.label_names + ("le",), values + (_number(bound),))
+                    lines.append(f"{family.name}_bucket{le} {cumulative}")
+                base = _labels(family.label_names, values)
+                lines.append(f"{family.name}_sum{base} {_number(hist.sum)}")
+                lines.append(f"{family.name}_count{base} {hist.count}")
+        return "\n".join(lines) + "\n"
+
+
+def _labels(names: Tuple[str, ...], values: Tuple[Any, ...]) -> str:
+    if not names:
+        return ""
+    escaped = (str(v).replace("\\", "\\\\").replace('"', '\\"').replace("\n", "\\n") for v in values)
+    return "{" + ",".join(f'{n}="{v}"' for n, v in zip(names, escaped)) + "}"
+
+def _number(value: float) -> str:
+    if value == float("inf"):
+        return "+Inf"
+    return repr(float(value)) if isinstance(value, float) else str(value)
+
+
+# --- 2. NODE METRICS ---
+REGISTRY = Registry()
+
+HTTP_SECONDS = REGISTRY.histogram(
+    "nexus_http_request_duration_seconds", "HTTP request latency by route template.", ("method", "route"),
+)
+DB_SECONDS = REGISTRY.histogram(
+    "nexus_db_operation_duration_seconds",
+    "Vault time by operation: connect (open), checkout (pool wait), query (reader), commit (writer batch).",
+    ("op",),
+)
+MERKLE_SECONDS = REGISTRY.histogram(
+    "nexus_merkle_hash_duration_seconds", "Merkle hashing time: page roots and writer leaf hashing.", ("stage",),
+)
+PAGE_ROWS = REGISTRY.histogram(
+    "nexus_page_rows", "Rows returned per /api/transactions page.", bounds=ROW_BUCKETS,
+)
+
+
+# --- 3. ASGI MIDDLEWARE ---
+class MetricsMiddleware:
+    """
+    Pure ASGI wrapper (no per-request task or body buffering): counts in-flight
+    HTTP requests and records each one's latency under its route template
+    (`/api/proof/{tx_id}`, never the raw path), set by the router on the scope.
+    """
+
+    def __init__(self, app):
+        self.app = app
+        self.inflight = 0  # Event loop only
+        REGISTRY.gauge(
+            "nexus_http_requests_in_flight", "HTTP requests currently being served.", (),
+            lambda: [((), self.inflight)],
+        )
+
+    async def __call__(self, scope, receive, send):
+        if scope["type"] != "http":
+            return await self.app(scope, receive, send)
+        self.inflight += 1
+        start = _perf_counter()
+        try:
+            await self.app(scope, receive, send)
+        finally:
+            self.inflight -= 1
+            route = scope.get("route")
+            # Mounted apps (static assets) report their mount point
+            template = getattr(route, "path", None) or scope.get("root_path") or "unmatched"
+            HTTP_SECONDS.labels(scope["method"], template).observe(_perf_counter() - start)
+
+
+def render() -> str:
+    return REGISTRY.render()
@@ -0,0 +1,243 @@
+# Copyright 2026 Coreframe Systems (Nexus Protocol)
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#        http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+
+"""
+🏛️ NEXUS TIME-BUCKETED ROLLUPS (Phase 1.4.x)
+
+Hourly and daily split totals (count, amount, creator, pool, fee) per
+sovereign id and node-wide, for dashboards and finance exports.
+
+TABLES:
+`rollups_hour` / `rollups_day` are keyed by `(user_id, bucket)` (WITHOUT
+ROWID, so a range is one contiguous B-tree scan). Buckets are the bucket's
+start as a canonical timestamp prefix: `YYYY-MM-DD HH:00:00` and `YYYY-MM-DD`,
+for TEXT and integer-microsecond ledgers alike (see timestamps.py).
+Node-wide rows use the reserved id `*`. A year of daily totals is at most
+366 rows; only buckets with splits exist.
+
+MAINTENANCE:
+The writer folds every batch into per-(user, hour) deltas and upserts the
+hour, day and node-wide rows in the same transaction as the ledger rows,
+advancing `rollup_state.last_tx_id` with them. At boot, `ensure_rollups`
+catches up on hot rows above that id (e.g. rows written by a node that
+predates rollups); a new table is built from the whole ledger, sealed
+archive files included. Sealing never touches rollups: rows change files,
+not buckets.
+"""
+
+import os
+import sqlite3
+from urllib.parse import quote
+from typing import Optional, List, Dict, Any, Iterable, Tuple
+
+from backend.timestamps import earliest, read_ts_unit, render, to_stored
+
+NODE_SCOPE = "*"  # user_id of node-wide rows (sovereign ids are numeric)
+GRANULARITIES = ("hour", "day")
+ROLLUP_MAX_BUCKETS = max(1, int(os.getenv("NEXUS_ROLLUP_MAX_BUCKETS", "1000")))
+REBUILD_CHUNK = 50000
+ROLLUP_TOLERANCE = 0.005  # Cent precision, as check_balances: float sums depend on summation order
+
+# Canonical timestamp prefix -> bucket key
+_BUCKET = {"hour": lambda ts: ts[:13] + ":00:00", "day": lambda ts: ts[:10]}
+_BUCKET_SQL = {
+    "hour": "CASE typeof(timestamp) WHEN 'integer' "
+            "THEN strftime('%Y-%m-%d %H:00:00', timestamp / 1000000, 'unixepoch') "
+            "ELSE substr(timestamp, 1, 13) || ':00:00' END",
+}
+
+ROLLUP_UPSERT_SQL = (
+    "INSERT INTO rollups_{g} (user_id, bucket, tx_count, amount_total, creator_total, pool_total, fee_total) "
+    "VALUES (?, ?, ?, ?, ?, ?, ?) "
+    "ON CONFLICT(user_id, bucket) DO UPDATE SET "
+    "tx_count = tx_count + excluded.tx_count, "
+    "amount_total = amount_total + excluded.amount_total, "
+    "creator_total = creator_total + excluded.creator_total, "
+    "pool_total = pool_total + excluded.pool_total, "
+    "fee_total = fee_total + excluded.fee_total"
+)
+
+# (user_id, hour bucket) -> [tx_count, amount, creator, pool, fee]
+Deltas = Dict[Tuple[str, str], List[Any]]
+
+
+# --- 1. SCHEMA (caller owns the transaction) ---
+def ensure_rollups(conn: sqlite3.Connection, scale: int = 0) -> bool:
+    """
+    Creates the rollup tables; builds them from the whole ledger when new,
+    otherwise catches up on hot rows above `rollup_state.last_tx_id`.
+    Returns True if a full build ran.
+    """
+    money = "INTEGER" if scale else "REAL"
+    exists = conn.execute(
+        "SELECT 1 FROM sqlite_master WHERE type = 'table' AND name = 'rollup_state'"
+    ).fetchone()
+    for granularity in GRANULARITIES:
+        conn.execute(f"""
+            CREATE TABLE IF NOT EXISTS rollups_{granularity} (
+                user_id TEXT NOT NULL,
+                bucket TEXT NOT NULL,
+                tx_count INTEGER NOT NULL DEFAULT 0,
+                amount_total {money} NOT NULL DEFAULT 0,
+                creator_total {money} NOT NULL DEFAULT 0,
+                pool_total {money} NOT NULL DEFAULT 0,
+                fee_total {money} NOT NULL DEFAULT 0,
+                PRIMARY KEY (user_id, bucket)
+            ) WITHOUT ROWID
+        """)
+    conn.execute("""
+        CREATE TABLE IF NOT EXISTS rollup_state (
+            id INTEGER PRIMARY KEY CHECK (id = 1),
+            last_tx_id INTEGER NOT NULL
+        )
+    """)
+    if exists:
+        catch_up_rollups(conn)
+        return False
+    rebuild_rollups(conn)
+    return True
+
+def drop_rollups(conn: sqlite3.Connection) -> None:
+    """Drops the rollup tables (e.g. before a money-type change); `ensure_rollups` rebuilds them."""
+    for table in ("rollups_hour", "rollups_day", "rollup_state"):
+        conn.execute(f"DROP TABLE IF EXISTS {table}")
+
+# --- 2. INCREMENTAL MAINTENANCE ---
+def accumulate(deltas: Deltas, user_id: str, amount: Any, creator: Any, pool: Any, fee: Any, ts: Any) -> None:
+    delta = deltas.setdefault((user_id, _BUCKET["hour"](render(ts))), [0, 0, 0, 0, 0])
+    delta[0] += 1
+    delta[1] += amount
+    delta[2] += creator
+    delta[3] += pool
+    delta[4] += fee
+
+def expand(deltas: Deltas, into: Optional[Dict[str, Deltas]] = None) -> Dict[str, Deltas]:
+    """Per-(user, hour) deltas -> {"hour": ..., "day": ...} rows for each user and node-wide."""
+    into = into if into is not None else {g: {} for g in GRANULARITIES}
+    hours, days = into["hour"], into["day"]
+    for (user_id, hour), delta in deltas.items():
+        for table, key in (
+            (hours, (user_id, hour)), (hours, (NODE_SCOPE, hour)),
+            (days, (user_id, hour[:10])), (days, (NODE_SCOPE, hour[:10])),
+        ):
+            total = table.get(key)
+            if total is None:
+                table[key] = list(delta)
+            else:
+                for i, value in enumerate(delta):
+                    total[i] += value
+    return into
+
+def apply_deltas(conn: sqlite3.Connection, deltas: Deltas, last_tx_id: int) -> None:
+    """Upserts hour/day rows for each user and node-wide, then records `last_tx_id`."""
+    rows = expand(deltas)
+    hours, days = rows["hour"], rows["day"]
+    conn.executemany(ROLLUP_UPSERT_SQL.format(g="hour"), [(*key, *d) for key, d in hours.items()])
+    conn.executemany(ROLLUP_UPSERT_SQL.format(g="day"), [(*key, *d) for key, d in days.items()])
+    conn.execute(
+        "INSERT INTO rollup_state (id, last_tx_id) VALUES (1, ?) "
+        "ON CONFLICT(id) DO UPDATE SET last_tx_id = MAX(last_tx_id, excluded.last_tx_id)",
+        (last_tx_id,),
+    )
+
+def _grouped(conn: sqlite3.Connection, where: str, params: Tuple[Any, ...]) -> Tuple[Deltas, int]:
+    """Per-(user, hour) totals of the matching ledger rows, summed in SQL, and their max id."""
+    cursor = conn.execute(
+        f"SELECT user_id, {_BUCKET_SQL['hour']}, COUNT(*), SUM(amount), SUM(creator_share), "
+        f"SUM(user_pool_share), SUM(network_fee), MAX(id) FROM transactions WHERE {where} GROUP BY 1, 2",
+        params,
+    )
+    deltas, last_id = {}, 0
+    for user_id, hour, *totals, max_id in cursor:
+        deltas[(user_id, hour)] = totals
+        last_id = max(last_id, max_id)
+    return deltas, last_id
+
+def catch_up_rollups(conn: sqlite3.Connection, chunk: int = REBUILD_CHUNK) -> int:
+    """Folds hot rows above `rollup_state.last_tx_id` into the rollups, `chunk` ids at a time. Returns rows folded."""
+    row = conn.execute("SELECT last_tx_id FROM rollup_state WHERE id = 1").fetchone()
+    last = row[0] if row else 0
+    top = conn.execute("SELECT COALESCE(MAX(id), 0) FROM transactions").fetchone()[0]
+    folded = 0
+    while last < top:
+        deltas, _ = _grouped(conn, "id > ? AND id <= ?", (last, last + chunk))
+        folded += sum(d[0] for d in deltas.values())
+        last = min(last + chunk, top)
+        apply_deltas(conn, deltas, last)
+    return folded
+
+def rebuild_rollups(conn: sqlite3.Connection) -> int:
+    """Recomputes every rollup from the hot file and all sealed archive files. Returns the ledger rows covered."""
+    for granularity in GRANULARITIES:
+        conn.execute(f"DELETE FROM rollups_{granularity}")
+    conn.execute("DELETE FROM rollup_state")
+    covered = 0
+    for source, where, params in _ledger_sources(conn):
+        deltas, last_id = _grouped(source, where, params)
+        apply_deltas(conn, deltas, last_id)
+        covered += sum(d[0] for d in deltas.values())
+        if source is not conn:
+            source.close()
+    apply_deltas(conn, {}, conn.execute("SELECT COALESCE(MAX(id), 0) FROM transactions").fetchone()[0])
+    return covered
+
+def _ledger_sources(conn: sqlite3.Connection) -> Iterable[Tuple[sqlite3.Connection, str, Tuple[Any, ...]]]:
+    """The hot file's unsealed rows, then every sealed file (see segments.py)."""
+    if conn.execute("SELECT 1 FROM sqlite_master WHERE type = 'table' AND name = 'segments'").fetchone() is None:
+        yield conn, "1", ()
+        return
+    segments = conn.execute("SELECT path, floor, last_id FROM segments ORDER BY month DESC").fetchall()
+    unit = read_ts_unit(conn)
+    # Same hot predicate as segments.HOT_SQL: late commits below the floor are still hot
+    floor = to_stored(segments[0][1], unit) if segments else earliest(unit)
+    yield conn, "(timestamp >= ? OR id > ?)", (floor, max((s[2] for s in segments), default=0))
+    base = os.path.dirname(conn.execute("PRAGMA database_list").fetchone()[2])
+    for path, _, _ in segments:
+        uri = f"file:{quote(os.path.abspath(os.path.join(base, path)))}?mode=ro&immutable=1"
+        yield sqlite3.connect(uri, uri=True), "1", ()
+
+def check_rollups(conn: sqlite3.Connection) -> List[str]:
+    """Recomputes every rollup from the ledger in memory and compares (empty list == consistent)."""
+    expected = {g: {} for g in GRANULARITIES}
+    for source, where, params in _ledger_sources(conn):
+        expand(_grouped(source, where, params)[0], expected)
+        if source is not conn:
+            source.close()
+    problems = []
+    for granularity in GRANULARITIES:
+        stored = {
+            (row[0], row[1]): list(row[2:])
+            for row in conn.execute(
+                f"SELECT user_id, bucket, tx_count, amount_total, creator_total, pool_total, fee_total "
+                f"FROM rollups_{granularity}"
+            )
+        }
+        for key in sorted(expected[granularity].keys() | stored.keys()):
+            want, have = expected[granularity].get(key), stored.get(key)
+            if want is None or have is None or want[0] != have[0] or \
+                    any(abs(w - h) > ROLLUP_TOLERANCE for w, h in zip(want[1:], have[1:])):
+                problems.append(f"rollups_{granularity} {key[0]} {key[1]}: ledger={want} stored={have}")
+    return problems
+
+# --- 3. READ PATH (pooled reader connections) ---
+def bucket_of(granularity: str, ts: str) -> str:
+    return _BUCKET[granularity](ts)
+
+def read_rollups(conn: sqlite3.Connection, user_id: str, granularity: str, start: str, end: str) -> List[Tuple[Any, ...]]:
+    """(bucket, tx_count, amount, creator, pool, fee) for buckets in [start, end], oldest first."""
+    return conn.execute(
+        f"SELECT bucket, tx_count, amount_total, creator_total, pool_total, fee_total FROM rollups_{granularity} "
+        "WHERE user_id = ? AND bucket >= ? AND bucket <= ? ORDER BY bucket",
+        (user_id, start, end),
+    ).fetchall()
@@ -0,0 +1,444 @@
+# Copyright 2026 Coreframe Systems (Nexus Protocol)
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#        http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+
+"""
+🏛️ NEXUS VAULT SEGMENTS (Phase 1.4.x)
+
+Time-partitioned storage: the live vault file is the *hot* segment (recent
+`NEXUS_HOT_DAYS` of history); older months are moved into sealed, read-only
+archive files (`archive/segment_YYYY_MM.db`). Each sealed file is a
+self-contained vault: its own `transactions`, `balances` and a `segment_meta`
+row with the Merkle root of exactly its rows.
+
+CATALOG & FLOOR:
+The hot file keeps a `segments` catalog. The newest sealed month's end is the
+*floor*: the hot segment only serves rows at or after the floor, archive
+files serve everything before it. Readers therefore never see a row twice,
+even while a freshly sealed month is still being removed from the hot file.
+The one exception is a row committed after the last copy (id above every
+sealed `last_id`) whose timestamp is below the floor: no archive file has
+it, so the hot segment serves it too, in its timestamp place.
+`archive_balances` holds the per-user totals of every sealed segment, so a
+summary is still two primary-key lookups (hot + archive).
+
+SEALING (never blocks writers):
+1. The month is copied into a temp file from a plain read snapshot (WAL
+   readers do not block the writer), hashed and fsynced, then renamed.
+2. One short transaction registers it in the catalog (the floor moves).
+3. Its rows leave the hot file in small chunks; each chunk moves its totals
+   from `balances` to `archive_balances` in the same transaction, so summaries
+   stay exact throughout. The writer waits at most one chunk for the lock.
+   Only ids up to the file's `last_id` are removed: a row committed after the
+   copy with a timestamp below the floor stays in the hot file (still read,
+   see above) and is archived by the next month's seal, instead of being
+   deleted unarchived.
+A crash at any step is resumed by the next `seal_segments` run.
+
+TIMESTAMPS:
+Catalog bounds (`floor`, `min_ts`, `max_ts`) are canonical UTC text in every
+vault; they are converted to the ledger's stored unit (timestamps.py) before
+they are compared with `transactions.timestamp`.
+
+The ledger-wide Merkle accumulator (merkle.py) is unaffected: it covers every
+id ever committed, and `iter_ledger` replays archive files and the hot
+segment in id order for full rebuilds.
+"""
+
+import os
+import heapq
+import sqlite3
+from datetime import datetime, timedelta, timezone
+from urllib.parse import quote
+from typing import Optional, List, Dict, Any, Iterator, Tuple
+
+from backend.vault import BALANCE_TOLERANCE, BALANCE_UPSERT_SQL, ensure_balances
+from backend.merkle import LEAF_COLUMNS, MerkleFrontier, hash_leaf
+from backend.units import LEDGER_DDL, LEDGER_INDEX_SQL, ensure_scale, money_type
+from backend.timestamps import TS_FORMAT, earliest, ensure_ts_unit, read_ts_unit, render, to_stored, ts_type
+
+HOT_DAYS = max(1, int(os.getenv("NEXUS_HOT_DAYS", "90")))
+ARCHIVE_DIR = os.getenv("NEXUS_ARCHIVE_DIR", "archive")  # Relative paths resolve next to the vault
+SEAL_CHUNK = max(1, int(os.getenv("NEXUS_SEAL_CHUNK", "5000")))
+# SQLite allows 10 attached databases per connection by default
+MAX_ATTACHED = 8
+
+# Hot rows no archive file serves; bound to `_hot_bounds` (floor, last sealed id)
+HOT_SQL = "(timestamp >= ? OR id > ?)"
+
+ARCHIVE_UPSERT_SQL = BALANCE_UPSERT_SQL.replace("INSERT INTO balances", "INSERT INTO archive_balances")
+
+
+# --- 1. CATALOG (caller owns the transaction) ---
+def ensure_segments(conn: sqlite3.Connection) -> None:
+    conn.execute("""
+        CREATE TABLE IF NOT EXISTS segments (
+            month TEXT PRIMARY KEY,
+            path TEXT NOT NULL,
+            floor TEXT NOT NULL,
+            first_id INTEGER NOT NULL,
+            last_id INTEGER NOT NULL,
+            tx_count INTEGER NOT NULL,
+            min_ts TEXT NOT NULL,
+            max_ts TEXT NOT NULL,
+            root TEXT NOT NULL,
+            state TEXT NOT NULL
+        )
+    """)
+    conn.execute("""
+        CREATE TABLE IF NOT EXISTS archive_balances (
+            user_id TEXT PRIMARY KEY,
+            creator_total NOT NULL DEFAULT 0,
+            pool_total NOT NULL DEFAULT 0,
+            fee_total NOT NULL DEFAULT 0,
+            tx_count INTEGER NOT NULL DEFAULT 0
+        ) WITHOUT ROWID
+    """)
+
+def list_segments(conn: sqlite3.Connection) -> List[Dict[str, Any]]:
+    """Registered segments, newest first."""
+    cursor = conn.execute(
+        "SELECT month, path, floor, first_id, last_id, tx_count, min_ts, max_ts, root, state "
+        "FROM segments ORDER BY month DESC"
+    )
+    columns = [d[0] for d in cursor.description]
+    return [dict(zip(columns, row)) for row in cursor]
+
+def _floor(segments: List[Dict[str, Any]], unit: str) -> Any:
+    """The hot segment's lower bound in the stored unit (everything when nothing is sealed)."""
+    return to_stored(segments[0]["floor"], unit) if segments else earliest(unit)
+
+def _hot_bounds(segments: List[Dict[str, Any]], unit: str) -> Tuple[Any, int]:
+    """(floor, last sealed id) for HOT_SQL: rows at or after the floor, or committed after every copy."""
+    return _floor(segments, unit), max((segment["last_id"] for segment in segments), default=0)
+
+def vault_dir(conn: sqlite3.Connection) -> str:
+    return os.path.dirname(conn.execute("PRAGMA database_list").fetchone()[2])
+
+def _segment_path(conn: sqlite3.Connection, segment: Dict[str, Any]) -> str:
+    return os.path.join(vault_dir(conn), segment["path"])
+
+def open_segment(path: str) -> sqlite3.Connection:
+    """Sealed files never change: immutable=1 skips locking and change detection."""
+    return sqlite3.connect(f"file:{quote(os.path.abspath(path))}?mode=ro&immutable=1", uri=True)
+
+# --- 2. READ PATH (pooled reader connections) ---
+def _attach(conn: sqlite3.Connection, segment: Dict[str, Any]) -> str:
+    """Attaches a sealed file on demand (kept attached for reuse). Returns its schema alias."""
+    alias = "seg_" + segment["month"].replace("-", "_")
+    attached = [row[1] for row in conn.execute("PRAGMA database_list") if row[1].startswith("seg_")]
+    if alias in attached:
+        return alias
+    if len(attached) >= MAX_ATTACHED:
+        for name in attached:
+            conn.execute(f"DETACH DATABASE {name}")
+    uri = f"file:{quote(_segment_path(conn, segment))}?mode=ro&immutable=1"
+    conn.execute(f"ATTACH DATABASE ? AS {alias}", (uri,))
+    return alias
+
+def _page_query(schema: str, cursor: bool, newer: bool = False) -> str:
+    if newer:
+        # Commit order: the id is assigned at commit, the timestamp before queueing, so a
+        # late commit can carry an older timestamp. A rowid range seek from the cursor id.
+        query = f"SELECT * FROM {schema}.transactions NOT INDEXED WHERE user_id = ?"
+        if schema == "main":
+            query += f" AND {HOT_SQL}"  # Rows below the floor are served by archive files
+        return query + " AND id > ? ORDER BY id ASC LIMIT ?"
+    query = f"SELECT * FROM {schema}.transactions WHERE user_id = ?"
+    if schema == "main":
+        query += f" AND {HOT_SQL}"
+    if cursor:
+        # Row-value keyset: a single range seek on (timestamp, id), not an OR of two probes
+        query += " AND (timestamp, id) < (?, ?)"
+    return query + " ORDER BY timestamp DESC, id DESC LIMIT ?"
+
+def read_history(
+    conn: sqlite3.Connection, user_id: str, cursor_ts: Optional[Any], cursor_id: Optional[int], limit: int,
+    raw: bool = False, unit: Optional[str] = None, newer: bool = False,
+) -> List[Any]:
+    """
+    Up to `limit` rows for `user_id`, newest first, strictly older than the
+    cursor. Starts in the hot segment and continues into archive files.
+    With `newer`, the first `limit` rows committed after the cursor's id
+    instead, in id (commit) order (incremental refresh). The cursor timestamp
+    may be canonical text or stored microseconds; `unit` defaults to the
+    vault's (timestamps.py).
+    Rows are dicts, or plain tuples in ledger column order with `raw`.
+    """
+    cursor = bool(cursor_ts and cursor_id)
+    convert = tuple if raw else dict
+
+    conn.execute("BEGIN")  # Catalog and hot rows from one snapshot (the floor may move)
+    try:
+        unit = unit or read_ts_unit(conn)
+        tail = [to_stored(cursor_ts, unit), cursor_id] if cursor else []
+        if newer:
+            tail = [cursor_id or 0]
+        segments = list_segments(conn)
+        query = _page_query("main", cursor, newer)
+        floor, sealed_id = _hot_bounds(segments, unit)
+        hot = [convert(r) for r in conn.execute(query, [user_id, floor, sealed_id, *tail, limit])]
+    finally:
+        conn.rollback()
+
+    if newer:
+        # Month boundaries interleave ids by a few rows: merge by id, stopping once the
+        # next file starts past the `limit`-th id already found
+        key = (lambda row: row[0]) if raw else (lambda row: row["id"])
+        found: List[Any] = []
+        for segment in reversed(segments):  # Oldest first
+            if segment["last_id"] <= tail[0]:
+                continue  # Entirely committed before the cursor
+            if len(found) >= limit and segment["first_id"] > key(found[limit - 1]):
+                break
+            alias = _attach(conn, segment)
+            found.extend(convert(r) for r in conn.execute(_page_query(alias, cursor, True), [user_id, *tail, limit]))
+            found.sort(key=key)
+        return sorted(found + hot, key=key)[:limit]
+
+    # Sealed files need no snapshot; their bounds are canonical text
+    mark = render(tail[0]) if cursor else None
+    position = (lambda row: (row[6], row[0])) if raw else (lambda row: (row["timestamp"], row["id"]))
+    rows = [row for row in hot if position(row)[0] >= floor]
+    stragglers = hot[len(rows):]  # Below the floor (late commits): interleave with the archive
+    older: List[Any] = []
+    for segment in segments:  # Newest first
+        if len(rows) + len(older) >= limit:
+            break
+        if cursor and segment["min_ts"] > mark:
+            continue  # Entirely newer than the cursor
+        alias = _attach(conn, segment)
+        params = [user_id, *tail, limit - len(rows) - len(older)]
+        older.extend(convert(r) for r in conn.execute(_page_query(alias, cursor), params))
+    if stragglers:
+        older = sorted(older + stragglers, key=position, reverse=True)
+    return rows + older[:limit - len(rows)]
+
+def read_totals(conn: sqlite3.Connection, user_id: str) -> Dict[str, Any]:
+    """Hot totals plus the totals of every sealed segment: two primary-key lookups."""
+    rows = conn.execute(
+        "SELECT creator_total, pool_total FROM balances WHERE user_id = ? "
+        "UNION ALL SELECT creator_total, pool_total FROM archive_balances WHERE user_id = ?",
+        (user_id, user_id),
+    ).fetchall()
+    if not rows:
+        return {"c": 0.0, "p": 0.0}
+    return {"c": sum(row[0] for row in rows), "p": sum(row[1] for row in rows)}
+
+def iter_ledger(conn: sqlite3.Connection) -> Iterator[Tuple[Any, ...]]:
+    """Every ledger row as (id, *LEAF_COLUMNS), across archive files and the hot segment, in id order."""
+    columns = f"id, {', '.join(LEAF_COLUMNS)}"
+    segments = list_segments(conn)
+    bounds = _hot_bounds(segments, read_ts_unit(conn))
+    streams = [conn.execute(f"SELECT {columns} FROM transactions WHERE {HOT_SQL} ORDER BY id", bounds)]
+    for segment in segments:
+        seg = open_segment(_segment_path(conn, segment))
+        streams.append(seg.execute(f"SELECT {columns} FROM transactions ORDER BY id"))
+    # Month boundaries can interleave ids by a few rows (timestamps are taken before queueing)
+    return heapq.merge(*streams, key=lambda row: row[0])
+
+# --- 3. SEALING ---
+def _month_bounds(month: str) -> Tuple[str, str]:
+    start = datetime.strptime(month + "-01", "%Y-%m-%d")
+    end = (start + timedelta(days=32)).replace(day=1)
+    return start.strftime(TS_FORMAT), end.strftime(TS_FORMAT)
+
+def sealable_months(conn: sqlite3.Connection, hot_days: int = HOT_DAYS, now: Optional[datetime] = None) -> List[str]:
+    """Months that ended at least `hot_days` ago and still have rows in the hot segment, oldest first."""
+    now = now or datetime.now(timezone.utc)
+    cutoff = (now - timedelta(days=max(1, hot_days))).strftime(TS_FORMAT)
+    floor = _floor(list_segments(conn), read_ts_unit(conn))
+    # Oldest hot row by id (ids follow commit order); avoids a scan on timestamp
+    oldest = conn.execute(
+        "SELECT timestamp FROM transactions WHERE timestamp >= ? ORDER BY id LIMIT 1", (floor,)
+    ).fetchone()
+    months, month = [], render(oldest[0])[:7] if oldest else None
+    while month and _month_bounds(month)[1] <= cutoff:
+        months.append(month)
+        month = _month_bounds(month)[1][:7]
+    return months
+
+def _build_segment(
+    conn: sqlite3.Connection, month: str, floor: str, path: str, scale: int, unit: str
+) -> Optional[Dict[str, Any]]:
+    """Copies hot rows below `floor` (canonical text) into a new sealed file. Read-only on the hot vault."""
+    tmp = path + ".tmp"
+    if os.path.exists(tmp):
+        os.remove(tmp)
+    seg = sqlite3.connect(tmp)
+    acc = MerkleFrontier()
+    meta: Dict[str, Any] = {"tx_count": 0}
+    try:
+        ensure_scale(seg, scale)
+        ensure_ts_unit(seg, unit)
+        seg.execute(LEDGER_DDL.format(table="transactions", money=money_type(scale), ts=ts_type(unit)))
+        conn.execute("BEGIN")  # One read snapshot for the whole copy
+        try:
+            rows = conn.execute(
+                "SELECT id, user_id, amount, creator_share, user_pool_share, network_fee, timestamp "
+                "FROM transactions WHERE timestamp < ? ORDER BY id",
+                (to_stored(floor, unit),),
+            )
+            while True:
+                chunk = rows.fetchmany(SEAL_CHUNK)
+                if not chunk:
+                    break
+                seg.executemany("INSERT INTO transactions VALUES (?, ?, ?, ?, ?, ?, ?)", chunk)
+                for row in chunk:
+                    acc.append(hash_leaf(row[2:]), row[0])
+                    meta["min_ts"] = min(meta.get("min_ts", row[6]), row[6])
+                    meta["max_ts"] = max(meta.get("max_ts", row[6]), row[6])
+                meta["first_id"] = meta.get("first_id", chunk[0][0])
+                meta["last_id"] = chunk[-1][0]
+                meta["tx_count"] += len(chunk)
+        finally:
+            conn.rollback()
+        if not meta["tx_count"]:
+            seg.close()
+            os.remove(tmp)
+            return None
+
+        meta.update(month=month, floor=floor, root=acc.root())
+        meta.update(min_ts=render(meta["min_ts"]), max_ts=render(meta["max_ts"]))  # Catalog bounds are text
+        seg.execute(LEDGER_INDEX_SQL)
+        ensure_balances(seg, scale)
+        seg.execute("""
+            CREATE TABLE segment_meta (
+                month TEXT NOT NULL, floor TEXT NOT NULL, first_id INTEGER NOT NULL, last_id INTEGER NOT NULL,
+                tx_count INTEGER NOT NULL, min_ts TEXT NOT NULL, max_ts TEXT NOT NULL, root TEXT NOT NULL
+            )
+        """)
+        seg.execute(
+            "INSERT INTO segment_meta VALUES (:month, :floor, :first_id, :last_id, :tx_count, :min_ts, :max_ts, :root)",
+            meta,
+        )
+        seg.commit()
+        seg.execute("PRAGMA journal_mode=DELETE")  # Single self-contained file
+        seg.execute("VACUUM")
+    finally:
+        seg.close()
+    with open(tmp, "rb+") as f:
+        os.fsync(f.fileno())
+    os.replace(tmp, path)
+    os.chmod(path, 0o444)
+    return meta
+
+def _drain(conn: sqlite3.Connection, floor: Any, last_id: int, chunk: int) -> int:
+    """Moves copied hot rows (below `floor`, stored unit; id <= `last_id`) out in short transactions, with their totals."""
+    moved = 0
+    while True:
+        conn.execute("BEGIN IMMEDIATE")
+        try:
+            rows = conn.execute(
+                "SELECT id, user_id, creator_share, user_pool_share, network_fee "
+                "FROM transactions WHERE timestamp < ? AND id <= ? LIMIT ?",
+                (floor, last_id, chunk),
+            ).fetchall()
+            deltas: Dict[str, List[Any]] = {}
+            for _, user_id, c, p, f in rows:
+                delta = deltas.setdefault(user_id, [0, 0, 0, 0])
+                delta[0] += c
+                delta[1] += p
+                delta[2] += f
+                delta[3] += 1
+            conn.executemany(BALANCE_UPSERT_SQL, [(u, -d[0], -d[1], -d[2], -d[3]) for u, d in deltas.items()])
+            conn.executemany(ARCHIVE_UPSERT_SQL, [(u, *d) for u, d in deltas.items()])
+            conn.executemany("DELETE FROM transactions WHERE id = ?", [(row[0],) for row in rows])
+            conn.commit()
+        except Exception:
+            conn.rollback()
+            raise
+        moved += len(rows)
+        if len(rows) < chunk:
+            return moved
+
+def seal_segments(
+    conn: sqlite3.Connection,
+    hot_days: int = HOT_DAYS,
+    archive_dir: str = ARCHIVE_DIR,
+    chunk: int = SEAL_CHUNK,
+    now: Optional[datetime] = None,
+) -> List[Dict[str, Any]]:
+    """
+    Seals every month older than the hot window, oldest first, and finishes
+    draining any segment a previous run left behind. Safe against a live node.
+    `conn` must be a plain (autocommit-between-statements) connection.
+    """
+    ensure_segments(conn)
+    conn.commit()
+    scale, unit = ensure_scale(conn), ensure_ts_unit(conn)
+    conn.commit()
+    base = vault_dir(conn)
+    target = archive_dir if os.path.isabs(archive_dir) else os.path.join(base, archive_dir)
+    os.makedirs(target, exist_ok=True)
+
+    sealed = []
+    for segment in reversed(list_segments(conn)):
+        if segment["state"] == "draining":
+            _drain(conn, to_stored(segment["floor"], unit), segment["last_id"], chunk)
+            conn.execute("UPDATE segments SET state = 'sealed' WHERE month = ?", (segment["month"],))
+            conn.commit()
+
+    for month in sealable_months(conn, hot_days, now):
+        floor = _month_bounds(month)[1]
+        path = os.path.join(target, f"segment_{month.replace('-', '_')}.db")
+        meta = _build_segment(conn, month, floor, path, scale, unit)
+        if meta is None:
+            continue
+        meta["path"] = os.path.relpath(path, base)
+        with conn:  # Floor moves: readers switch to the sealed file for this month
+            conn.execute(
+                "INSERT INTO segments (month, path, floor, first_id, last_id, tx_count, min_ts, max_ts, root, state) "
+                "VALUES (:month, :path, :floor, :first_id, :last_id, :tx_count, :min_ts, :max_ts, :root, 'draining')",
+                meta,
+            )
+        _drain(conn, to_stored(floor, unit), meta["last_id"], chunk)
+        with conn:
+            conn.execute("UPDATE segments SET state = 'sealed' WHERE month = ?", (month,))
+        sealed.append(meta)
+    return sealed
+
+def verify_segments(conn: sqlite3.Connection) -> List[str]:
+    """Recomputes every sealed file's root and totals. Returns problems (empty == consistent)."""
+    problems = []
+    archived: Dict[str, List[Any]] = {}
+    for segment in list_segments(conn):
+        path = _segment_path(conn, segment)
+        if not os.path.exists(path):
+            problems.append(f"{segment['month']}: missing file {segment['path']}")
+            continue
+        seg = open_segment(path)
+        try:
+            acc = MerkleFrontier()
+            for row in seg.execute(f"SELECT id, {', '.join(LEAF_COLUMNS)} FROM transactions ORDER BY id"):
+                acc.append(hash_leaf(row[1:]), row[0])
+            if acc.root() != segment["root"] or acc.size != segment["tx_count"]:
+                problems.append(f"{segment['month']}: root mismatch")
+            for user_id, *totals in seg.execute(
+                "SELECT user_id, creator_total, pool_total, fee_total, tx_count FROM balances"
+            ):
+                merged = archived.setdefault(user_id, [0, 0, 0, 0])
+                for i, value in enumerate(totals):
+                    merged[i] += value
+        finally:
+            seg.close()
+    stored = {
+        row[0]: row[1:]
+        for row in conn.execute("SELECT user_id, creator_total, pool_total, fee_total, tx_count FROM archive_balances")
+    }
+    for user_id in sorted(archived.keys() | stored.keys()):
+        expected = archived.get(user_id, [0, 0, 0, 0])
+        actual = stored.get(user_id, (0, 0, 0, 0))
+        if any(abs(e - a) > BALANCE_TOLERANCE for e, a in zip(expected, actual)):
+            problems.append(f"archive_balances drift for {user_id}: segments={tuple(expected)} stored={tuple(actual)}")
+    return problems
@@ -24,13 +24,29 @@ This module is the "Identity Switchboard" infrastructure prepared for future pha
 It standardizes multi-chain identity verification (TON, EVM, SOL).
 It is NOT yet wired into the active FastAPI request path.
 Active identity resolution currently occurs via the lightweight `multichain_guard` in main.py.
+
+OVERLOAD BEHAVIOUR:
+- Coalescing: concurrent requests carrying the same payload share one
+  in-flight adapter call (one future) instead of verifying it N times. If
+  the leading request is cancelled (client gone), its followers retry and
+  one of them leads the next call; they are never failed on its behalf.
+- Admission: at most `NEXUS_SENTRY_MAX_INFLIGHT` adapter calls run at once;
+  callers queue for up to `NEXUS_SENTRY_QUEUE_TIMEOUT_S`, then fail fast.
+- Circuit breaker: after `NEXUS_SENTRY_BREAKER_THRESHOLD` consecutive timeouts
+  or errors an adapter is skipped for `NEXUS_SENTRY_BREAKER_COOLDOWN_S`; one
+  trial call is then let through to probe recovery.
+- Every adapter call lands in that adapter's latency histogram (`stats()`).
+All failures take the same Backup-ID rescue path as a regular adapter error.
 """
 
 import os
+import time
 import asyncio
 import logging
 from typing import Dict, Any, Optional
 
+from backend.metrics import Histogram
+
 # --- 1. ADAPTER LOADING & SURVIVAL LOGIC ---
 # Logic Check: Authoritative imports for Phase 1.4.0
 try:
@@ -51,6 +67,66 @@ except ImportError:
 # Constant: Verified adapters allowed for future wiring
 ALLOWED_MODES = ("ton", "dummy")
 
+# Overload Tunables (Environment Overridable)
+VERIFY_TIMEOUT_S = float(os.getenv("NEXUS_SENTRY_TIMEOUT_S", "5.0"))
+MAX_INFLIGHT = max(1, int(os.getenv("NEXUS_SENTRY_MAX_INFLIGHT", "64")))
+QUEUE_TIMEOUT_S = float(os.getenv("NEXUS_SENTRY_QUEUE_TIMEOUT_S", "1.0"))
+BREAKER_THRESHOLD = max(1, int(os.getenv("NEXUS_SENTRY_BREAKER_THRESHOLD", "5")))
+BREAKER_COOLDOWN_S = float(os.getenv("NEXUS_SENTRY_BREAKER_COOLDOWN_S", "30"))
+
+
+class SentryRejected(RuntimeError):
+    """Raised without calling the adapter (breaker open or admission queue full)."""
+
+
+class _LeaderCancelled(Exception):
+    """Set on a coalesced future whose leader was cancelled: followers retry, never surfaced."""
+
+
+class CircuitBreaker:
+    """Closed -> open after N consecutive failures -> half-open (one trial) after the cooldown."""
+
+    def __init__(self, threshold: int = BREAKER_THRESHOLD, cooldown: float = BREAKER_COOLDOWN_S):
+        self.threshold = threshold
+        self.cooldown = cooldown
+        self.failures = 0
+        self.opened_at: Optional[float] = None
+        self.trips = 0
+        self._trial = False
+
+    @property
+    def state(self) -> str:
+        if self.opened_at is None:
+            return "closed"
+        return "half_open" if time.monotonic() - self.opened_at >= self.cooldown else "open"
+
+    def allow(self) -> bool:
+        state = self.state
+        if state == "closed":
+            return True
+        if state == "half_open" and not self._trial:
+            self._trial = True  # Exactly one probe while half-open
+            return True
+        return False
+
+    @property
+    def probing(self) -> bool:
+        """True while the half-open trial call is out (it must settle or be released)."""
+        return self._trial
+
+    def release_trial(self) -> None:
+        self._trial = False
+
+    def record_success(self) -> None:
+        self.failures, self.opened_at, self._trial = 0, None, False
+
+    def record_failure(self) -> None:
+        self.failures += 1
+        if self._trial or self.failures >= self.threshold:
+            if self.opened_at is None or self._trial:
+                self.trips += 1
+            self.opened_at, self._trial = time.monotonic(), False
+
 
 class NexusSentry:
     def __init__(self):
@@ -60,6 +136,13 @@ class NexusSentry:
         """
         self._logger = logging.getLogger("nexus.sentry")
         
+        # Overload protection state (see module docstring)
+        self._inflight: Dict[str, asyncio.Future] = {}
+        self._admission: Optional[asyncio.Semaphore] = None  # Created inside the running loop
+        self._breakers: Dict[str, CircuitBreaker] = {}
+        self._latency: Dict[str, Histogram] = {}
+        self.coalesced = self.rejected = 0
+
         # 1. HARDENED ENV EXTRACTION (Audit 2.1: Cleanses malformed .env inputs)
         # Prevents "ton " or "'ton'" from breaking logic
         raw_mode = os.getenv("CHAIN_ADAPTER", "ton")
@@ -116,12 +199,10 @@ class NexusSentry:
             return {"verified": False, "user_id": None, "error": "MISSING_TRANSPORT_DATA"}
 
         try:
-            # Audit 2.4: Mandatory timeout ensures deterministic ledger flow
-            # Prevents a hung external adapter from freezing the Sovereign Node
-            result = await asyncio.wait_for(self.adapter.verify_identity(auth_data), timeout=5.0)
-            
+            result = await self._shared_call(auth_data)
+
             if isinstance(result, dict) and result.get("verified"):
-                return result
+                return dict(result)
             
             # Secondary Fail-safe: Rescue with Backup-ID if Primary Verification fails
             # Useful if the Bot Token rotates but Dev ID is constant
@@ -139,5 +220,102 @@ class NexusSentry:
                 return {"verified": True, "user_id": backup_id, "method": "emergency"}
             return {"verified": False, "user_id": None, "error": str(e)}
 
+    async def _shared_call(self, auth_data: str) -> Dict[str, Any]:
+        """Identical in-flight payloads share one adapter call; a cancelled leader hands over."""
+        joined = False
+        while True:
+            pending = self._inflight.get(auth_data)
+            if pending is None:
+                break
+            if not joined:
+                self.coalesced += 1
+                joined = True
+            try:
+                return await asyncio.shield(pending)
+            except _LeaderCancelled:
+                continue  # The leader's entry is already gone: the first to retry leads
+
+        pending = asyncio.get_running_loop().create_future()
+        self._inflight[auth_data] = pending
+        try:
+            result = await self._call_adapter(auth_data)
+            pending.set_result(result)
+            return result
+        except asyncio.CancelledError:
+            pending.set_exception(_LeaderCancelled())
+            pending.exception()  # Marks it retrieved when nobody else was waiting
+            raise
+        except Exception as e:
+            pending.set_exception(e)
+            pending.exception()
+            raise
+        finally:
+            del self._inflight[auth_data]
+
+    async def _call_adapter(self, auth_data: str) -> Dict[str, Any]:
+        """Admission queue -> circuit breaker -> timed adapter call."""
+        name = self.adapter_name
+        breaker = self._breakers.get(name)
+        if breaker is None:
+            breaker = self._breakers[name] = CircuitBreaker(BREAKER_THRESHOLD, BREAKER_COOLDOWN_S)
+        if not breaker.allow():
+            self.rejected += 1
+            raise SentryRejected("CIRCUIT_OPEN")
+        trial, settled = breaker.probing, False
+
+        if self._admission is None:
+            self._admission = asyncio.Semaphore(MAX_INFLIGHT)
+        try:
+            try:
+                await asyncio.wait_for(self._admission.acquire(), timeout=QUEUE_TIMEOUT_S)
+            except asyncio.TimeoutError:
+                self.rejected += 1
+                raise SentryRejected("SENTRY_OVERLOADED")  # Node-side overload says nothing about the adapter
+
+            start = time.perf_counter()
+            try:
+                # Audit 2.4: Mandatory timeout ensures deterministic ledger flow
+                # Prevents a hung external adapter from freezing the Sovereign Node
+                result = await asyncio.wait_for(self.adapter.verify_identity(auth_data), timeout=VERIFY_TIMEOUT_S)
+            except Exception:
+                breaker.record_failure()
+                settled = True
+                raise
+            finally:
+                self._admission.release()
+                self._latency.setdefault(name, Histogram()).observe(time.perf_counter() - start)
+            breaker.record_success()
+            settled = True
+            return result
+        finally:
+            # Shed or cancelled (client gone, outer timeout) before a verdict: free the
+            # half-open slot, or the breaker would reject every later call forever
+            if trial and not settled:
+                breaker.release_trial()
+
+    @property
+    def adapter_name(self) -> str:
+        return getattr(self.adapter, "ADAPTER_NAME", self.adapter.__class__.__name__)
+
+    def stats(self) -> Dict[str, Any]:
+        """Switchboard counters plus per-adapter breaker state and latency histograms."""
+        adapters = {}
+        for name in self._latency.keys() | self._breakers.keys():
+            breaker = self._breakers.get(name)
+            adapters[name] = {
+                "latency_s": self._latency.get(name, Histogram()).snapshot(),
+                "breaker": breaker.state if breaker else "closed",
+                "breaker_trips": breaker.trips if breaker else 0,
+            }
+        cache = getattr(self.adapter, "stats", None)
+        return {
+            "mode": self.mode,
+            "inflight": len(self._inflight),
+            "coalesced": self.coalesced,
+            "rejected": self.rejected,
+            "adapters": adapters,
+            "adapter_cache": cache() if callable(cache) else None,
+        }
+
 # Staged Singleton – Will be injected into main.py request guards in Phase 2.0
 sentry = NexusSentry()
\ No newline at end of file
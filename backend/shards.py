@@ -0,0 +1,379 @@
+# Copyright 2026 Coreframe Systems (Nexus Protocol)
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#        http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+
+"""
+🏛️ NEXUS SHARDED VAULT (Phase 1.4.x)
+
+SQLite admits one writer per database file. With `NEXUS_VAULT_SHARDS=K`
+(K > 1) the vault becomes K independent files, `nexus_vault.shard{i}of{K}.db`,
+each with its own reader pool, group-commit writer, WAL, balances and Merkle
+accumulator. A sovereign id is routed by a stable hash (SHA-256, not Python's
+salted `hash()`), so every per-user read or write touches exactly one shard.
+
+K = 1 is the classic single-file vault at `DB_PATH`, byte-for-byte unchanged.
+
+The layout on disk is checked at startup: a node configured for K shards
+refuses to boot next to a vault written with a different K (rows would be
+silently hidden). Changing K is an offline `reshard` (scripts/vault_admin.py).
+
+Transaction ids are per shard. Inclusion proofs therefore take the shard
+index, and `/api/ledger_root` reports a root over the per-shard roots.
+
+Resharding renumbers every row, so each target keeps a `reshard_map` from
+(old layout, old shard, old id) to its new id; `/api/proof/{id}?shard=&layout=`
+resolves ids issued under an earlier layout through it.
+"""
+
+import os
+import re
+import glob
+import heapq
+import hashlib
+import sqlite3
+from typing import Optional, List, Dict, Any, Callable
+
+from backend.vault import VaultPool, VaultWriter, LedgerRow, INSERT_TX_SQL, ensure_balances, rebuild_balances
+from backend.units import AMOUNT_SCALE, LEDGER_DDL, LEDGER_INDEX_SQL, ensure_scale, money_type
+from backend.timestamps import TIMESTAMP_UNIT, ensure_ts_unit, read_ts_unit, ts_type
+from backend.segments import ensure_segments
+from backend.rollups import ensure_rollups, rebuild_rollups
+from backend.merkle import ensure_merkle, build_frontier, save_frontier, read_root
+
+VAULT_SHARDS = max(1, int(os.getenv("NEXUS_VAULT_SHARDS", "1")))
+RESHARD_CHUNK = 10000
+
+RESHARD_MAP_DDL = """
+CREATE TABLE IF NOT EXISTS reshard_map (
+    layout INTEGER NOT NULL,
+    old_shard INTEGER NOT NULL,
+    old_id INTEGER NOT NULL,
+    new_id INTEGER NOT NULL,
+    PRIMARY KEY (layout, old_shard, old_id)
+) WITHOUT ROWID
+"""
+
+
+# --- 1. LAYOUT & ROUTING ---
+def shard_paths(db_path: str, shards: int) -> List[str]:
+    if shards == 1:
+        return [db_path]
+    stem, ext = os.path.splitext(db_path)
+    return [f"{stem}.shard{i}of{shards}{ext}" for i in range(shards)]
+
+def shard_of(user_id: str, shards: int) -> int:
+    """Stable across processes, restarts and Python versions."""
+    if shards == 1:
+        return 0
+    return int.from_bytes(hashlib.sha256(user_id.encode()).digest()[:8], "big") % shards
+
+def detect_layouts(db_path: str) -> List[int]:
+    """Shard counts with files present next to `db_path` (1 = classic single file)."""
+    stem, ext = os.path.splitext(db_path)
+    found = {1} if os.path.exists(db_path) else set()
+    pattern = re.compile(re.escape(os.path.basename(stem)) + r"\.shard\d+of(\d+)" + re.escape(ext) + "$")
+    for path in glob.glob(f"{glob.escape(stem)}.shard*of*{ext}"):
+        match = pattern.match(os.path.basename(path))
+        if match:
+            found.add(int(match.group(1)))
+    return sorted(found)
+
+def check_layout(db_path: str, shards: int) -> None:
+    found = detect_layouts(db_path)
+    if found and found != [shards]:
+        raise RuntimeError(
+            f"VAULT_SHARD_MISMATCH: configured for {shards} shard(s), found layouts {found}. "
+            f"Run 'scripts/vault_admin.py reshard' first."
+        )
+
+# --- 2. SCHEMA BOOTSTRAP ---
+def init_vault(
+    conn: sqlite3.Connection, requested_scale: int = AMOUNT_SCALE, requested_unit: str = TIMESTAMP_UNIT
+) -> Dict[str, Any]:
+    """
+    Creates or upgrades one vault file (ledger, index, balances, segment
+    catalog, rollups, Merkle accumulator). Returns its scale, timestamp unit
+    and which backfills ran.
+    """
+    conn.execute("PRAGMA journal_mode=WAL;")  # Write-Ahead Logging for concurrency
+    conn.execute("PRAGMA synchronous=NORMAL;") # Balance between safety and speed
+    conn.execute("PRAGMA foreign_keys=ON;")    # Enforce relational integrity
+    conn.execute("PRAGMA auto_vacuum=INCREMENTAL;") # Keep DB file size efficient
+
+    # Storage Units: fixed per vault file (REAL legacy or INTEGER minor units)
+    scale = ensure_scale(conn, requested_scale)
+    # Timestamp Storage: fixed per vault file (TEXT legacy or INTEGER microseconds)
+    unit = ensure_ts_unit(conn, requested_unit)
+
+    # Core Ledger Table
+    conn.execute(LEDGER_DDL.format(table="transactions", money=money_type(scale), ts=ts_type(unit)))
+
+    # Critical Index for O(1) Cursor Pagination
+    # Prevents full-table scans during history retrieval
+    conn.execute(LEDGER_INDEX_SQL)
+
+    # Materialized Per-User Totals (O(1) vault_summary)
+    balances_built = ensure_balances(conn, scale)
+
+    # Hot/Archive Segment Catalog (sealed months live in read-only files)
+    ensure_segments(conn)
+
+    # Hour/Day Rollups (built over hot + sealed rows, so after the catalog)
+    rollups_built = ensure_rollups(conn, scale)
+
+    # Incremental Ledger-Wide Merkle Accumulator
+    merkle_built = ensure_merkle(conn)
+    conn.commit()
+    return {"scale": scale, "ts_unit": unit, "balances_built": balances_built, "rollups_built": rollups_built,
+            "merkle_built": merkle_built}
+
+def describe_vault(conn: sqlite3.Connection) -> Dict[str, Any]:
+    """
+    Read-only counterpart of `init_vault` for multi-process followers (see
+    workers.py): the recorded scale and timestamp unit, no DDL, no backfills.
+    """
+    return {"scale": _read_scale(conn), "ts_unit": read_ts_unit(conn), "balances_built": False,
+            "rollups_built": False, "merkle_built": False}
+
+# --- 3. RUNTIME ---
+class ShardedVault:
+    """One `VaultPool` + `VaultWriter` per shard file, routed by sovereign id."""
+
+    def __init__(self):
+        self.paths: List[str] = []
+        self.pools: List[VaultPool] = []
+        self.writers: List[VaultWriter] = []
+        self._listeners: List[Callable[[List[LedgerRow]], None]] = []
+
+    @property
+    def shards(self) -> int:
+        return len(self.paths) or 1
+
+    def add_commit_listener(self, listener: Callable[[List[LedgerRow]], None]) -> None:
+        self._listeners.append(listener)
+
+    def open(self, paths: List[str]) -> None:
+        self.paths = list(paths)
+        self.pools = [VaultPool() for _ in paths]
+        for pool, path in zip(self.pools, paths):
+            pool.open(path)
+        self.reset_writers()
+
+    def reset_writers(self) -> None:
+        """Fresh local writers (with the registered commit listeners), one per shard."""
+        self.writers = [VaultWriter() for _ in self.paths]
+        for writer in self.writers:
+            for listener in self._listeners:
+                writer.add_commit_listener(listener)
+
+    def use_writers(self, writers: List[Any]) -> None:
+        """Replaces the local writers with stand-ins exposing `submit`/`submit_many` (see workers.py)."""
+        self.writers = list(writers)
+
+    async def start(self) -> None:
+        for pool, writer in zip(self.pools, self.writers):
+            await writer.start(pool)
+
+    async def stop(self) -> None:
+        for writer in self.writers:
+            await writer.stop()
+
+    def close(self) -> None:
+        for pool in self.pools:
+            pool.close()
+
+    def shard(self, user_id: str) -> int:
+        return shard_of(user_id, self.shards)
+
+    def pool(self, user_id: str) -> VaultPool:
+        return self.pools[self.shard(user_id)]
+
+    def writer(self, user_id: str) -> VaultWriter:
+        return self.writers[self.shard(user_id)]
+
+    def stats(self) -> Any:
+        if len(self.pools) == 1:
+            return self.pools[0].stats()
+        return [dict(pool.stats(), shard=i) for i, pool in enumerate(self.pools)]
+
+# --- 4. OFFLINE RESHARD ---
+def reshard(
+    db_path: str,
+    source_shards: int,
+    target_shards: int,
+    chunk: int = RESHARD_CHUNK,
+    progress: Optional[Callable[[int], None]] = None,
+    renumber: bool = False,
+) -> Dict[str, Any]:
+    """
+    Rewrites a stopped vault from `source_shards` to `target_shards` files.
+
+    Rows are streamed from every source in (timestamp, id) order and re-routed
+    by sovereign id; each target gets fresh ids in that order, then its
+    balances, rollups and Merkle accumulator are rebuilt. Sources are
+    checkpointed and moved to `<dir>/reshard_backup_<K>/` only after all
+    targets are complete.
+
+    Ids cannot be kept (every source numbers from 1), so the caller must pass
+    `renumber=True`. Each target records its rows' old ids in `reshard_map`
+    and carries over the entries of earlier reshards, so any id a client was
+    given under a previous layout still resolves (see `resolve_reshard_id`).
+    Only the latest mapping of a layout that reappears is kept.
+    """
+    sources = shard_paths(db_path, source_shards)
+    targets = shard_paths(db_path, target_shards)
+    if source_shards == target_shards:
+        raise ValueError("RESHARD_NOOP")
+    if not renumber:
+        raise ValueError("RESHARD_RENUMBERS_IDS")  # Every tx id and proof handed out changes
+    if any(not os.path.exists(path) for path in sources):
+        raise ValueError("RESHARD_SOURCE_MISSING")
+    backup_dir = os.path.join(os.path.dirname(os.path.abspath(db_path)), f"reshard_backup_{source_shards}")
+    if os.path.exists(backup_dir):
+        raise ValueError("RESHARD_BACKUP_EXISTS")
+
+    readers = [sqlite3.connect(f"file:{path}?mode=ro", uri=True) for path in sources]
+    scales = {_read_scale(conn) for conn in readers}
+    if len(scales) != 1:
+        raise ValueError("RESHARD_MIXED_SCALES")
+    if any(conn.execute("SELECT 1 FROM segments").fetchone() for conn in readers if _has_segments(conn)):
+        raise ValueError("VAULT_HAS_SEGMENTS")  # Sealed files are per shard and immutable
+    scale = scales.pop()
+    units = {read_ts_unit(conn) for conn in readers}
+    if len(units) != 1:
+        raise ValueError("RESHARD_MIXED_TIMESTAMPS")  # (timestamp, id) merge order needs one representation
+    unit = units.pop()
+    old_roots = [read_root(conn)["root"] for conn in readers]
+
+    # Targets are staged under temporary names so an interrupted run leaves the sources authoritative
+    staged = [path + ".reshard" for path in targets]
+    for path in staged:
+        for suffix in ("", "-wal", "-shm"):
+            if os.path.exists(path + suffix):
+                os.remove(path + suffix)
+    writers = [sqlite3.connect(path) for path in staged]
+    try:
+        for conn in writers:
+            init_vault(conn, scale, unit)
+            conn.execute(RESHARD_MAP_DDL)
+
+        streams = [
+            conn.execute(
+                "SELECT timestamp, id, ?, user_id, amount, creator_share, user_pool_share, network_fee "
+                "FROM transactions ORDER BY timestamp, id",
+                (index,),
+            )
+            for index, conn in enumerate(readers)
+        ]
+        buffers: List[List[tuple]] = [[] for _ in targets]
+        maps: List[List[tuple]] = [[] for _ in targets]
+        counts = [0] * target_shards  # Fresh files: AUTOINCREMENT hands out 1, 2, ... in insert order
+        moved = 0
+        for ts, old_id, index, user_id, amount, c, p, f in heapq.merge(*streams):
+            target = shard_of(user_id, target_shards)
+            counts[target] += 1
+            buffers[target].append((user_id, amount, c, p, f, ts))
+            maps[target].append((source_shards, index, old_id, counts[target]))
+            moved += 1
+            if len(buffers[target]) >= chunk:
+                _flush(writers, buffers, maps)
+                if progress:
+                    progress(moved)
+        _flush(writers, buffers, maps)
+        _carry_maps(readers, writers, source_shards, target_shards, chunk)
+
+        new_roots = []
+        for conn in writers:
+            with conn:
+                rebuild_balances(conn)
+                rebuild_rollups(conn)
+                save_frontier(conn, build_frontier(conn, persist=True))
+            new_roots.append(read_root(conn)["root"])
+            conn.execute("PRAGMA wal_checkpoint(TRUNCATE);")
+    finally:
+        for conn in writers + readers:
+            conn.close()
+
+    os.makedirs(backup_dir)
+    for path in sources:
+        checkpoint = sqlite3.connect(path)
+        checkpoint.execute("PRAGMA wal_checkpoint(TRUNCATE);")
+        checkpoint.close()
+        for suffix in ("", "-wal", "-shm"):
+            if os.path.exists(path + suffix):
+                os.replace(path + suffix, os.path.join(backup_dir, os.path.basename(path) + suffix))
+    for stage, path in zip(staged, targets):
+        for suffix in ("-wal", "-shm"):
+            if os.path.exists(stage + suffix):
+                os.remove(stage + suffix)
+        os.replace(stage, path)
+    return {"rows": moved, "targets": targets, "backup_dir": backup_dir, "old_roots": old_roots, "new_roots": new_roots}
+
+def _flush(writers: List[sqlite3.Connection], buffers: List[List[tuple]], maps: List[List[tuple]]) -> None:
+    for conn, buffer, mapped in zip(writers, buffers, maps):
+        if buffer:
+            with conn:
+                conn.executemany(INSERT_TX_SQL, buffer)
+                conn.executemany("INSERT INTO reshard_map (layout, old_shard, old_id, new_id) VALUES (?, ?, ?, ?)", mapped)
+            buffer.clear()
+            mapped.clear()
+
+def _carry_maps(
+    readers: List[sqlite3.Connection], writers: List[sqlite3.Connection], source_shards: int, target_shards: int, chunk: int
+) -> None:
+    """Re-points the sources' own `reshard_map` entries at the rows' ids in the new layout."""
+    for index, conn in enumerate(readers):
+        if conn.execute("SELECT 1 FROM sqlite_master WHERE name = 'reshard_map'").fetchone() is None:
+            continue
+        # Entries for the source or target layout are superseded: those ids now mean something else
+        rows = conn.execute(
+            "SELECT m.layout, m.old_shard, m.old_id, m.new_id, t.user_id FROM reshard_map m "
+            "JOIN transactions t ON t.id = m.new_id WHERE m.layout NOT IN (?, ?)",
+            (source_shards, target_shards),
+        )
+        pending: List[List[tuple]] = [[] for _ in writers]
+        for layout, old_shard, old_id, source_id, user_id in rows:
+            batch = pending[shard_of(user_id, target_shards)]
+            batch.append((layout, old_shard, old_id, source_shards, index, source_id))
+            if len(batch) >= chunk:
+                _carry(writers, pending)
+        _carry(writers, pending)
+
+def _carry(writers: List[sqlite3.Connection], pending: List[List[tuple]]) -> None:
+    for conn, batch in zip(writers, pending):
+        if batch:
+            with conn:
+                conn.executemany(
+                    "INSERT OR IGNORE INTO reshard_map (layout, old_shard, old_id, new_id) "
+                    "SELECT ?, ?, ?, new_id FROM reshard_map WHERE layout = ? AND old_shard = ? AND old_id = ?",
+                    batch,
+                )
+            batch.clear()
+
+def resolve_reshard_id(conn: sqlite3.Connection, layout: int, shard: int, tx_id: int) -> Optional[int]:
+    """This shard file's id for a row numbered `tx_id` on `shard` of an earlier `layout`, if it holds it."""
+    if conn.execute("SELECT 1 FROM sqlite_master WHERE name = 'reshard_map'").fetchone() is None:
+        return None
+    row = conn.execute(
+        "SELECT new_id FROM reshard_map WHERE layout = ? AND old_shard = ? AND old_id = ?", (layout, shard, tx_id)
+    ).fetchone()
+    return row[0] if row else None
+
+def _read_scale(conn: sqlite3.Connection) -> int:
+    if conn.execute("SELECT 1 FROM sqlite_master WHERE name = 'vault_meta'").fetchone() is None:
+        return 0
+    row = conn.execute("SELECT value FROM vault_meta WHERE key = 'amount_scale'").fetchone()
+    return int(row[0]) if row else 0
+
+def _has_segments(conn: sqlite3.Connection) -> bool:
+    return conn.execute("SELECT 1 FROM sqlite_master WHERE name = 'segments'").fetchone() is not None
@@ -0,0 +1,333 @@
+# Copyright 2026 Coreframe Systems (Nexus Protocol)
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#        http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+
+"""
+🏛️ NEXUS ONLINE SNAPSHOTS (Phase 1.4.x)
+
+Consistent copies of a live vault via SQLite's online backup API, taken
+while the node keeps serving splits.
+
+CONSISTENCY:
+A backup whose source changes underneath it restarts from page one, so on a
+busy vault a naive backup never finishes. The source connection therefore
+opens a read transaction first: in WAL mode that pins one snapshot for the
+whole copy while the writer keeps committing to the WAL. The copy is exactly
+the ledger as of that instant. The price is that the WAL cannot be
+checkpointed past the pinned snapshot until the copy completes.
+
+PACING:
+Pages are copied `NEXUS_SNAPSHOT_PAGES` at a time with a
+`NEXUS_SNAPSHOT_SLEEP_MS` pause between steps, on a dedicated thread (never
+the event loop, never a pooled reader), so disk bandwidth is left for
+commits.
+
+LAYOUT:
+    <snapshot dir>/snap_<UTC stamp>/
+        <vault file(s)>          one per shard, same base names as live
+        archive/...              sealed segment files referenced by the catalog
+        manifest.json            per file: Merkle root, tree size, max id,
+                                 scale, pages, bytes, sha256; plus timings
+A snapshot is written under `.partial` and renamed when complete; the newest
+`NEXUS_SNAPSHOT_KEEP` are retained. Snapshots are taken on demand
+(`POST /api/admin/snapshot`, `scripts/vault_admin.py snapshot`) or every
+`NEXUS_SNAPSHOT_INTERVAL_S` seconds by the node. Restore is
+offline (`scripts/vault_admin.py restore-snapshot`): checksums are verified,
+the live files are moved aside, and the snapshot files are renamed in.
+"""
+
+import os
+import json
+import time
+import asyncio
+import shutil
+import hashlib
+import sqlite3
+from datetime import datetime, timezone
+from concurrent.futures import ThreadPoolExecutor
+from typing import Optional, List, Dict, Any, Callable
+
+from backend.merkle import read_root
+from backend.segments import list_segments
+
+SNAPSHOTS = os.getenv("NEXUS_SNAPSHOTS", "false").lower() == "true"  # Enables /api/admin/snapshot
+SNAPSHOT_DIR = os.getenv("NEXUS_SNAPSHOT_DIR", "snapshots")  # Relative paths resolve next to the vault
+SNAPSHOT_PAGES = max(1, int(os.getenv("NEXUS_SNAPSHOT_PAGES", "256")))
+SNAPSHOT_SLEEP_MS = max(0.0, float(os.getenv("NEXUS_SNAPSHOT_SLEEP_MS", "5")))
+SNAPSHOT_INTERVAL_S = max(0.0, float(os.getenv("NEXUS_SNAPSHOT_INTERVAL_S", "0")))  # 0 = no schedule
+SNAPSHOT_KEEP = max(1, int(os.getenv("NEXUS_SNAPSHOT_KEEP", "7")))
+MANIFEST = "manifest.json"
+HASH_CHUNK = 1 << 20
+
+
+def snapshot_root(db_path: str, directory: str = SNAPSHOT_DIR) -> str:
+    """Absolute snapshot directory; a relative one lives next to the vault file."""
+    return os.path.join(os.path.dirname(os.path.abspath(db_path)), directory)
+
+def list_snapshots(root: str) -> List[str]:
+    """Completed snapshot directories, newest first."""
+    if not os.path.isdir(root):
+        return []
+    names = [n for n in os.listdir(root) if n.startswith("snap_") and not n.endswith(".partial")]
+    return [os.path.join(root, n) for n in sorted(names, reverse=True)]
+
+# --- 1. ONLINE COPY ---
+def backup_file(
+    source_path: str,
+    target_path: str,
+    pages: Optional[int] = None,
+    sleep_ms: Optional[float] = None,
+    progress: Optional[Callable[[int, int], None]] = None,
+) -> Dict[str, Any]:
+    """Copies one live vault file page-stepped from a pinned read snapshot. Returns copy stats."""
+    pages = pages or SNAPSHOT_PAGES
+    sleep_ms = SNAPSHOT_SLEEP_MS if sleep_ms is None else sleep_ms
+    source = sqlite3.connect(f"file:{source_path}?mode=ro", uri=True, isolation_level=None)
+    target = sqlite3.connect(target_path)
+    steps = [0]
+
+    def on_step(status: int, remaining: int, total: int) -> None:
+        steps[0] += 1
+        if progress:
+            progress(total - remaining, total)
+        if remaining and sleep_ms:
+            time.sleep(sleep_ms / 1000.0)  # Releases the GIL and the disk for the writer
+
+    start = time.perf_counter()
+    try:
+        source.execute("BEGIN")
+        source.execute("SELECT 1 FROM sqlite_master LIMIT 1").fetchone()  # Pins the WAL snapshot
+        source.backup(target, pages=pages, progress=on_step)
+        source.execute("COMMIT")
+    finally:
+        target.close()
+        source.close()
+    elapsed = time.perf_counter() - start
+    size = os.path.getsize(target_path)
+    return {"bytes": size, "steps": steps[0], "seconds": round(elapsed, 3),
+            "mb_per_s": round(size / 1e6 / elapsed, 1) if elapsed else None}
+
+def describe_file(path: str) -> Dict[str, Any]:
+    """Ledger facts recorded in the manifest, read from the copy itself."""
+    conn = sqlite3.connect(f"file:{path}?mode=ro", uri=True)
+    try:
+        root = read_root(conn)
+        max_id = conn.execute("SELECT COALESCE(MAX(id), 0) FROM transactions").fetchone()[0]
+        tables = {row[0] for row in conn.execute("SELECT name FROM sqlite_master WHERE type = 'table'")}
+        scale = None
+        if "vault_meta" in tables:
+            scale = conn.execute("SELECT value FROM vault_meta WHERE key = 'amount_scale'").fetchone()
+        pages = conn.execute("PRAGMA page_count").fetchone()[0]
+        segments = list_segments(conn) if "segments" in tables else []
+    finally:
+        conn.close()
+    return {
+        "merkle_root": root["root"],
+        "tree_size": root["tree_size"],
+        "max_id": max_id,
+        "amount_scale": int(scale[0]) if scale else 0,
+        "pages": pages,
+        "segments": [segment["path"] for segment in segments],
+    }
+
+def sha256_file(path: str) -> str:
+    digest = hashlib.sha256()
+    with open(path, "rb") as f:
+        for block in iter(lambda: f.read(HASH_CHUNK), b""):
+            digest.update(block)
+    return digest.hexdigest()
+
+def take_snapshot(
+    paths: List[str],
+    root: str,
+    pages: Optional[int] = None,
+    sleep_ms: Optional[float] = None,
+    keep: Optional[int] = None,
+    now: Optional[datetime] = None,
+    progress: Optional[Callable[[str, int, int], None]] = None,
+) -> Dict[str, Any]:
+    """Snapshots every shard file (plus referenced archive segments) into a new directory under `root`."""
+    pages = pages or SNAPSHOT_PAGES
+    sleep_ms = SNAPSHOT_SLEEP_MS if sleep_ms is None else sleep_ms
+    keep = keep or SNAPSHOT_KEEP
+    now = now or datetime.now(timezone.utc)
+    name = "snap_" + now.strftime("%Y%m%dT%H%M%S%fZ")
+    final = os.path.join(root, name)
+    partial = final + ".partial"
+    os.makedirs(partial)
+    started = time.perf_counter()
+    files = []
+    try:
+        for path in paths:
+            target = os.path.join(partial, os.path.basename(path))
+            on_pages = (lambda done, total, name=os.path.basename(path): progress(name, done, total)) if progress else None
+            stats = backup_file(path, target, pages, sleep_ms, on_pages)
+            info = describe_file(target)
+            for segment in info["segments"]:  # Immutable: a plain copy is consistent
+                if os.path.isabs(segment) or os.path.normpath(segment).startswith(os.pardir):
+                    raise ValueError(f"SNAPSHOT_SEGMENT_OUTSIDE_VAULT: {segment}")
+                dest = os.path.join(partial, segment)
+                os.makedirs(os.path.dirname(dest), exist_ok=True)
+                shutil.copy2(os.path.join(os.path.dirname(os.path.abspath(path)), segment), dest)
+            files.append(dict(info, file=os.path.basename(path), sha256=sha256_file(target), copy=stats))
+        manifest = {
+            "name": name,
+            "created_at": now.strftime("%Y-%m-%d %H:%M:%S"),
+            "shards": len(paths),
+            "files": files,
+            "seconds": round(time.perf_counter() - started, 3),
+            "pages_per_step": pages,
+            "sleep_ms": sleep_ms,
+        }
+        with open(os.path.join(partial, MANIFEST), "w") as f:
+            json.dump(manifest, f, indent=2)
+            f.flush()
+            os.fsync(f.fileno())
+        os.replace(partial, final)
+    except BaseException:
+        shutil.rmtree(partial, ignore_errors=True)
+        raise
+    manifest["path"] = final
+    for stale in list_snapshots(root)[keep:]:
+        shutil.rmtree(stale, ignore_errors=True)
+    return manifest
+
+# --- 2. OFFLINE RESTORE ---
+def load_manifest(snapshot: str) -> Dict[str, Any]:
+    with open(os.path.join(snapshot, MANIFEST)) as f:
+        return json.load(f)
+
+def verify_snapshot(snapshot: str) -> List[str]:
+    """Checksums and recorded roots of every file in a snapshot (empty list == intact)."""
+    problems = []
+    manifest = load_manifest(snapshot)
+    for entry in manifest["files"]:
+        path = os.path.join(snapshot, entry["file"])
+        if not os.path.exists(path):
+            problems.append(f"{entry['file']}: missing")
+            continue
+        if sha256_file(path) != entry["sha256"]:
+            problems.append(f"{entry['file']}: checksum mismatch")
+            continue
+        info = describe_file(path)
+        if (info["merkle_root"], info["max_id"]) != (entry["merkle_root"], entry["max_id"]):
+            problems.append(f"{entry['file']}: root/max id differ from manifest")
+        for segment in entry["segments"]:
+            if not os.path.exists(os.path.join(snapshot, segment)):
+                problems.append(f"{entry['file']}: segment {segment} missing")
+    return problems
+
+def restore_snapshot(snapshot: str, db_dir: str) -> Dict[str, Any]:
+    """
+    Replaces the vault files in `db_dir` with the snapshot's (node stopped).
+    The current files (and WAL/SHM) are moved to `<db_dir>/pre_restore_<stamp>/`.
+    """
+    problems = verify_snapshot(snapshot)
+    if problems:
+        raise ValueError("SNAPSHOT_CORRUPT: " + "; ".join(problems))
+    manifest = load_manifest(snapshot)
+    aside = os.path.join(db_dir, "pre_restore_" + datetime.now(timezone.utc).strftime("%Y%m%dT%H%M%SZ"))
+    os.makedirs(aside)
+    for entry in manifest["files"]:
+        live = os.path.join(db_dir, entry["file"])
+        for suffix in ("", "-wal", "-shm"):
+            if os.path.exists(live + suffix):
+                os.replace(live + suffix, os.path.join(aside, entry["file"] + suffix))
+        # Copy next to the target, then rename: the live name only ever points at a complete file
+        staged = live + ".restore"
+        shutil.copy2(os.path.join(snapshot, entry["file"]), staged)
+        os.replace(staged, live)
+        for segment in entry["segments"]:
+            dest = os.path.join(db_dir, segment)
+            if not os.path.exists(dest):
+                os.makedirs(os.path.dirname(dest), exist_ok=True)
+                shutil.copy2(os.path.join(snapshot, segment), dest)
+    return {"snapshot": manifest["name"], "files": [e["file"] for e in manifest["files"]], "moved_aside": aside}
+
+
+# --- 3. NODE SERVICE (one snapshot at a time) ---
+class SnapshotService:
+    """Runs snapshots on a dedicated thread; the endpoint and the schedule share it."""
+
+    def __init__(self):
+        self._executor = ThreadPoolExecutor(max_workers=1, thread_name_prefix="nexus-snapshot")
+        self._task: Optional[asyncio.Future] = None
+        self._schedule: Optional[asyncio.Task] = None
+        self.progress: Dict[str, Any] = {}
+        self.last: Optional[Dict[str, Any]] = None
+        self.last_error: Optional[str] = None
+        self.taken = 0
+
+    @property
+    def running(self) -> bool:
+        return self._task is not None and not self._task.done()
+
+    def status(self) -> Dict[str, Any]:
+        return {
+            "running": self.running,
+            "progress": dict(self.progress) if self.running else None,
+            "taken": self.taken,
+            "last": self.last,
+            "last_error": self.last_error,
+        }
+
+    def start(self, paths: List[str], root: str) -> asyncio.Future:
+        """Starts a snapshot in the background. Raises RuntimeError("SNAPSHOT_IN_PROGRESS")."""
+        if self.running:
+            raise RuntimeError("SNAPSHOT_IN_PROGRESS")
+        self.progress = {}
+        self._task = asyncio.get_running_loop().run_in_executor(self._executor, self._run, list(paths), root)
+        return self._task
+
+    def _run(self, paths: List[str], root: str) -> Dict[str, Any]:
+        try:
+            os.makedirs(root, exist_ok=True)
+            manifest = take_snapshot(paths, root, progress=self._on_progress)
+        except Exception as e:
+            self.last_error = f"{type(e).__name__}: {e}"
+            raise
+        self.last, self.last_error = manifest, None
+        self.taken += 1
+        return manifest
+
+    def _on_progress(self, name: str, done: int, total: int) -> None:
+        self.progress = {"file": name, "pages_done": done, "pages_total": total}
+
+    def schedule(self, paths_fn: Callable[[], List[str]], root: str, interval: Optional[float] = None) -> None:
+        """Snapshots every `interval` seconds until `stop()`; a failed run is recorded and retried next tick."""
+        interval = interval or SNAPSHOT_INTERVAL_S
+        async def loop():
+            while True:
+                await asyncio.sleep(interval)
+                if not self.running:
+                    try:
+                        await self.start(paths_fn(), root)
+                    except Exception:
+                        pass  # Kept in last_error for GET /api/admin/snapshot
+        self._schedule = asyncio.get_running_loop().create_task(loop())
+
+    async def stop(self) -> None:
+        """Cancels the schedule and waits for a snapshot in flight (it holds a read transaction)."""
+        if self._schedule is not None:
+            self._schedule.cancel()
+            try:
+                await self._schedule
+            except asyncio.CancelledError:
+                pass
+            self._schedule = None
+        if self._task is not None:
+            try:
+                await self._task
+            except Exception:
+                pass
+            self._task = None
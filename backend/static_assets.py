@@ -0,0 +1,183 @@
+# Copyright 2026 Coreframe Systems (Nexus Protocol)
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#        http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+
+"""
+🏛️ NEXUS STATIC ASSET MANIFEST (Phase 1.4.x)
+
+The Flutter build (`client/build/web`) is indexed once at startup into an
+in-memory manifest: URL path -> content type, strong ETag, cache policy,
+and the file's encoded variants. Requests are then answered from the
+manifest with no filesystem syscalls (no normpath/isfile/exists per hit):
+
+- `If-None-Match` is compared against the stored ETag and answered with 304.
+- Compressible files get gzip (and brotli, when the optional `brotli`
+  package is installed) variants, negotiated via `Accept-Encoding`.
+  Variants produced at build time (`main.dart.js.br` / `.gz` next to the
+  file) are used as-is; otherwise they are generated at startup.
+- Files up to `NEXUS_STATIC_MEMORY_KB` (index.html, manifest.json,
+  flutter_bootstrap.js, ...) are held in memory; larger identity bodies are
+  streamed from disk, while their compressed variants stay in memory.
+- Fingerprinted file names (`main.3f9a1c2b.js`) are `immutable` for a year;
+  everything else is `no-cache`, i.e. always revalidated, which the ETag
+  makes a body-less 304.
+
+Traversal is impossible by construction: only files found under the build
+directory at startup are in the manifest. A rebuilt client needs a restart.
+"""
+
+import os
+import re
+import gzip
+import hashlib
+import mimetypes
+from dataclasses import dataclass, field
+from typing import Optional, Dict, Any
+
+try:  # Optional: brotli variants are skipped (gzip still served) without it
+    import brotli
+except ImportError:
+    brotli = None
+
+from fastapi import Response
+from fastapi.responses import FileResponse
+
+STATIC_MEMORY_KB = max(0, int(os.getenv("NEXUS_STATIC_MEMORY_KB", "512")))
+BROTLI_QUALITY = 6  # Startup compression only; build-time .br files may use 11
+GZIP_LEVEL = 9
+MIN_COMPRESS_BYTES = 1024
+IMMUTABLE = "public, max-age=31536000, immutable"
+REVALIDATE = "no-cache"
+
+# `name.<8+ hex>.ext` or `name-<8+ hex>.ext`: the content hash is in the URL
+FINGERPRINT = re.compile(r"[.-][0-9a-fA-F]{8,}\.[A-Za-z0-9]+$")
+COMPRESSIBLE = ("text/", "application/javascript", "application/json", "application/manifest+json",
+                "application/wasm", "application/xml", "image/svg+xml", "font/ttf", "font/otf")
+
+mimetypes.add_type("application/wasm", ".wasm")
+mimetypes.add_type("application/javascript", ".mjs")
+mimetypes.add_type("application/manifest+json", ".webmanifest")
+
+
+@dataclass
+class Asset:
+    path: str                       # Absolute path on disk
+    content_type: str
+    etag: str
+    cache_control: str
+    size: int
+    body: Optional[bytes] = None    # Identity body when small enough to hold
+    variants: Dict[str, bytes] = field(default_factory=dict)  # "br" / "gzip" -> encoded body
+
+
+class StaticManifest:
+    def __init__(self):
+        self.root: Optional[str] = None
+        self.assets: Dict[str, Asset] = {}
+        self.index: Optional[Asset] = None
+
+    def __len__(self) -> int:
+        return len(self.assets)
+
+    def load(self, root: str) -> Dict[str, Any]:
+        """Indexes `root` (replacing any previous manifest). Returns counts and sizes for the banner."""
+        root = os.path.realpath(root)
+        assets: Dict[str, Asset] = {}
+        for dirpath, _, filenames in os.walk(root):
+            for name in filenames:
+                full = os.path.join(dirpath, name)
+                rel = os.path.relpath(full, root).replace(os.sep, "/")
+                if name.endswith((".gz", ".br")) and os.path.exists(full[:-3]):
+                    continue  # Precompressed sibling: attached to its original below
+                if os.path.commonpath([os.path.realpath(full), root]) != root:
+                    continue  # Symlink escaping the build directory
+                assets[rel] = _build_asset(full, rel)
+        self.root, self.assets = root, assets
+        self.index = assets.get("index.html")
+        return {
+            "files": len(assets),
+            "bytes": sum(a.size for a in assets.values()),
+            "compressed_bytes": sum(min(map(len, a.variants.values()), default=a.size) for a in assets.values()),
+            "brotli": brotli is not None,
+        }
+
+    def lookup(self, rel: str) -> Optional[Asset]:
+        return self.assets.get(rel)
+
+    def respond(self, asset: Asset, request_headers: Any, cache_control: Optional[str] = None) -> Response:
+        """304 on a matching If-None-Match, else the best encoding the client accepts."""
+        accepted = _accepted_encodings(request_headers.get("accept-encoding", ""))
+        encoding = next((e for e in ("br", "gzip") if e in asset.variants and e in accepted), None)
+        headers = {"ETag": _variant_etag(asset.etag, encoding), "Cache-Control": cache_control or asset.cache_control}
+        if asset.variants:
+            headers["Vary"] = "Accept-Encoding"
+        if _etag_matches(request_headers.get("if-none-match"), asset):
+            return Response(status_code=304, headers=headers)
+
+        if encoding is not None:
+            headers["Content-Encoding"] = encoding
+            return Response(asset.variants[encoding], media_type=asset.content_type, headers=headers)
+        if asset.body is not None:
+            return Response(asset.body, media_type=asset.content_type, headers=headers)
+        return FileResponse(asset.path, media_type=asset.content_type, headers=headers)
+
+
+def _build_asset(full: str, rel: str) -> Asset:
+    with open(full, "rb") as f:
+        data = f.read()
+    content_type = mimetypes.guess_type(rel)[0] or "application/octet-stream"
+    asset = Asset(
+        path=full,
+        content_type=content_type,
+        # Strong validator over the identity bytes; encoded variants append their coding
+        etag='"' + hashlib.sha256(data).hexdigest()[:32] + '"',
+        cache_control=IMMUTABLE if FINGERPRINT.search(rel) else REVALIDATE,
+        size=len(data),
+        body=data if len(data) <= STATIC_MEMORY_KB * 1024 else None,
+    )
+    if len(data) >= MIN_COMPRESS_BYTES and content_type.startswith(COMPRESSIBLE):
+        for encoding, suffix, compress in (
+            ("br", ".br", (lambda d: brotli.compress(d, quality=BROTLI_QUALITY)) if brotli else None),
+            ("gzip", ".gz", lambda d: gzip.compress(d, compresslevel=GZIP_LEVEL, mtime=0)),
+        ):
+            if os.path.exists(full + suffix):
+                with open(full + suffix, "rb") as f:
+                    asset.variants[encoding] = f.read()
+            elif compress is not None:
+                encoded = compress(data)
+                if len(encoded) < len(data) * 0.9:  # Not worth a variant otherwise
+                    asset.variants[encoding] = encoded
+    return asset
+
+def _variant_etag(etag: str, encoding: Optional[str]) -> str:
+    return etag if encoding is None else f'{etag[:-1]}-{encoding}"'
+
+def _etag_matches(header: Optional[str], asset: Asset) -> bool:
+    if not header:
+        return False
+    if header.strip() == "*":
+        return True
+    # Weak comparison, as RFC 9110 prescribes for If-None-Match; any variant's tag revalidates
+    known = {_variant_etag(asset.etag, e) for e in (None, *asset.variants)}
+    return any(tag.strip().removeprefix("W/") in known for tag in header.split(","))
+
+def _accepted_encodings(header: str) -> set:
+    accepted = set()
+    for part in header.lower().split(","):
+        name, _, params = part.strip().partition(";")
+        if params.replace(" ", "") in ("q=0", "q=0.0", "q=0.00", "q=0.000"):
+            continue
+        accepted.add(name.strip())
+    if "*" in accepted:
+        accepted |= {"br", "gzip"}
+    return accepted
@@ -0,0 +1,183 @@
+import sys
+import os
+import hmac
+import time
+import asyncio
+import hashlib
+import urllib.parse
+
+# 1. Path alignment: Ensures pytest sees 'backend' and 'nexus' folders
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), '../..')))
+
+from nexus.adapters import ton_adapter
+from nexus.adapters.ton_adapter import TONAdapter
+
+BOT_TOKEN = "123456:TEST-TOKEN"
+
+def sign_init_data(user_id, auth_date, token=BOT_TOKEN):
+    """Builds initData exactly as Telegram signs it."""
+    params = {"auth_date": str(auth_date), "query_id": "AAE", "user": f'{{"id":{user_id}}}'}
+    check = "\n".join(f"{k}={v}" for k, v in sorted(params.items()))
+    secret = hmac.new(b"WebAppData", token.encode(), hashlib.sha256).digest()
+    params["hash"] = hmac.new(secret, check.encode(), hashlib.sha256).hexdigest()
+    return urllib.parse.urlencode(params)
+
+# --- TON ADAPTER ---
+
+def test_ton_adapter_caches_verified_sessions():
+    adapter = TONAdapter(BOT_TOKEN)
+    init_data = sign_init_data(77, int(time.time()))
+
+    first = asyncio.run(adapter.verify_identity(init_data))
+    first["user_id"] = "tampered"  # Callers get copies, never the cached entry
+    second = asyncio.run(adapter.verify_identity(init_data))
+
+    assert second == {"verified": True, "user_id": "77", "adapter": "ton"}
+    assert adapter.stats()["hits"] == 1 and adapter.stats()["hit_rate"] == 0.5
+
+def test_ton_adapter_never_caches_failures():
+    adapter = TONAdapter(BOT_TOKEN)
+    forged = sign_init_data(77, int(time.time()), token="999:OTHER")
+    for _ in range(3):
+        assert asyncio.run(adapter.verify_identity(forged))["verified"] is False
+    assert adapter.stats()["size"] == 0 and adapter.stats()["hits"] == 0
+
+def test_ton_adapter_cache_expires_with_replay_window(monkeypatch):
+    adapter = TONAdapter(BOT_TOKEN, cache_size=2)
+    now = int(time.time())
+    init_data = sign_init_data(5, now - 86000)  # 400s of validity left
+    assert asyncio.run(adapter.verify_identity(init_data))["verified"]
+
+    monkeypatch.setattr(ton_adapter.time, "time", lambda: now + 401)
+    result = asyncio.run(adapter.verify_identity(init_data))
+    assert result["verified"] is False and result["error"] == "STALE_DATA"
+    assert adapter.stats()["expirations"] == 1
+
+    monkeypatch.setattr(ton_adapter.time, "time", lambda: now)
+    for uid in (1, 2, 3):
+        asyncio.run(adapter.verify_identity(sign_init_data(uid, now)))
+    assert adapter.stats()["size"] == 2 and adapter.stats()["evictions"] == 1
+
+def test_ton_adapter_cache_evicts_least_recently_used():
+    adapter = TONAdapter(BOT_TOKEN, cache_size=2)
+    now = int(time.time())
+    first, second, third = (sign_init_data(uid, now) for uid in (1, 2, 3))
+    for init_data in (first, second, first, third):  # The hit on `first` makes `second` the oldest
+        asyncio.run(adapter.verify_identity(init_data))
+
+    asyncio.run(adapter.verify_identity(first))
+    assert adapter.stats()["hits"] == 2 and adapter.stats()["evictions"] == 1
+    asyncio.run(adapter.verify_identity(second))
+    assert adapter.stats()["hits"] == 2  # `second` was the one evicted
+
+# --- SENTRY SWITCHBOARD ---
+
+class SlowAdapter:
+    ADAPTER_NAME = "slow"
+
+    def __init__(self, delay=0.05, fail=False):
+        self.delay, self.fail, self.calls = delay, fail, 0
+
+    async def verify_identity(self, payload):
+        self.calls += 1
+        await asyncio.sleep(self.delay)
+        if self.fail:
+            raise ConnectionError("UPSTREAM_DOWN")
+        return {"verified": True, "user_id": payload, "adapter": self.ADAPTER_NAME}
+
+def make_sentry(adapter):
+    from backend.sentry import NexusSentry
+    s = NexusSentry()
+    s.adapter = adapter
+    return s
+
+def test_sentry_coalesces_identical_inflight_payloads():
+    adapter = SlowAdapter()
+    sentry = make_sentry(adapter)
+
+    async def burst():
+        return await asyncio.gather(*(sentry.verify_request(p) for p in ["1"] * 50 + ["2"] * 50))
+
+    results = asyncio.run(burst())
+    assert adapter.calls == 2
+    assert [r["user_id"] for r in results] == ["1"] * 50 + ["2"] * 50
+    stats = sentry.stats()
+    assert stats["coalesced"] == 98 and stats["adapters"]["slow"]["latency_s"]["count"] == 2
+
+def test_sentry_cancelled_leader_hands_over_to_followers():
+    adapter = SlowAdapter(delay=0.05)
+    sentry = make_sentry(adapter)
+
+    async def scenario():
+        leader = asyncio.create_task(sentry.verify_request("7"))
+        await asyncio.sleep(0.01)  # Leader is inside the adapter call
+        followers = [asyncio.create_task(sentry.verify_request("7")) for _ in range(3)]
+        await asyncio.sleep(0.01)
+        leader.cancel()  # Its client disconnected
+        return await asyncio.gather(*followers)
+
+    results = asyncio.run(scenario())
+    assert [r["user_id"] for r in results] == ["7"] * 3 and all(r["verified"] for r in results)
+    assert adapter.calls == 2  # One follower led the retry; the others joined it
+    assert sentry.stats()["inflight"] == 0
+
+def test_sentry_admission_queue_fails_fast(monkeypatch):
+    import backend.sentry as sentry_module
+    monkeypatch.setattr(sentry_module, "MAX_INFLIGHT", 2)
+    monkeypatch.setattr(sentry_module, "QUEUE_TIMEOUT_S", 0.01)
+    sentry = make_sentry(SlowAdapter(delay=0.1))
+
+    async def burst():
+        return await asyncio.gather(*(sentry.verify_request(str(i)) for i in range(6)))
+
+    results = asyncio.run(burst())
+    assert sum(r["verified"] for r in results) == 2
+    assert {r.get("error") for r in results if not r["verified"]} == {"SENTRY_OVERLOADED"}
+    assert sentry.stats()["adapters"]["slow"]["breaker"] == "closed"
+
+def test_sentry_circuit_breaker_opens_and_recovers(monkeypatch):
+    import backend.sentry as sentry_module
+    monkeypatch.setattr(sentry_module, "BREAKER_THRESHOLD", 3)
+    monkeypatch.setattr(sentry_module, "BREAKER_COOLDOWN_S", 0.05)
+    adapter = SlowAdapter(delay=0, fail=True)
+    sentry = make_sentry(adapter)
+
+    async def scenario():
+        for i in range(3):
+            await sentry.verify_request(f"a{i}")
+        rejected = await sentry.verify_request("b", backup_id="42")
+        await asyncio.sleep(0.06)
+        adapter.fail = False
+        recovered = await sentry.verify_request("c")
+        return rejected, recovered
+
+    rejected, recovered = asyncio.run(scenario())
+    assert adapter.calls == 4  # The call while open never reached the adapter
+    assert rejected == {"verified": True, "user_id": "42", "method": "emergency"}
+    assert recovered["verified"] and sentry.stats()["adapters"]["slow"]["breaker"] == "closed"
+    assert sentry.stats()["adapters"]["slow"]["breaker_trips"] == 1
+
+def test_sentry_cancelled_trial_releases_half_open_breaker(monkeypatch):
+    import backend.sentry as sentry_module
+    monkeypatch.setattr(sentry_module, "BREAKER_THRESHOLD", 1)
+    monkeypatch.setattr(sentry_module, "BREAKER_COOLDOWN_S", 0.01)
+    adapter = SlowAdapter(delay=0, fail=True)
+    sentry = make_sentry(adapter)
+
+    async def scenario():
+        await sentry.verify_request("a")  # Opens the breaker
+        await asyncio.sleep(0.02)
+        adapter.fail, adapter.delay = False, 1.0
+        trial = asyncio.ensure_future(sentry.verify_request("b"))
+        await asyncio.sleep(0.01)
+        trial.cancel()  # Client disconnect while the half-open probe is out
+        try:
+            await trial
+        except asyncio.CancelledError:
+            pass
+        adapter.delay = 0
+        return await sentry.verify_request("c")
+
+    result = asyncio.run(scenario())
+    assert result["verified"] and result["user_id"] == "c"
+    assert sentry.stats()["adapters"]["slow"]["breaker"] == "closed"
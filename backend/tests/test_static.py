@@ -0,0 +1,76 @@
+import sys
+import os
+import gzip
+import pytest
+from fastapi.testclient import TestClient
+
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), '../..')))
+
+import backend.main as brain
+from backend.static_assets import StaticManifest, IMMUTABLE, REVALIDATE
+
+INDEX = b"<!DOCTYPE html><html><body>" + b"nexus " * 400 + b"</body></html>"
+BUNDLE = b"console.log('sovereign');\n" * 2000
+
+# --- GATEWAY FIXTURE: a fake Flutter build ---
+@pytest.fixture
+def web(tmp_path, monkeypatch):
+    build = tmp_path / "web"
+    (build / "assets").mkdir(parents=True)
+    (build / "index.html").write_bytes(INDEX)
+    (build / "main.dart.js").write_bytes(BUNDLE)
+    (build / "main.0123abcd89.js").write_bytes(BUNDLE)
+    (build / "manifest.json").write_bytes(b'{"name": "Nexus"}')
+    (build / "assets" / "logo.png").write_bytes(b"\x89PNG" + bytes(4000))
+    monkeypatch.setattr(brain, "DB_PATH", str(tmp_path / "vault.db"))
+    monkeypatch.setattr(brain, "CLIENT_BUILD_DIR", str(build))
+    monkeypatch.setattr(brain, "static_assets", StaticManifest())
+    with TestClient(brain.app) as c:
+        yield c, build
+
+def test_gateway_serves_precompressed_assets_with_validators(web):
+    client, build = web
+    response = client.get("/main.dart.js", headers={"Accept-Encoding": "gzip"})
+    assert response.status_code == 200
+    assert response.headers["content-encoding"] == "gzip"
+    assert response.headers["vary"] == "Accept-Encoding"
+    assert response.headers["cache-control"] == REVALIDATE
+    assert int(response.headers["content-length"]) < len(BUNDLE) // 10
+    assert response.content == BUNDLE  # Decoded by the client
+
+    identity = client.get("/static/main.dart.js", headers={"Accept-Encoding": "identity"})
+    assert "content-encoding" not in identity.headers
+    assert identity.content == BUNDLE and identity.headers["etag"] != response.headers["etag"]
+
+    hashed = client.get("/main.0123abcd89.js")
+    assert hashed.headers["cache-control"] == IMMUTABLE
+    assert client.get("/assets/logo.png").headers["content-type"] == "image/png"
+
+def test_gateway_revalidates_from_memory(web):
+    client, build = web
+    first = client.get("/manifest.json")
+    etag = first.headers["etag"]
+    # The manifest was indexed at startup: a 304 needs no file on disk at all
+    os.remove(build / "manifest.json")
+    second = client.get("/manifest.json", headers={"If-None-Match": f'W/"nope", {etag}'})
+    assert second.status_code == 304 and second.content == b""
+    assert second.headers["etag"] == etag
+    assert client.get("/manifest.json").json() == {"name": "Nexus"}
+
+def test_gateway_spa_fallback_and_jail(web):
+    client, build = web
+    (build.parent / "secret.txt").write_text("vault keys")
+    deep = client.get("/wallet/42", headers={"Accept-Encoding": "gzip"})
+    assert deep.status_code == 200 and deep.content == INDEX
+    assert client.get("/").content == INDEX
+    assert client.get("/..%2Fsecret.txt").content == INDEX
+    assert client.get("/static/missing.js").status_code == 404
+    assert client.get("/api/unknown").status_code == 404
+
+def test_precompressed_siblings_are_used(tmp_path):
+    (tmp_path / "app.js").write_bytes(BUNDLE)
+    (tmp_path / "app.js.gz").write_bytes(gzip.compress(BUNDLE, compresslevel=1))
+    manifest = StaticManifest()
+    stats = manifest.load(str(tmp_path))
+    assert stats["files"] == 1  # The .gz sibling is a variant, not a file
+    assert gzip.decompress(manifest.lookup("app.js").variants["gzip"]) == BUNDLE
@@ -0,0 +1,1171 @@
+import sys
+import os
+import time
+import asyncio
+import sqlite3
+import threading
+import pytest
+from datetime import datetime
+from fastapi.testclient import TestClient
+
+# 1. Path alignment: Ensures pytest sees 'backend' and 'nexus' folders
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), '../..')))
+
+import backend.main as brain
+from backend.cache import LRUCache
+from backend.merkle import (
+    MerkleFrontier, compute_leaf_hash, generate_merkle_root, ensure_merkle, verify_frontier,
+    read_proof, read_root, verify_proof
+)
+from backend.vault import VaultPool, VaultWriter, VaultUnavailable, ensure_balances, check_balances, rebuild_balances
+from backend.units import ensure_scale, migrate_timestamps, migrate_to_minor_units, split_minor, to_minor
+from backend.timestamps import ensure_ts_unit
+from backend.segments import iter_ledger, read_history, seal_segments, verify_segments
+from backend.shards import ShardedVault, detect_layouts, init_vault, reshard, shard_of, shard_paths
+from backend import snapshots
+from backend.workers import RemoteWriter, WorkerCoordinator
+from backend.rollups import NODE_SCOPE, check_rollups, ensure_rollups, rebuild_rollups
+from scripts import vault_admin
+
+# 2. ISOLATED VAULT: Every test boots the Brain against a throwaway database
+@pytest.fixture
+def client(tmp_path, monkeypatch):
+    monkeypatch.setattr(brain, "DB_PATH", str(tmp_path / "vault.db"))
+    with TestClient(brain.app) as c:
+        yield c
+
+def tma(user_id):
+    return {"X-Nexus-TMA": f"user=%7B%22id%22%3A{user_id}%7D"}
+
+def admin(monkeypatch):
+    """Operator headers for the admin-guarded routes (configures NEXUS_ADMIN_TOKEN for the test)."""
+    monkeypatch.setattr(brain, "ADMIN_TOKEN", "operator")
+    return {"X-Nexus-Admin-Token": "operator"}
+
+# --- GROUP COMMIT WRITER ---
+
+def test_execute_split_contract(client):
+    """The response contract survives the move to the group-commit writer."""
+    response = client.post("/api/execute_split", json={"amount": 100}, headers=tma(42))
+
+    assert response.status_code == 200
+    data = response.json()
+    assert data["status"] == "committed"
+    assert data["resolved_id"] == "42"
+    assert data["split"] == {"creator": 60.0, "pool": 30.0, "fee": 10.0}
+    assert data["timestamp"]
+
+    summary = client.get("/api/vault_summary/42").json()
+    assert summary == {"creator_total": 60.0, "pool_total": 30.0}
+
+def test_writer_batches_concurrent_submissions(tmp_path):
+    """Concurrent splits share one transaction and each caller gets its own row id."""
+    db = str(tmp_path / "batch.db")
+    conn = sqlite3.connect(db)
+    conn.execute("""
+        CREATE TABLE transactions (
+            id INTEGER PRIMARY KEY AUTOINCREMENT, user_id TEXT, amount REAL, creator_share REAL,
+            user_pool_share REAL, network_fee REAL, timestamp TEXT
+        )""")
+    ensure_balances(conn)
+    ensure_rollups(conn)
+    ensure_merkle(conn)
+    conn.commit()
+    conn.close()
+
+    async def scenario():
+        pool = VaultPool(size=1)
+        pool.open(db)
+        writer = VaultWriter(batch_size=8, linger_ms=5)
+        await writer.start(pool)
+        commits = []
+        original = writer._commit_batch
+        writer._commit_batch = lambda rows: commits.append(len(rows)) or original(rows)
+        rows = [(str(i), 10.0, 6.0, 3.0, 1.0, "2026-01-01 00:00:00") for i in range(20)]
+        ids = await asyncio.gather(*(writer.submit(r) for r in rows))
+        await writer.stop()
+        pool.close()
+        return ids, commits
+
+    ids, commits = asyncio.run(scenario())
+    assert sorted(ids) == list(range(1, 21))
+    assert sum(commits) == 20
+    assert max(commits) <= 8 and len(commits) < 20
+
+    conn = sqlite3.connect(db)
+    assert conn.execute("SELECT COUNT(*) FROM transactions").fetchone()[0] == 20
+    conn.close()
+
+def test_writer_isolates_a_failing_entry_from_its_batch(tmp_path):
+    """A row SQLite cannot bind fails only its own submitter; co-batched rows still commit."""
+    db = str(tmp_path / "isolate.db")
+    conn = sqlite3.connect(db)
+    init_vault(conn, 0, "text")
+    conn.close()
+
+    async def scenario():
+        pool = VaultPool(size=1)
+        pool.open(db)
+        writer = VaultWriter(batch_size=8, linger_ms=20)
+        await writer.start(pool)
+        good = ("1", 10.0, 6.0, 3.0, 1.0, "2026-01-01 00:00:00")
+        bad = ("2", 1 << 70, 6.0, 3.0, 1.0, "2026-01-01 00:00:00")  # OverflowError on bind
+        results = await asyncio.gather(writer.submit(good), writer.submit(bad), writer.submit(good),
+                                       return_exceptions=True)
+        await writer.stop()
+        pool.close()
+        return results
+
+    first, failed, last = asyncio.run(scenario())
+    assert isinstance(failed, OverflowError)
+    assert sorted([first, last]) == [1, 2]
+    conn = sqlite3.connect(db)
+    assert conn.execute("SELECT COUNT(*) FROM transactions").fetchone()[0] == 2
+    assert check_balances(conn) == [] and verify_frontier(conn)[0]
+    conn.close()
+
+def test_writer_offline_rejects_split():
+    """Without a running writer the node fails closed instead of hanging."""
+    response = TestClient(brain.app).post("/api/execute_split", json={"amount": 5})
+    assert response.status_code == 503
+
+# --- CONNECTION POOL ---
+
+def test_pool_readers_are_query_only(tmp_path):
+    """Pooled readers carry the hardening PRAGMAs and refuse writes."""
+    pool = VaultPool(size=2)
+    pool.open(str(tmp_path / "pool.db"))
+    try:
+        with pool.reader() as conn:
+            assert conn.execute("PRAGMA query_only").fetchone()[0] == 1
+            assert conn.execute("PRAGMA temp_store").fetchone()[0] == 2
+            with pytest.raises(sqlite3.OperationalError):
+                conn.execute("CREATE TABLE forbidden (x)")
+        assert pool.writer.execute("PRAGMA query_only").fetchone()[0] == 0
+    finally:
+        pool.close()
+
+    with pytest.raises(VaultUnavailable):
+        with pool.reader():
+            pass
+
+def test_reads_use_query_only_readers_while_a_write_batch_is_open(tmp_path, monkeypatch):
+    """A history page is answered by a pooled reader (snapshot before the batch) while the writer holds its transaction."""
+    import httpx
+    import backend.vault as vault_module
+    monkeypatch.setattr(brain, "DB_PATH", str(tmp_path / "vault.db"))
+    entered, release, seen = threading.Event(), threading.Event(), []
+
+    save_frontier = vault_module.save_frontier
+    def held_open(conn, merkle):
+        save_frontier(conn, merkle)
+        entered.set()
+        release.wait(5)  # The batch's transaction is still open here
+    read_history = brain.read_history
+    def spy(conn, *args):
+        seen.append((conn.execute("PRAGMA query_only").fetchone()[0], threading.current_thread().name))
+        return read_history(conn, *args)
+
+    async def scenario():
+        async with brain.app.router.lifespan_context(brain.app):
+            transport = httpx.ASGITransport(app=brain.app)
+            async with httpx.AsyncClient(transport=transport, base_url="http://test") as c:
+                await c.post("/api/execute_split", json={"amount": 1}, headers=tma(7))
+                monkeypatch.setattr(vault_module, "save_frontier", held_open)
+                monkeypatch.setattr(brain, "read_history", spy)
+                write = asyncio.create_task(c.post("/api/execute_split", json={"amount": 2}, headers=tma(7)))
+                assert await asyncio.get_running_loop().run_in_executor(None, entered.wait, 5)
+                page = await asyncio.wait_for(c.get("/api/transactions", headers=tma(7)), 2)
+                release.set()
+                assert (await write).status_code == 200
+                return page.json(), (await c.get("/api/transactions", headers=tma(7))).json()
+
+    during, after = asyncio.run(scenario())
+    assert [item["amount"] for item in during["items"]] == [1.0]  # Uncommitted row invisible
+    assert [item["amount"] for item in after["items"]] == [2.0, 1.0]
+    assert seen and all(q == 1 and name.startswith("nexus-vault-reader") for q, name in seen)
+
+def test_node_stats_exposes_pool_counters(client, monkeypatch):
+    assert client.get("/api/node_stats").status_code == 403  # Operator-only
+    client.get("/api/vault_summary/7")
+    client.get("/api/transactions")
+    pool = client.get("/api/node_stats", headers=admin(monkeypatch)).json()["pool"]
+    assert pool["checkouts"] >= 2
+    assert pool["idle"] == pool["readers"]
+
+# --- METRICS & DIAGNOSTICS ---
+
+def test_metrics_endpoint_prometheus_text(client, monkeypatch):
+    client.post("/api/execute_split", json={"amount": 10}, headers=tma(5))
+    client.get("/api/transactions", headers=tma(5))
+    client.get("/api/proof/1")
+    assert client.get("/api/metrics").status_code == 403
+    response = client.get("/api/metrics", headers={"Authorization": "Bearer " + admin(monkeypatch)["X-Nexus-Admin-Token"]})
+    assert response.status_code == 200
+    assert response.headers["content-type"].startswith("text/plain; version=0.0.4")
+    text = response.text
+    assert 'nexus_http_request_duration_seconds_count{method="GET",route="/api/proof/{tx_id}"}' in text
+    assert 'nexus_http_request_duration_seconds_bucket{method="POST",route="/api/execute_split",le="+Inf"}' in text
+    for op in ("connect", "checkout", "query", "commit"):
+        assert f'nexus_db_operation_duration_seconds_count{{op="{op}"}}' in text
+    assert 'nexus_merkle_hash_duration_seconds_count{stage="page"}' in text
+    assert 'nexus_page_rows_bucket{le="1"}' in text
+    assert 'nexus_vault_wal_bytes{shard="0"}' in text
+    assert "nexus_http_requests_in_flight 1" in text  # The scrape itself
+
+def test_thread_histogram_merges_per_thread_shards():
+    from concurrent.futures import ThreadPoolExecutor
+    from backend.metrics import ThreadHistogram
+
+    hist = ThreadHistogram(bounds=(1, 10))
+    with ThreadPoolExecutor(max_workers=4) as pool:
+        list(pool.map(lambda v: [hist.observe(v) for _ in range(1000)], [0.5, 5, 50, 5]))
+    merged = hist.merged()
+    assert merged.counts == [1000, 2000, 1000]
+    assert merged.count == 4000 and merged.sum == 60500
+
+def test_slow_query_log_records_plan(tmp_path, monkeypatch):
+    import json
+    from backend import diagnostics
+    db = str(tmp_path / "vault.db")
+    sqlite3.connect(db).execute("CREATE TABLE t (a INTEGER PRIMARY KEY, b TEXT)").connection.close()
+    monkeypatch.setattr(diagnostics, "slow_log", diagnostics.SlowQueryLog(threshold_ms=5, directory=str(tmp_path)))
+    pool = VaultPool(size=1)
+    pool.open(db)
+    try:
+        slow = "WITH RECURSIVE n(x) AS (SELECT 1 UNION ALL SELECT x + 1 FROM n WHERE x < 300000) SELECT SUM(x) FROM n"
+        with pool.reader() as conn:
+            conn.execute("SELECT * FROM t WHERE a = 1").fetchall()
+            conn.execute(slow).fetchone()
+    finally:
+        pool.close()
+
+    entries = [json.loads(line) for line in open(tmp_path / "slow_queries.jsonl")]
+    assert [e["sql"] for e in entries] == [slow]
+    assert entries[0]["ms"] >= 5 and entries[0]["plan"]
+    assert diagnostics.slow_log.logged == 1
+
+def test_diagnostics_profiler_and_tracemalloc(tmp_path, monkeypatch):
+    from backend import diagnostics
+
+    monkeypatch.setattr(brain, "DB_PATH", str(tmp_path / "vault.db"))
+    profiler = diagnostics.RequestProfiler(brain.app, sample=1.0, flush_every=2, directory=str(tmp_path))
+    monkeypatch.setattr(diagnostics, "profiler_registry", [profiler])
+    with TestClient(profiler) as client:
+        assert client.get("/api/diagnostics").status_code == 403  # Operator-only
+        monkeypatch.setattr(brain, "ADMIN_TOKEN", "operator")
+        client.headers["X-Nexus-Admin-Token"] = "operator"
+        assert client.get("/api/diagnostics").status_code == 404  # Off by default
+        monkeypatch.setattr(diagnostics, "DIAGNOSTICS", True)
+        assert client.post("/api/diagnostics/tracemalloc/start", headers={"X-Nexus-Admin-Token": "x"}).status_code == 403
+        monkeypatch.setattr(diagnostics, "DIAG_DIR", str(tmp_path))
+
+        assert client.get("/api/transactions", headers=tma(3)).status_code == 200
+        assert profiler.samples == 4  # Every request through the middleware, guarded ones included
+        assert "get_transactions" in (tmp_path / "profile.txt").read_text()
+
+        assert client.post("/api/diagnostics/tracemalloc/snapshot").status_code == 400
+        assert client.post("/api/diagnostics/tracemalloc/start").json() == {"tracing": True}
+        try:
+            first = client.post("/api/diagnostics/tracemalloc/snapshot?top=5").json()
+            client.get("/api/transactions", headers=tma(3))
+            second = client.post("/api/diagnostics/tracemalloc/snapshot?top=5").json()
+        finally:
+            client.post("/api/diagnostics/tracemalloc/stop")
+        assert len(first["top"]) == 5 and first["growth"] is None
+        assert second["growth"] is not None and os.path.exists(second["dump"])
+        assert client.get("/api/diagnostics").json()["slow_queries"] == 0
+
+# --- MATERIALIZED BALANCES ---
+
+def test_balances_track_ledger(client):
+    """vault_summary is served from `balances`, which never drifts from the ledger."""
+    for amount in (100, 19.99, 0.07):
+        client.post("/api/execute_split", json={"amount": amount}, headers=tma(8))
+    client.post("/api/execute_split", json={"amount": 50}, headers=tma(9))
+
+    assert client.get("/api/vault_summary/8").json() == {"creator_total": 72.03, "pool_total": 36.02}
+    assert client.get("/api/vault_summary/404").json() == {"creator_total": 0.0, "pool_total": 0.0}
+
+    conn = sqlite3.connect(brain.DB_PATH)
+    assert check_balances(conn) == []
+    conn.execute("UPDATE balances SET creator_total = 0 WHERE user_id = '9'")
+    assert [d["user_id"] for d in check_balances(conn)] == ["9"]
+    assert rebuild_balances(conn) == 2
+    assert check_balances(conn) == []
+    conn.close()
+
+# --- SUMMARY CACHE ---
+
+def test_summary_cache_is_invalidated_by_commits(client, monkeypatch):
+    headers, operator = tma(77), admin(monkeypatch)
+    before = client.get("/api/node_stats", headers=operator).json()["summary_cache"]
+    client.post("/api/execute_split", json={"amount": 10}, headers=headers)
+    assert client.get("/api/vault_summary/77").json()["creator_total"] == 6.0
+    assert client.get("/api/vault_summary/77").json()["creator_total"] == 6.0
+
+    client.post("/api/execute_split", json={"amount": 10}, headers=headers)
+    assert client.get("/api/vault_summary/77").json()["creator_total"] == 12.0
+
+    stats = client.get("/api/node_stats", headers=operator).json()["summary_cache"]
+    assert stats["hits"] - before["hits"] == 1
+    assert stats["misses"] - before["misses"] == 2
+    assert stats["invalidations"] > before["invalidations"]
+
+def test_lru_cache_eviction_ttl_and_stale_fill(monkeypatch):
+    cache = LRUCache(maxsize=2, ttl=0)
+    cache.put("a", 1); cache.put("b", 2); cache.get("a"); cache.put("c", 3)
+    assert cache.get("b") is None and cache.get("a") == 1
+    assert cache.stats()["evictions"] == 1
+
+    epoch = cache.epoch
+    cache.invalidate(["a"])
+    assert cache.put("a", "stale", epoch) is False
+
+    clock = [100.0]
+    monkeypatch.setattr("backend.cache.time.monotonic", lambda: clock[0])
+    ttl_cache = LRUCache(maxsize=4, ttl=5)
+    ttl_cache.put("k", "v")
+    clock[0] += 6
+    assert ttl_cache.get("k") is None and ttl_cache.stats()["expirations"] == 1
+
+# --- LEDGER MERKLE ACCUMULATOR ---
+
+def test_frontier_root_matches_full_reduction():
+    """The O(log N) frontier fold reproduces the duplicate-last-node root for every size."""
+    leaves = [compute_leaf_hash({"amount": i, "creator_share": 0, "user_pool_share": 0,
+                                 "network_fee": 0, "timestamp": "t"}) for i in range(40)]
+    acc = MerkleFrontier()
+    for n, leaf in enumerate(leaves, start=1):
+        acc.append(leaf)
+        assert acc.root() == generate_merkle_root(leaves[:n])
+        assert len(acc.frontier) == bin(n).count("1")
+
+def test_ledger_root_tracks_commits(client):
+    for i, amount in enumerate((100, 12.5, 3, 0.01, 7.77)):
+        client.post("/api/execute_split", json={"amount": amount}, headers=tma(i + 1))
+
+    state = client.get("/api/ledger_root").json()
+    conn = sqlite3.connect(brain.DB_PATH)
+    conn.row_factory = sqlite3.Row
+    rows = [dict(r) for r in conn.execute("SELECT * FROM transactions ORDER BY id")]
+    assert state["tree_size"] == 5 and state["last_tx_id"] == rows[-1]["id"]
+    assert state["root"] == generate_merkle_root([compute_leaf_hash(r) for r in rows])
+
+    match, rebuilt, _ = verify_frontier(conn)
+    assert match and rebuilt.root() == state["root"]
+    conn.close()
+
+def test_incremental_root_matches_legacy_full_rebuild(client):
+    """read_root equals the original anchor's loop (per-row hash, duplicate-last-node) at odd and even sizes."""
+    import hashlib
+
+    def legacy_root(rows):
+        nodes = [hashlib.sha256("|".join(map(str, row)).encode()).hexdigest() for row in rows]
+        while len(nodes) > 1:
+            if len(nodes) % 2 != 0:
+                nodes.append(nodes[-1])
+            nodes = [hashlib.sha256((nodes[i] + nodes[i + 1]).encode()).hexdigest() for i in range(0, len(nodes), 2)]
+        return nodes[0]
+
+    for n, amount in enumerate((100, 12.5, 3, 0.01, 7.77, 42, 9.99), start=1):
+        client.post("/api/execute_split", json={"amount": amount}, headers=tma(n % 3 + 1))
+        if n < 5:
+            continue
+        conn = sqlite3.connect(brain.DB_PATH)
+        rows = conn.execute(
+            "SELECT amount, creator_share, user_pool_share, network_fee, timestamp FROM transactions ORDER BY id"
+        ).fetchall()
+        assert read_root(conn)["tree_size"] == n  # 5 and 7 pad the last node, 6 does not
+        assert read_root(conn)["root"] == legacy_root(rows)
+        conn.close()
+
+# --- INCLUSION PROOFS ---
+
+def test_proofs_verify_for_every_leaf_and_size(tmp_path):
+    """Audit paths from stored nodes fold to the global root, including padded tails."""
+    conn = sqlite3.connect(str(tmp_path / "proof.db"))
+    conn.execute("""
+        CREATE TABLE transactions (
+            id INTEGER PRIMARY KEY AUTOINCREMENT, user_id TEXT, amount REAL, creator_share REAL,
+            user_pool_share REAL, network_fee REAL, timestamp TEXT
+        )""")
+    ensure_merkle(conn)
+    conn.commit()
+    for n in range(1, 14):
+        conn.execute("INSERT INTO transactions VALUES (NULL, '1', ?, 0.6, 0.3, 0.1, 't')", (float(n),))
+        conn.execute("DELETE FROM merkle_state")
+        conn.execute("DROP TABLE merkle_nodes")
+        ensure_merkle(conn)
+        conn.commit()
+        for tx_id in range(1, n + 1):
+            proof = read_proof(conn, tx_id)
+            assert proof["tree_size"] == n
+            assert verify_proof(proof["leaf_hash"], proof["path"], proof["root"])
+    assert read_proof(conn, 999) is None
+    conn.close()
+
+def test_proof_endpoint(client):
+    for amount in (1, 2, 3):
+        client.post("/api/execute_split", json={"amount": amount}, headers=tma(5))
+    page = client.get("/api/transactions", headers=tma(5)).json()["items"]
+    target = page[0]
+
+    proof = client.get(f"/api/proof/{target['id']}").json()
+    assert proof["leaf_hash"] == compute_leaf_hash(target)
+    assert proof["root"] == client.get("/api/ledger_root").json()["root"]
+    assert verify_proof(proof["leaf_hash"], proof["path"], proof["root"])
+    assert client.get("/api/proof/424242").status_code == 404
+
+# --- RESEARCH ANCHOR ---
+
+def test_streaming_anchor_matches_materialized(client):
+    """Chunked O(log N) anchoring reproduces the reference root, for full and ranged selections."""
+    sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), '../../research')))
+    import merkle_anchor
+
+    for amount in range(1, 12):
+        client.post("/api/execute_split", json={"amount": amount}, headers=tma(3))
+
+    full = merkle_anchor.generate_merkle_root(brain.DB_PATH)
+    streamed = merkle_anchor.stream_merkle_root(brain.DB_PATH, chunk_size=4)
+    assert streamed == full == (client.get("/api/ledger_root").json()["root"], 11)  # The original (root, count)
+    assert merkle_anchor.coverage_gaps(brain.DB_PATH) == (0, [])  # Single file, nothing sealed
+    root, count, seconds = merkle_anchor.generate_merkle_root(brain.DB_PATH, timed=True)
+    assert (root, count) == full and seconds >= 0
+
+    ranged = merkle_anchor.generate_merkle_root(brain.DB_PATH, from_id=3, to_id=9)
+    assert merkle_anchor.stream_merkle_root(brain.DB_PATH, 3, 9, chunk_size=2) == ranged
+    assert ranged[1] == 7
+
+def test_parallel_anchor_matches_sequential(tmp_path):
+    """Power-of-two shards, lifted tail and combined roots reproduce the sequential root."""
+    sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), '../../research')))
+    import merkle_anchor
+
+    db = str(tmp_path / "anchor.db")
+    conn = sqlite3.connect(db)
+    conn.execute("""
+        CREATE TABLE transactions (
+            id INTEGER PRIMARY KEY AUTOINCREMENT, user_id TEXT, amount REAL, creator_share REAL,
+            user_pool_share REAL, network_fee REAL, timestamp TEXT
+        )""")
+    for n in range(1, 38):
+        conn.execute("INSERT INTO transactions VALUES (NULL, '1', ?, 0.6, 0.3, 0.1, 't')", (float(n),))
+    conn.execute("DELETE FROM transactions WHERE id IN (4, 20)")  # Id gaps must not shift shards
+    conn.commit()
+    conn.close()
+
+    expected = merkle_anchor.generate_merkle_root(db)
+    for workers in (1, 2, 3):
+        assert merkle_anchor.parallel_merkle_root(db, workers=workers, chunk_size=3) == expected
+    ranged = merkle_anchor.generate_merkle_root(db, from_id=2, to_id=30)
+    assert merkle_anchor.parallel_merkle_root(db, 2, 30, workers=2, timed=True)[:2] == ranged
+
+# --- BATCH SPLITS ---
+
+def test_batch_split_per_item_results(client):
+    """Valid items commit in one transaction; invalid ones are rejected in place."""
+    items = [{"amount": 100}, {"amount": -5}, {"amount": "abc"}, {"amount": 10.0, "nonce": 7}]
+    data = client.post("/api/execute_split/batch", json={"items": items}, headers=tma(7)).json()
+
+    assert data["status"] == "partial"
+    assert (data["committed"], data["rejected"]) == (2, 2)
+    assert [r["status"] for r in data["results"]] == ["committed", "rejected", "rejected", "committed"]
+    assert data["results"][0]["split"] == {"creator": 60.0, "pool": 30.0, "fee": 10.0}
+    assert data["results"][1]["error"] == "INVALID_MAGNITUDE"
+    assert data["results"][2]["error"] == "INVALID_PAYLOAD"
+    assert data["results"][3]["tx_id"] == data["results"][0]["tx_id"] + 1
+
+    assert client.get("/api/vault_summary/7").json() == {"creator_total": 66.0, "pool_total": 33.0}
+    proof = client.get(f"/api/proof/{data['results'][3]['tx_id']}").json()
+    assert proof["root"] == client.get("/api/ledger_root").json()["root"]
+
+def test_batch_split_all_or_nothing(client):
+    body = {"items": [{"amount": 5}, {"amount": 0}], "all_or_nothing": True}
+    data = client.post("/api/execute_split/batch", json=body, headers=tma(8)).json()
+
+    assert data["status"] == "rejected"
+    assert data["committed"] == 0
+    assert [r["error"] for r in data["results"]] == ["BATCH_ABORTED", "INVALID_MAGNITUDE"]
+    assert client.get("/api/ledger_root").json()["tree_size"] == 0
+
+    too_many = {"items": [{"amount": 1}] * (brain.MAX_BATCH_ITEMS + 1)}
+    assert client.post("/api/execute_split/batch", json=too_many).status_code == 400
+
+# --- STREAMING EXPORT ---
+
+def test_streaming_export_root_and_resume(client, monkeypatch):
+    import json
+    import backend.export as export
+
+    monkeypatch.setattr(export, "EXPORT_CHUNK", 4)
+    items = [{"amount": float(i + 1)} for i in range(10)]
+    client.post("/api/execute_split/batch", json={"items": items}, headers=tma(21))
+    client.post("/api/execute_split", json={"amount": 5}, headers=tma(22))
+
+    lines = [json.loads(line) for line in client.get("/api/export", headers=tma(21)).text.splitlines()]
+    rows = [line for line in lines if "id" in line]
+    checkpoints = [line["_checkpoint"] for line in lines if "_checkpoint" in line]
+    end = lines[-1]["_end"]
+    assert len(rows) == 10 and len(checkpoints) == 3 and {r["user_id"] for r in rows} == {"21"}
+    page = client.get("/api/transactions?limit=10", headers=tma(21)).json()
+    assert [r["id"] for r in rows] == [r["id"] for r in page["items"]]
+    assert end["merkle_root"] == page["page_merkle_root"] and end["complete"]
+
+    # Dropped after the first checkpoint: resuming yields the same final root
+    resumed = client.get("/api/export", params={"resume": checkpoints[0]["resume"]}, headers=tma(21))
+    tail = [json.loads(line) for line in resumed.text.splitlines()]
+    assert [r["id"] for r in tail if "id" in r] == [r["id"] for r in rows[4:]]
+    assert tail[-1]["_end"]["merkle_root"] == end["merkle_root"] and tail[-1]["_end"]["emitted"] == 6
+
+    csv_text = client.get("/api/export?format=csv", headers=tma(21)).text.splitlines()
+    assert csv_text[0] == "id,user_id,amount,creator_share,user_pool_share,network_fee,timestamp"
+    assert len([line for line in csv_text[1:] if not line.startswith("#")]) == 10
+    assert json.loads(csv_text[-1][len("# end "):])["merkle_root"] == end["merkle_root"]
+    assert client.get("/api/export?resume=garbage", headers=tma(21)).status_code == 400
+
+# --- MINOR-UNIT STORAGE ---
+
+def test_split_minor_assigns_remainder_to_fee():
+    for amount in (0, 1, 7, 101, 9999, 10**12 + 3):
+        c, p, f = split_minor(amount)
+        assert c + p + f == amount and 0 <= f - amount // 10 <= 2
+    assert to_minor(100.1, 100) == 10010
+    assert to_minor(0.015, 100) == 2  # Half-even on the decimal repr
+
+def test_integer_vault_node(tmp_path, monkeypatch):
+    """A fresh vault with a scale stores INTEGER cents and answers in major units."""
+    monkeypatch.setattr(brain, "DB_PATH", str(tmp_path / "minor.db"))
+    monkeypatch.setattr(brain, "AMOUNT_SCALE", 100)
+    with TestClient(brain.app) as c:
+        split = c.post("/api/execute_split", json={"amount": 0.05}, headers=tma(3)).json()["split"]
+        assert split == {"creator": 0.03, "pool": 0.01, "fee": 0.01}
+        assert c.post("/api/execute_split", json={"amount": 0.001}, headers=tma(3)).status_code == 400
+        c.post("/api/execute_split/batch", json={"items": [{"amount": 10.1}]}, headers=tma(3))
+
+        assert c.get("/api/vault_summary/3").json() == {"creator_total": 6.09, "pool_total": 3.04}
+        page = c.get("/api/transactions", headers=tma(3)).json()
+        assert page["amount_scale"] == 100
+        assert sorted(item["amount"] for item in page["items"]) == [0.05, 10.1]
+    monkeypatch.setattr(brain, "AMOUNT_SCALE", 0)
+
+    conn = sqlite3.connect(str(tmp_path / "minor.db"))
+    assert conn.execute("SELECT typeof(amount), amount FROM transactions ORDER BY id").fetchall() == [
+        ("integer", 5), ("integer", 1010)
+    ]
+    assert ensure_scale(conn) == 100  # Recorded in the vault, independent of the environment
+    conn.close()
+
+def test_integer_vault_leaves_recompute_from_the_wire(tmp_path, monkeypatch):
+    """Clients rebuild page, proof and export leaves from the returned `*_minor` values alone."""
+    import hashlib, json
+    minor = ("amount_minor", "creator_share_minor", "user_pool_share_minor", "network_fee_minor")
+    leaf = lambda item: hashlib.sha256("|".join(
+        [*(str(item[k]) for k in minor), item["timestamp"]]).encode("utf-8")).hexdigest()
+    monkeypatch.setattr(brain, "DB_PATH", str(tmp_path / "minor.db"))
+    monkeypatch.setattr(brain, "AMOUNT_SCALE", 100)
+    with TestClient(brain.app) as c:
+        c.post("/api/execute_split/batch", json={"items": [{"amount": a} for a in (0.29, 10.1, 3)]}, headers=tma(4))
+        page = c.get("/api/transactions", headers=tma(4)).json()
+        assert [item["amount_minor"] for item in page["items"]] == [300, 1010, 29]
+        assert page["items"][2]["amount"] == 0.29 and page["items"][2]["amount"] * 100 != 29
+        assert page["page_merkle_root"] == generate_merkle_root([leaf(item) for item in page["items"]])
+
+        for item in page["items"]:
+            proof = c.get(f"/api/proof/{item['id']}").json()
+            assert proof["leaf_hash"] == leaf(item) and verify_proof(leaf(item), proof["path"], proof["root"])
+
+        lines = [json.loads(line) for line in c.get("/api/export", headers=tma(4)).text.splitlines()]
+        rows = [line for line in lines if "id" in line]
+        assert lines[-1]["_end"]["merkle_root"] == generate_merkle_root([leaf(row) for row in rows])
+        header = c.get("/api/export?format=csv", headers=tma(4)).text.splitlines()[0]
+        assert header.split(",")[-4:] == list(minor)
+    monkeypatch.setattr(brain, "AMOUNT_SCALE", 0)
+
+def test_integer_vault_rejects_amounts_beyond_int64(tmp_path, monkeypatch):
+    """An unbindable minor value is a 400 for its own item, never a 500 for its batch."""
+    monkeypatch.setattr(brain, "DB_PATH", str(tmp_path / "minor.db"))
+    monkeypatch.setattr(brain, "AMOUNT_SCALE", 100)
+    with TestClient(brain.app) as c:
+        response = c.post("/api/execute_split", json={"amount": 1e20}, headers=tma(3))
+        assert response.status_code == 400 and response.json()["detail"] == "INVALID_MAGNITUDE"
+        batch = c.post("/api/execute_split/batch", json={"items": [{"amount": 1e20}, {"amount": 1.0}]},
+                       headers=tma(3)).json()
+        assert [r["status"] for r in batch["results"]] == ["rejected", "committed"]
+        assert batch["results"][0]["error"] == "INVALID_MAGNITUDE"
+        assert c.get("/api/vault_summary/3").json() == {"creator_total": 0.6, "pool_total": 0.3}
+    monkeypatch.setattr(brain, "AMOUNT_SCALE", 0)
+
+def test_migration_to_minor_units(client, tmp_path):
+    for uid, amount in [(1, 100), (2, 12.34), (1, 0.07), (3, 5.555)]:
+        client.post("/api/execute_split", json={"amount": amount}, headers=tma(uid))
+    client.__exit__(None, None, None)  # Stop the node: the migration rewrites the ledger
+
+    conn = sqlite3.connect(brain.DB_PATH)
+    before = {r[0]: r[1:] for r in conn.execute("SELECT user_id, creator_total, pool_total FROM balances")}
+    result = migrate_to_minor_units(conn, 100, chunk=2)
+    assert (result["rows"], result["rounded"]) == (4, 1)
+    assert result["old_root"] != result["new_root"]
+
+    after = {r[0]: r[1:] for r in conn.execute("SELECT user_id, creator_total, pool_total FROM balances")}
+    assert after == {uid: (round(c * 100), round(p * 100)) for uid, (c, p) in before.items()}
+    assert check_balances(conn) == []
+    assert verify_frontier(conn)[0]
+    assert conn.execute("SELECT COUNT(*) FROM sqlite_master WHERE name = 'idx_tx_user_ts_id'").fetchone()[0] == 1
+    with pytest.raises(ValueError):
+        migrate_to_minor_units(conn, 100)
+    conn.close()
+
+    with TestClient(brain.app) as c:
+        assert c.get("/api/vault_summary/1").json() == {"creator_total": 60.04, "pool_total": 30.02}
+        assert c.post("/api/execute_split", json={"amount": 1}, headers=tma(1)).json()["split"]["fee"] == 0.1
+        assert c.get("/api/ledger_root").json()["tree_size"] == 5
+
+# --- INTEGER TIMESTAMPS & CURSORS ---
+
+def test_integer_timestamp_vault_pages_with_signed_cursors(tmp_path, monkeypatch):
+    """A fresh `us` vault stores INTEGER microseconds; tokens page both ways and are bound to their id."""
+    monkeypatch.setattr(brain, "DB_PATH", str(tmp_path / "us.db"))
+    monkeypatch.setattr(brain, "TIMESTAMP_UNIT", "us")
+    with TestClient(brain.app) as c:
+        for amount in (1, 2, 3, 4, 5):
+            c.post("/api/execute_split", json={"amount": amount}, headers=tma(3))
+        first = c.get("/api/transactions", params={"limit": 2}, headers=tma(3)).json()
+        assert [item["amount"] for item in first["items"]] == [5.0, 4.0] and first["has_more"]
+        assert first["page_merkle_root"] == generate_merkle_root([compute_leaf_hash(i) for i in first["items"]])
+        second = c.get("/api/transactions", params={"limit": 2, "cursor": first["next_cursor"]}, headers=tma(3)).json()
+        assert [item["amount"] for item in second["items"]] == [3.0, 2.0]
+
+        # Incremental refresh: nothing new, then exactly the rows committed since
+        idle = c.get("/api/transactions", params={"cursor": first["newer_cursor"]}, headers=tma(3)).json()
+        assert idle["items"] == [] and idle["newer_cursor"] == first["newer_cursor"]
+        c.post("/api/execute_split/batch", json={"items": [{"amount": 6}, {"amount": 7}]}, headers=tma(3))
+        fresh = c.get("/api/transactions", params={"cursor": first["newer_cursor"]}, headers=tma(3)).json()
+        assert [item["amount"] for item in fresh["items"]] == [7.0, 6.0] and not fresh["has_more"]
+        assert fresh["next_cursor"] is None
+
+        token = first["next_cursor"]
+        forged = token[:-2] + ("AA" if token[-2:] != "AA" else "BB")
+        for params, uid in (({"cursor": forged}, 3), ({"cursor": token}, 4), ({"cursor": "junk"}, 3)):
+            response = c.get("/api/transactions", params=params, headers=tma(uid))
+            assert response.status_code == 400 and response.json()["detail"] == "INVALID_CURSOR"
+    monkeypatch.setattr(brain, "TIMESTAMP_UNIT", "text")
+
+    conn = sqlite3.connect(str(tmp_path / "us.db"))
+    stored = [row[0] for row in conn.execute("SELECT timestamp FROM transactions ORDER BY id")]
+    assert all(isinstance(ts, int) for ts in stored) and stored == sorted(stored)
+    assert ensure_ts_unit(conn) == "us"  # Recorded in the vault, independent of the environment
+    assert verify_frontier(conn)[0] and check_rollups(conn) == []
+    conn.close()
+
+def test_newer_cursor_follows_commit_order(client):
+    """A row committed after the poll but stamped earlier (a follower's queued split) still reaches the poller."""
+    for amount in (1, 2):
+        client.post("/api/execute_split", json={"amount": amount}, headers=tma(9))
+    first = client.get("/api/transactions", headers=tma(9)).json()
+    assert [item["amount"] for item in first["items"]] == [2.0, 1.0]
+
+    late = ("9", 3.0, 1.8, 0.9, 0.3, "2020-01-01 00:00:00")  # Timestamp taken long before its commit
+    client.portal.call(brain.vault.writer("9").submit, late)
+    fresh = client.get("/api/transactions", params={"cursor": first["newer_cursor"]}, headers=tma(9)).json()
+    assert [item["amount"] for item in fresh["items"]] == [3.0] and not fresh["has_more"]
+    idle = client.get("/api/transactions", params={"cursor": fresh["newer_cursor"]}, headers=tma(9)).json()
+    assert idle["items"] == []
+
+    # History keeps timestamp order: the late row pages in last
+    history = client.get("/api/transactions", headers=tma(9)).json()
+    assert [item["amount"] for item in history["items"]] == [2.0, 1.0, 3.0]
+
+def test_timestamp_migration_copies_online_and_keeps_roots(client):
+    for uid, amount in [(1, 100), (2, 12.34), (1, 0.07)]:
+        client.post("/api/execute_split", json={"amount": amount}, headers=tma(uid))
+
+    # The copy runs next to a live node; rows committed meanwhile are picked up later
+    conn = sqlite3.connect(brain.DB_PATH)
+    assert migrate_timestamps(conn, chunk=2) == {"rows": 3, "pending": 0, "finalized": False}
+    client.post("/api/execute_split", json={"amount": 5}, headers=tma(1))
+    before = client.get("/api/transactions", headers=tma(1)).json()
+    root = client.get("/api/ledger_root").json()
+    client.__exit__(None, None, None)  # Stop the node for the swap
+
+    result = migrate_timestamps(conn, chunk=2, finalize=True)
+    assert (result["rows"], result["finalized"], result["root"]) == (1, True, root["root"])
+    assert conn.execute("SELECT DISTINCT typeof(timestamp) FROM transactions").fetchall() == [("integer",)]
+    assert conn.execute("SELECT COUNT(*) FROM sqlite_master WHERE name = 'idx_tx_user_ts_id'").fetchone()[0] == 1
+    assert verify_frontier(conn)[0] and check_rollups(conn) == []
+    with pytest.raises(ValueError):
+        migrate_timestamps(conn)
+    conn.close()
+
+    with TestClient(brain.app) as c:
+        after = c.get("/api/transactions", headers=tma(1)).json()
+        assert after["items"] == before["items"] and after["page_merkle_root"] == before["page_merkle_root"]
+        assert c.get("/api/ledger_root").json() == root
+        tx_id = c.post("/api/execute_split/batch", json={"items": [{"amount": 1}]}, headers=tma(1)).json()
+        assert tx_id["results"][0]["tx_id"] == 5
+        newest = c.get("/api/transactions", params={"limit": 1}, headers=tma(1)).json()["items"][0]
+        assert newest["id"] == 5 and datetime.fromisoformat(newest["timestamp"]) > datetime(2026, 1, 1)
+
+# --- HOT/ARCHIVE SEGMENTS ---
+
+def test_sealed_segments_serve_history_and_totals(client, tmp_path):
+    client.post("/api/execute_split", json={"amount": 1}, headers=tma(5))
+    client.__exit__(None, None, None)
+
+    # Backdate a ledger: 3 rows/month for Jan-Mar, then the live row
+    conn = sqlite3.connect(brain.DB_PATH)
+    conn.execute("DELETE FROM transactions")
+    for month in (1, 2, 3):
+        for day in (3, 9, 27):
+            ts = f"2026-{month:02d}-{day:02d} 12:00:00"
+            conn.execute(
+                "INSERT INTO transactions (user_id, amount, creator_share, user_pool_share, network_fee, timestamp) "
+                "VALUES ('5', 10.0, 6.0, 3.0, 1.0, ?)", (ts,))
+    conn.execute(
+        "INSERT INTO transactions (user_id, amount, creator_share, user_pool_share, network_fee, timestamp) "
+        "VALUES ('5', 1.0, 0.6, 0.3, 0.1, '2026-05-20 12:00:00')")
+    rebuild_balances(conn)
+    from backend.merkle import build_frontier, save_frontier
+    save_frontier(conn, build_frontier(conn, persist=True))
+    conn.commit()
+    root_before = read_root(conn)
+
+    sealed = seal_segments(conn, hot_days=30, now=datetime(2026, 5, 21), chunk=2)
+    assert [(m["month"], m["tx_count"]) for m in sealed] == [("2026-01", 3), ("2026-02", 3), ("2026-03", 3)]
+    assert conn.execute("SELECT COUNT(*) FROM transactions").fetchone()[0] == 1
+    assert os.path.exists(tmp_path / "archive" / "segment_2026_02.db")
+    assert seal_segments(conn, hot_days=30, now=datetime(2026, 5, 21)) == []
+    assert verify_segments(conn) == [] and check_balances(conn) == []
+    assert verify_frontier(conn, iter_ledger(conn))[0]
+    assert read_root(conn) == root_before
+    conn.close()
+
+    # The research anchor reads the hot file only: it reports what it skipped instead of a ledger root
+    sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), '../../research')))
+    import merkle_anchor
+    assert merkle_anchor.coverage_gaps(brain.DB_PATH) == (3, [])
+    assert merkle_anchor.generate_merkle_root(brain.DB_PATH)[1] == 1
+
+    with TestClient(brain.app) as c:
+        assert c.get("/api/vault_summary/5").json() == {"creator_total": 54.6, "pool_total": 27.3}
+        seen, cursor = [], {}
+        while True:
+            page = c.get("/api/transactions", params={"limit": 4, **cursor}, headers=tma(5)).json()
+            seen += [item["timestamp"] for item in page["items"]]
+            if not page["next_cursor"]:
+                break
+            cursor = {"cursor": page["next_cursor"]}
+        assert len(seen) == 10 and seen == sorted(seen, reverse=True)
+        # Forward from the oldest page: archive files first, then the hot segment
+        pages, cursor = [], {"cursor": page["newer_cursor"]}
+        while True:
+            page = c.get("/api/transactions", params={"limit": 4, **cursor}, headers=tma(5)).json()
+            pages.append([item["timestamp"] for item in page["items"]])
+            cursor = {"cursor": page["newer_cursor"]}
+            if not page["has_more"]:
+                break
+        assert sum(reversed(pages), []) == seen[:8]
+        assert c.get("/api/ledger_root").json() == root_before
+
+def test_seal_never_deletes_a_row_committed_after_the_copy(tmp_path, monkeypatch):
+    """A late row below the floor stays hot and readable (history, ledger root) until the next seal archives it."""
+    import backend.segments as segments
+    from backend.merkle import build_frontier, save_frontier
+    conn = sqlite3.connect(str(tmp_path / "late.db"))
+    init_vault(conn, 0, "text")
+    insert = ("INSERT INTO transactions (user_id, amount, creator_share, user_pool_share, network_fee, timestamp) "
+              "VALUES ('5', 10.0, 6.0, 3.0, 1.0, ?)")
+    def commit(ts):
+        with conn:  # Raw insert plus the hot totals and Merkle state the writer would have kept
+            conn.execute(insert, (ts,))
+            rebuild_balances(conn)
+            save_frontier(conn, build_frontier(conn, persist=True, rows=iter_ledger(conn)))
+            rebuild_rollups(conn)
+    for day in (3, 9, 27):
+        commit(f"2026-01-{day:02d} 12:00:00")
+
+    build = segments._build_segment
+    def build_then_commit_late(conn, month, *args):
+        meta = build(conn, month, *args)
+        if month == "2026-01":
+            commit("2026-01-15 12:00:00")  # Lands between the copy snapshot and the drain
+        return meta
+    monkeypatch.setattr(segments, "_build_segment", build_then_commit_late)
+
+    sealed = seal_segments(conn, hot_days=30, now=datetime(2026, 3, 5))
+    assert [(m["month"], m["tx_count"], m["last_id"]) for m in sealed] == [("2026-01", 3, 3)]
+    assert conn.execute("SELECT id FROM transactions").fetchall() == [(4,)]
+    assert verify_segments(conn) == [] and check_balances(conn) == []
+    history = read_history(conn, "5", None, None, 10, True)
+    assert [row[0] for row in history] == [3, 4, 2, 1]  # In its timestamp place, between archived rows
+    assert [row[0] for row in read_history(conn, "5", history[1][6], 4, 10, True)] == [2, 1]
+    assert [row[0] for row in read_history(conn, "5", "2026-01-03 12:00:00", 1, 10, True, newer=True)] == [2, 3, 4]
+    assert [row[0] for row in iter_ledger(conn)] == [1, 2, 3, 4]
+    assert verify_frontier(conn, iter_ledger(conn))[0]  # rebuild-merkle agrees with the stored root
+    assert check_rollups(conn) == []
+
+    # The next month's copy (everything below its floor) archives the straggler
+    commit("2026-02-10 12:00:00")
+    sealed = seal_segments(conn, hot_days=30, now=datetime(2026, 4, 5))
+    assert [(m["month"], m["tx_count"]) for m in sealed] == [("2026-02", 2)]
+    assert conn.execute("SELECT COUNT(*) FROM transactions").fetchone()[0] == 0
+    assert verify_segments(conn) == [] and check_balances(conn) == []
+    assert [row[0] for row in iter_ledger(conn)] == [1, 2, 3, 4, 5]
+    assert verify_frontier(conn, iter_ledger(conn))[0]
+    conn.close()
+
+# --- ROLLUPS ---
+
+def test_rollups_track_commits_per_user_and_node(client, monkeypatch):
+    for uid, amount in ((1, 100), (1, 50), (2, 10)):
+        client.post("/api/execute_split", json={"amount": amount}, headers=tma(uid))
+    client.post("/api/execute_split/batch", json={"items": [{"amount": 5}] * 3}, headers=tma(2))
+
+    mine = client.get("/api/rollups", headers=tma(1)).json()
+    assert mine["granularity"] == "day" and len(mine["buckets"]) == 1
+    assert {k: mine["buckets"][0][k] for k in ("tx_count", "amount", "creator", "pool", "fee")} == \
+        {"tx_count": 2, "amount": 150.0, "creator": 90.0, "pool": 45.0, "fee": 15.0}
+    assert client.get("/api/rollups", params={"scope": "node"}, headers=tma(1)).status_code == 403  # Operators only
+    node = client.get("/api/rollups", params={"scope": "node", "granularity": "hour"},
+                      headers=dict(tma(1), **admin(monkeypatch))).json()
+    assert node["buckets"][0]["tx_count"] == 6 and node["buckets"][0]["amount"] == 175.0
+    assert node["buckets"][0]["bucket"].endswith(":00:00")
+
+    assert client.get("/api/rollups", params={"granularity": "week"}, headers=tma(1)).json()["detail"] == "INVALID_GRANULARITY"
+    assert client.get("/api/rollups", params={"start": "2026-13-01"}, headers=tma(1)).json()["detail"] == "INVALID_RANGE"
+    too_wide = client.get("/api/rollups", params={"granularity": "hour", "start": "2025-01-01", "end": "2025-12-31"},
+                          headers=tma(1))
+    assert too_wide.status_code == 400 and too_wide.json()["detail"] == "ROLLUP_RANGE_TOO_LARGE"
+
+def test_rollups_cover_sealed_history_and_catch_up(client):
+    client.__exit__(None, None, None)
+    conn = sqlite3.connect(brain.DB_PATH)
+    rows = [("7", 10.0, 6.0, 3.0, 1.0, f"2025-{1 + d // 28:02d}-{1 + d % 28:02d} {h:02d}:30:00")
+            for d in range(336) for h in (9, 17)]
+    conn.executemany(
+        "INSERT INTO transactions (user_id, amount, creator_share, user_pool_share, network_fee, timestamp) "
+        "VALUES (?, ?, ?, ?, ?, ?)", rows)
+    rebuild_balances(conn)
+    assert rebuild_rollups(conn) == 672
+    conn.commit()
+    seal_segments(conn, hot_days=30, now=datetime(2026, 2, 1))
+    assert conn.execute("SELECT COUNT(*) FROM transactions").fetchone()[0] == 0
+    assert check_rollups(conn) == []  # Rebuilt from the archive files alone
+    # Rows a rollup-unaware writer added: folded in at the next boot, keyed on last processed id
+    conn.execute(
+        "INSERT INTO transactions (user_id, amount, creator_share, user_pool_share, network_fee, timestamp) "
+        "VALUES ('7', 4.0, 2.4, 1.2, 0.4, '2026-01-10 08:00:00')")
+    conn.commit()
+    assert check_rollups(conn) != []
+    conn.close()
+
+    with TestClient(brain.app) as c:
+        year = c.get("/api/rollups", params={"start": "2025-01-01", "end": "2025-12-31"}, headers=tma(7)).json()
+        assert len(year["buckets"]) == 336 and {b["tx_count"] for b in year["buckets"]} == {2}
+        assert sum(b["creator"] for b in year["buckets"]) == pytest.approx(4032.0)
+        jan = c.get("/api/rollups", params={"start": "2026-01-10", "end": "2026-01-10 23:59:59", "granularity": "hour"},
+                    headers=tma(7)).json()
+        assert [(b["bucket"], b["amount"]) for b in jan["buckets"]] == [("2026-01-10 08:00:00", 4.0)]
+        # A bare end date is inclusive of the whole day, also for hourly buckets
+        day = c.get("/api/rollups", params={"start": "2025-01-01", "end": "2025-01-01", "granularity": "hour"},
+                    headers=tma(7)).json()
+        assert [b["bucket"] for b in day["buckets"]] == ["2025-01-01 09:00:00", "2025-01-01 17:00:00"]
+        # Offsets are converted to UTC before bucketing: 14:30+05:00 is the 09:00 UTC hour
+        shifted = c.get("/api/rollups", params={"start": "2025-01-01T14:30:00+05:00",
+                                                "end": "2025-01-01T14:59:59+05:00", "granularity": "hour"},
+                        headers=tma(7)).json()
+        assert shifted["start"] == "2025-01-01 09:00:00"
+        assert [b["bucket"] for b in shifted["buckets"]] == ["2025-01-01 09:00:00"]
+    conn = sqlite3.connect(brain.DB_PATH)
+    assert check_rollups(conn) == []
+    assert conn.execute("SELECT COUNT(*) FROM rollups_day WHERE user_id = ?", (NODE_SCOPE,)).fetchone()[0] == 337
+    conn.close()
+
+# --- SHARDED VAULT ---
+
+def test_sharded_vault_routes_each_user_to_one_shard(tmp_path, monkeypatch):
+    monkeypatch.setattr(brain, "DB_PATH", str(tmp_path / "vault.db"))
+    monkeypatch.setattr(brain, "VAULT_SHARDS", 4)
+    with TestClient(brain.app) as c:
+        for uid in range(1, 9):
+            c.post("/api/execute_split/batch", json={"items": [{"amount": 10}] * uid}, headers=tma(uid))
+        assert c.get("/api/vault_summary/6").json() == {"creator_total": 36.0, "pool_total": 18.0}
+        page = c.get("/api/transactions", params={"limit": 5}, headers=tma(8)).json()
+        assert len(page["items"]) == 5 and page["next_cursor"]
+
+        batch = c.post("/api/execute_split/batch", json={"items": [{"amount": 1}]}, headers=tma(3)).json()
+        assert batch["shard"] == shard_of("3", 4)
+        proof = c.get(f"/api/proof/{batch['results'][0]['tx_id']}", params={"shard": batch["shard"]}).json()
+        ledger = c.get("/api/ledger_root").json()
+        assert ledger["tree_size"] == 37 and len(ledger["shards"]) == 4
+        assert proof["root"] == ledger["shards"][batch["shard"]]["root"]
+        assert len(c.get("/api/node_stats", headers=admin(monkeypatch)).json()["pool"]) == 4
+
+    assert detect_layouts(brain.DB_PATH) == [4]
+    for i, path in enumerate(shard_paths(brain.DB_PATH, 4)):
+        users = {r[0] for r in sqlite3.connect(path).execute("SELECT user_id FROM transactions")}
+        assert all(shard_of(uid, 4) == i for uid in users)
+
+    monkeypatch.setattr(brain, "VAULT_SHARDS", 1)  # Would hide the sharded rows
+    with pytest.raises(RuntimeError, match="VAULT_SHARD_MISMATCH"):
+        with TestClient(brain.app):
+            pass
+
+def test_reshard_preserves_balances_and_history(client, monkeypatch):
+    for uid in range(1, 7):
+        for amount in (1, 2.5, 40):
+            client.post("/api/execute_split", json={"amount": amount * uid}, headers=tma(uid))
+    summaries = {uid: client.get(f"/api/vault_summary/{uid}").json() for uid in range(1, 7)}
+    client.__exit__(None, None, None)
+
+    with pytest.raises(ValueError, match="RESHARD_RENUMBERS_IDS"):
+        reshard(brain.DB_PATH, 1, 3)
+    assert vault_admin.main(["--db", brain.DB_PATH, "--shards", "1", "reshard", "--to", "3"]) == 1
+    assert detect_layouts(brain.DB_PATH) == [1]
+
+    result = reshard(brain.DB_PATH, 1, 3, chunk=4, renumber=True)
+    assert result["rows"] == 18 and detect_layouts(brain.DB_PATH) == [3]
+    for path in result["targets"]:
+        conn = sqlite3.connect(path)
+        assert check_balances(conn) == [] and verify_frontier(conn)[0]
+        conn.close()
+
+    monkeypatch.setattr(brain, "VAULT_SHARDS", 3)
+    with TestClient(brain.app) as c:
+        assert {uid: c.get(f"/api/vault_summary/{uid}").json() for uid in range(1, 7)} == summaries
+        amounts = [item["amount"] for item in c.get("/api/transactions", headers=tma(4)).json()["items"]]
+        assert amounts == [160.0, 10.0, 4.0]
+
+def test_ids_issued_before_a_reshard_still_get_proofs(client, monkeypatch):
+    def issued(c, layout):
+        found = []
+        for uid in range(1, 7):
+            batch = c.post("/api/execute_split/batch", json={"items": [{"amount": uid}, {"amount": 2}]}, headers=tma(uid)).json()
+            for result in batch["results"]:
+                proof = c.get(f"/api/proof/{result['tx_id']}", params={"shard": batch["shard"]}).json()
+                found.append((layout, batch["shard"], result["tx_id"], proof["leaf_hash"]))
+        return found
+
+    held = issued(client, 1)
+    client.__exit__(None, None, None)
+    reshard(brain.DB_PATH, 1, 3, chunk=5, renumber=True)
+    monkeypatch.setattr(brain, "VAULT_SHARDS", 3)
+    with TestClient(brain.app) as c:
+        held += issued(c, 3)
+    reshard(brain.DB_PATH, 3, 2, chunk=5, renumber=True)  # Layout-1 entries are carried through the second map
+
+    monkeypatch.setattr(brain, "VAULT_SHARDS", 2)
+    with TestClient(brain.app) as c:
+        roots = c.get("/api/ledger_root").json()["shards"]
+        for layout, shard, tx_id, leaf_hash in held:
+            proof = c.get(f"/api/proof/{tx_id}", params={"shard": shard, "layout": layout}).json()
+            assert proof["leaf_hash"] == leaf_hash and proof["root"] == roots[proof["shard"]]["root"]
+            assert verify_proof(proof["leaf_hash"], proof["path"], proof["root"])
+        assert len({(p["shard"], p["tx_id"]) for p in (
+            c.get(f"/api/proof/{tx_id}", params={"shard": shard, "layout": layout}).json() for layout, shard, tx_id, _ in held
+        )}) == 24
+        assert c.get("/api/proof/99", params={"layout": 1}).status_code == 404
+        assert c.get("/api/proof/1", params={"shard": 3, "layout": 3}).status_code == 404
+
+# --- ONLINE SNAPSHOTS ---
+
+def test_snapshot_is_consistent_under_writes_and_restores(client, tmp_path):
+    for uid in range(1, 5):
+        client.post("/api/execute_split/batch", json={"items": [{"amount": 5}] * 50}, headers=tma(uid))
+    stop = threading.Event()
+
+    def keep_writing():  # Every page step sees new WAL frames; the pinned snapshot must not restart
+        while not stop.is_set():
+            client.post("/api/execute_split", json={"amount": 1}, headers=tma(9))
+
+    writer = threading.Thread(target=keep_writing)
+    writer.start()
+    try:
+        manifest = snapshots.take_snapshot([brain.DB_PATH], str(tmp_path / "snaps"), pages=1, sleep_ms=1)
+    finally:
+        stop.set()
+        writer.join()
+    entry = manifest["files"][0]
+    assert entry["copy"]["steps"] > 1 and snapshots.verify_snapshot(manifest["path"]) == []
+    copy = sqlite3.connect(os.path.join(manifest["path"], "vault.db"))
+    assert copy.execute("SELECT MAX(id) FROM transactions").fetchone()[0] == entry["max_id"] == entry["tree_size"]
+    assert check_balances(copy) == [] and verify_frontier(copy)[0]
+    copy.close()
+    live_max = client.get("/api/ledger_root").json()["tree_size"]
+    client.__exit__(None, None, None)
+
+    assert live_max > entry["max_id"] >= 200
+    restored = snapshots.restore_snapshot(manifest["path"], str(tmp_path))
+    assert os.path.exists(os.path.join(restored["moved_aside"], "vault.db"))
+    with TestClient(brain.app) as c:
+        assert c.get("/api/ledger_root").json()["root"] == entry["merkle_root"]
+
+    with open(os.path.join(manifest["path"], "vault.db"), "r+b") as f:
+        f.seek(200)
+        f.write(b"\xff")
+    with pytest.raises(ValueError, match="SNAPSHOT_CORRUPT"):
+        snapshots.restore_snapshot(manifest["path"], str(tmp_path))
+
+def test_snapshot_admin_endpoint(client, monkeypatch):
+    admin = {"X-Nexus-Admin-Token": "operator"}
+    assert client.post("/api/admin/snapshot", headers=admin).status_code == 403  # No NEXUS_ADMIN_TOKEN: no access
+    monkeypatch.setattr(brain, "ADMIN_TOKEN", "operator")
+    assert client.post("/api/admin/snapshot", headers=admin).status_code == 404
+    monkeypatch.setattr(snapshots, "SNAPSHOTS", True)
+    assert client.post("/api/admin/snapshot").status_code == 403
+    assert client.get("/api/admin/snapshot", headers={"X-Nexus-Admin-Token": "guess"}).status_code == 403
+    client.post("/api/execute_split", json={"amount": 10}, headers=tma(1))
+    assert client.post("/api/admin/snapshot", headers={"Authorization": "Bearer operator"}).status_code == 202
+    for _ in range(200):
+        status = client.get("/api/admin/snapshot", headers=admin).json()
+        if not status["running"]:
+            break
+        time.sleep(0.01)
+    assert status["taken"] == 1 and status["last_error"] is None
+    assert status["last"]["files"][0]["max_id"] == 1
+    root = snapshots.snapshot_root(brain.DB_PATH)
+    assert not os.path.isabs(status["last"]["path"])
+    assert snapshots.list_snapshots(root) == [os.path.join(root, status["last"]["path"])]
+
+    monkeypatch.setattr(brain, "ADMIN_IDS", {"42"})  # Token alone is not enough once ids are pinned
+    assert client.get("/api/admin/snapshot", headers=admin).status_code == 403
+    assert client.get("/api/admin/snapshot", headers=dict(admin, **tma(42))).status_code == 200
+
+# --- MULTI-PROCESS WORKERS ---
+
+def test_follower_writes_through_elected_writer_and_fails_over(tmp_path):
+    """Election, IPC submits, the shared ledger version and promotion (two coordinators, one process)."""
+    db = str(tmp_path / "vault.db")
+    row = ("7", 10.0, 6.0, 3.0, 1.0, "2026-01-01 00:00:00")
+
+    async def scenario():
+        first, second = WorkerCoordinator(workers=2), WorkerCoordinator(workers=2)
+        with first.startup(db):
+            conn = sqlite3.connect(db)
+            init_vault(conn, 0, "text")
+            conn.close()
+        with second.startup(db):
+            pass
+        assert (first.role, second.role) == ("writer", "follower")
+
+        writer_vault, follower_vault = ShardedVault(), ShardedVault()
+        writer_vault.add_commit_listener(first.on_commit)
+        follower_vault.add_commit_listener(second.on_commit)
+        writer_vault.open([db])
+        follower_vault.open([db])
+
+        async def submit(message):
+            return await writer_vault.writers[message["shard"]].submit_many([tuple(r) for r in message["rows"]])
+
+        async def promote():
+            follower_vault.reset_writers()
+            await follower_vault.start()
+
+        first.bind(writer_vault, None)
+        await writer_vault.start()
+        await first.serve({"submit": submit})
+        second.bind(follower_vault, promote)
+        follower_vault.use_writers([RemoteWriter(second, 0)])
+
+        cache = LRUCache(version=second.version.read)
+        cache.put("7", "stale")
+        assert await follower_vault.writer("7").submit_many([row] * 3) == [1, 2, 3]
+        assert cache.get("7") is None  # The writer's commit moved the shared counter
+        with pytest.raises(ValueError, match="IPC_UNKNOWN_OP"):
+            await second.call("nope")
+
+        # The writer exits: the follower's next write finds no socket and takes over the election
+        await first.stop_serving()
+        await writer_vault.stop()
+        writer_vault.close()
+        first.close()
+        while second.client.connected:
+            await asyncio.sleep(0.01)  # Hang-up seen: nothing in flight, so the next write may fail over
+        assert await follower_vault.writer("7").submit(row) == 4
+        assert second.role == "writer" and second.promotions == 1 and second.version.read() == 2
+        await second.stop_serving()
+        await follower_vault.stop()
+        follower_vault.close()
+        second.close()
+
+    asyncio.run(scenario())
+    conn = sqlite3.connect(db)
+    assert conn.execute("SELECT COUNT(*) FROM transactions").fetchone()[0] == 4
+    assert check_balances(conn) == [] and verify_frontier(conn)[0]
+    conn.close()
+
+WRITER_PROCESS = """
+import sys, asyncio, sqlite3
+sys.path.insert(0, sys.argv[2])
+from backend.shards import ShardedVault, init_vault
+from backend.workers import WorkerCoordinator
+
+async def main(db):
+    coordinator, vault = WorkerCoordinator(workers=2), ShardedVault()
+    with coordinator.startup(db):
+        conn = sqlite3.connect(db)
+        init_vault(conn, 0, "text")
+        conn.close()
+    vault.add_commit_listener(coordinator.on_commit)
+    vault.open([db])
+    coordinator.bind(vault, None)
+    await vault.start()
+
+    async def submit(message):
+        return await vault.writers[message["shard"]].submit_many([tuple(r) for r in message["rows"]])
+
+    await coordinator.serve({"submit": submit})
+    print(coordinator.role, flush=True)
+    await asyncio.Event().wait()
+
+asyncio.run(main(sys.argv[1]))
+"""
+
+def test_follower_takes_over_when_the_writer_process_dies(tmp_path):
+    """A SIGKILLed writer process leaves a stale socket; the follower's next write wins the election."""
+    import subprocess
+    db = str(tmp_path / "vault.db")
+    row = ("7", 10.0, 6.0, 3.0, 1.0, "2026-01-01 00:00:00")
+    root = os.path.abspath(os.path.join(os.path.dirname(__file__), '../..'))
+    writer = subprocess.Popen([sys.executable, "-c", WRITER_PROCESS, db, root], stdout=subprocess.PIPE, text=True)
+
+    async def scenario():
+        assert writer.stdout.readline().strip() == "writer"
+        follower, vault = WorkerCoordinator(workers=2), ShardedVault()
+        with follower.startup(db):
+            pass
+        assert follower.role == "follower"
+        vault.add_commit_listener(follower.on_commit)
+        vault.open([db])
+
+        async def promote():
+            vault.reset_writers()
+            await vault.start()
+
+        follower.bind(vault, promote)
+        vault.use_writers([RemoteWriter(follower, 0)])
+        assert await vault.writer("7").submit_many([row] * 2) == [1, 2]
+
+        writer.kill()  # No shutdown path: the kernel drops the flock and the connection
+        writer.wait(timeout=10)
+        while follower.client.connected:
+            await asyncio.sleep(0.01)
+        assert os.path.exists(follower.files["socket"])  # Stale: refused, not missing
+        assert await vault.writer("7").submit(row) == 3
+        assert follower.role == "writer" and follower.promotions == 1
+        await follower.stop_serving()
+        await vault.stop()
+        vault.close()
+        follower.close()
+
+    try:
+        asyncio.run(scenario())
+    finally:
+        if writer.poll() is None:
+            writer.kill()
+        writer.stdout.close()
+    conn = sqlite3.connect(db)
+    assert conn.execute("SELECT COUNT(*) FROM transactions").fetchone()[0] == 3
+    assert check_balances(conn) == [] and verify_frontier(conn)[0]
+    conn.close()
@@ -0,0 +1,116 @@
+# Copyright 2026 Coreframe Systems (Nexus Protocol)
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#        http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+
+"""
+🏛️ NEXUS LEDGER TIMESTAMPS (Phase 1.4.x)
+
+Optional compact storage for `transactions.timestamp`. A vault created with
+`NEXUS_TIMESTAMP_UNIT=us` stores INTEGER microseconds since the Unix epoch
+instead of 19-character `%Y-%m-%d %H:%M:%S` TEXT: rows and the
+`idx_tx_user_ts_id` entries shrink by ~11 bytes, comparisons are integer
+compares, and splits within one second keep their sub-second order.
+
+The unit is a property of the vault file, recorded once in `vault_meta`
+(next to the amount scale, see units.py). The environment only chooses it for
+brand-new vaults; an existing TEXT vault keeps working as-is until converted
+with `migrate_timestamps` (`python scripts/vault_admin.py migrate-timestamps`).
+
+CANONICAL TEXT:
+Everything outside the ledger column sees one canonical UTC text form,
+`YYYY-MM-DD HH:MM:SS`, with `.ffffff` appended only when the microseconds are
+non-zero: API responses, exports, rollup buckets, the segment catalog and
+Merkle leaves (merkle.py). A whole-second integer renders exactly as the
+legacy TEXT value did, so migrating a vault changes no leaf and no root, and
+the canonical form sorts like the stored integers.
+"""
+
+import os
+import time
+import sqlite3
+from datetime import datetime, timedelta, timezone
+from typing import Any
+
+TEXT, MICROS = "text", "us"
+TS_UNITS = (TEXT, MICROS)
+TIMESTAMP_UNIT = MICROS if os.getenv("NEXUS_TIMESTAMP_UNIT", TEXT).lower() == MICROS else TEXT  # text = legacy
+
+TS_FORMAT = "%Y-%m-%d %H:%M:%S"
+_EPOCH = datetime(1970, 1, 1)
+_MICROSECOND = timedelta(microseconds=1)
+
+
+def ts_type(unit: str) -> str:
+    return "INTEGER" if unit == MICROS else "TEXT"
+
+# --- 1. VAULT UNIT ---
+def ensure_ts_unit(conn: sqlite3.Connection, requested: str = TIMESTAMP_UNIT) -> str:
+    """
+    Returns the vault's timestamp unit, recording it on first use. A fresh
+    vault adopts `requested`; a pre-existing ledger without a record is TEXT.
+    The caller owns the transaction.
+    """
+    conn.execute("CREATE TABLE IF NOT EXISTS vault_meta (key TEXT PRIMARY KEY, value TEXT NOT NULL)")
+    row = conn.execute("SELECT value FROM vault_meta WHERE key = 'ts_unit'").fetchone()
+    if row is not None:
+        return row[0]
+    legacy = conn.execute(
+        "SELECT 1 FROM sqlite_master WHERE type = 'table' AND name = 'transactions'"
+    ).fetchone()
+    unit = TEXT if legacy else requested
+    set_ts_unit(conn, unit)
+    return unit
+
+def set_ts_unit(conn: sqlite3.Connection, unit: str) -> None:
+    conn.execute("INSERT OR REPLACE INTO vault_meta (key, value) VALUES ('ts_unit', ?)", (unit,))
+
+def read_ts_unit(conn: sqlite3.Connection) -> str:
+    """Read-only lookup (no record, or no `vault_meta` at all, means a legacy TEXT vault)."""
+    if conn.execute("SELECT 1 FROM sqlite_master WHERE name = 'vault_meta'").fetchone() is None:
+        return TEXT
+    row = conn.execute("SELECT value FROM vault_meta WHERE key = 'ts_unit'").fetchone()
+    return row[0] if row else TEXT
+
+# --- 2. CONVERSIONS ---
+def now_stored(unit: str) -> Any:
+    """The current time in the vault's stored representation."""
+    if unit == MICROS:
+        return time.time_ns() // 1000
+    return datetime.now(timezone.utc).strftime(TS_FORMAT)
+
+def render(value: Any) -> str:
+    """Stored value -> canonical UTC text (TEXT values pass through unchanged)."""
+    if value.__class__ is str:
+        return value
+    seconds, micros = divmod(value, 1_000_000)
+    text = time.strftime(TS_FORMAT, time.gmtime(seconds))
+    return f"{text}.{micros:06d}" if micros else text
+
+def to_stored(value: Any, unit: str) -> Any:
+    """
+    Canonical text (or any ISO-8601 timestamp, UTC unless it carries an
+    offset) or integer microseconds -> the vault's stored representation.
+    Raises ValueError on unparseable text.
+    """
+    if unit != MICROS:
+        return render(value)
+    if isinstance(value, int):
+        return value
+    moment = datetime.fromisoformat(value)
+    if moment.tzinfo is not None:
+        moment = moment.astimezone(timezone.utc).replace(tzinfo=None)
+    return (moment - _EPOCH) // _MICROSECOND
+
+def earliest(unit: str) -> Any:
+    """A bound below every stored value (the floor of a vault without sealed segments)."""
+    return -(1 << 63) if unit == MICROS else ""
@@ -0,0 +1,253 @@
+# Copyright 2026 Coreframe Systems (Nexus Protocol)
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#        http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+
+"""
+🏛️ NEXUS MINOR-UNIT STORAGE (Phase 1.4.x)
+
+Optional integer storage for ledger amounts. A vault created with
+`NEXUS_AMOUNT_SCALE=100` stores cents (or 1/scale units) in INTEGER columns
+instead of REAL: sums are exact, rows are smaller on disk, and leaf hashes
+serialize canonical integers instead of `str(float)` output.
+
+The scale is a property of the vault file, recorded once in `vault_meta`.
+The environment only chooses it for brand-new vaults; an existing REAL vault
+keeps working as-is until converted with `migrate_to_minor_units`
+(`python scripts/vault_admin.py migrate-minor-units`). Timestamps follow the
+same model (timestamps.py); `migrate_timestamps` converts them.
+
+SPLIT RULE (integer mode):
+creator = floor(60% of amount), pool = floor(30% of amount), and the fee takes
+the remainder, so the three shares always sum exactly to the amount and the
+rounding residue (at most 2 minor units) always lands on the network fee.
+"""
+
+import os
+import math
+import sqlite3
+from decimal import Decimal, ROUND_HALF_EVEN
+from typing import Optional, Tuple, Dict, Any, Callable
+
+from backend.vault import ensure_balances
+from backend.rollups import drop_rollups, ensure_rollups
+from backend.merkle import build_frontier, save_frontier, read_root
+from backend.timestamps import MICROS, TEXT, ensure_ts_unit, set_ts_unit, to_stored, ts_type
+
+AMOUNT_SCALE = max(0, int(os.getenv("NEXUS_AMOUNT_SCALE", "0")))  # 0 = legacy REAL columns
+MIGRATION_CHUNK = max(1, int(os.getenv("NEXUS_MIGRATION_CHUNK", "10000")))
+
+LEDGER_DDL = """
+    CREATE TABLE IF NOT EXISTS {table} (
+        id INTEGER PRIMARY KEY AUTOINCREMENT,
+        user_id TEXT NOT NULL,
+        amount {money} NOT NULL,
+        creator_share {money} NOT NULL,
+        user_pool_share {money} NOT NULL,
+        network_fee {money} NOT NULL,
+        timestamp {ts} NOT NULL
+    )
+"""
+LEDGER_INDEX_SQL = "CREATE INDEX IF NOT EXISTS idx_tx_user_ts_id ON transactions (user_id, timestamp DESC, id DESC);"
+
+
+def money_type(scale: int) -> str:
+    return "INTEGER" if scale else "REAL"
+
+# --- 1. VAULT SCALE ---
+def ensure_scale(conn: sqlite3.Connection, requested: int = AMOUNT_SCALE) -> int:
+    """
+    Returns the vault's storage scale, recording it on first use. A fresh
+    vault adopts `requested`; a pre-existing ledger without a record is REAL (0).
+    The caller owns the transaction.
+    """
+    conn.execute("CREATE TABLE IF NOT EXISTS vault_meta (key TEXT PRIMARY KEY, value TEXT NOT NULL)")
+    row = conn.execute("SELECT value FROM vault_meta WHERE key = 'amount_scale'").fetchone()
+    if row is not None:
+        return int(row[0])
+    legacy = conn.execute(
+        "SELECT 1 FROM sqlite_master WHERE type = 'table' AND name = 'transactions'"
+    ).fetchone()
+    scale = 0 if legacy else requested
+    _set_scale(conn, scale)
+    return scale
+
+def _set_scale(conn: sqlite3.Connection, scale: int) -> None:
+    conn.execute("INSERT OR REPLACE INTO vault_meta (key, value) VALUES ('amount_scale', ?)", (str(scale),))
+
+# --- 2. CONVERSIONS ---
+MAX_MINOR = (1 << 63) - 1  # SQLite INTEGER is a signed 64-bit value
+
+def to_minor(amount: float, scale: int) -> int:
+    """Major -> minor units via the shortest decimal repr (100.1 -> 10010, never 10009)."""
+    if not math.isfinite(amount):
+        raise ValueError("NON_FINITE_AMOUNT")
+    return int((Decimal(repr(amount)) * scale).to_integral_value(rounding=ROUND_HALF_EVEN))
+
+def to_major(value: Any, scale: int) -> float:
+    """Display value: exact division in integer mode, cent rounding for legacy REAL vaults."""
+    return value / scale if scale else round(value, 2)
+
+def split_minor(amount: int) -> Tuple[int, int, int]:
+    """60/30/10 in integers; the fee absorbs the rounding remainder."""
+    creator = amount * 60 // 100
+    pool = amount * 30 // 100
+    return creator, pool, amount - creator - pool
+
+# --- 3. CHUNKED MIGRATION (REAL -> INTEGER) ---
+def migrate_to_minor_units(
+    conn: sqlite3.Connection,
+    scale: int,
+    chunk: int = MIGRATION_CHUNK,
+    progress: Optional[Callable[[int], None]] = None,
+) -> Dict[str, Any]:
+    """
+    Converts a REAL vault to INTEGER minor units. The node must be stopped.
+
+    Rows are copied in id order into `transactions_minor`, one transaction per
+    `chunk` rows, so memory and WAL growth stay bounded and an interrupted run
+    resumes where it stopped. Historical shares are converted as recorded
+    (never recomputed). A final short transaction swaps the tables and
+    rebuilds the balances, rollups and the Merkle accumulator, whose root changes
+    because leaves now hash integers; the old root is returned for the record.
+    """
+    if ensure_scale(conn) != 0:
+        raise ValueError("VAULT_ALREADY_MINOR_UNITS")
+    if scale < 100:
+        # Legacy shares were rounded to cents; coarser scales would lose value
+        raise ValueError("MIGRATION_SCALE_TOO_COARSE")
+    if _has_table(conn, "segments") and conn.execute("SELECT 1 FROM segments").fetchone():
+        raise ValueError("VAULT_HAS_SEGMENTS")  # Sealed files are immutable; convert before sealing
+    conn.commit()
+    old_root = read_root(conn)["root"] if _has_table(conn, "merkle_state") else None
+
+    unit = ensure_ts_unit(conn)
+    conn.commit()
+    conn.execute(LEDGER_DDL.format(table="transactions_minor", money="INTEGER", ts=ts_type(unit)))
+    conn.commit()
+    copied = rounded = 0
+    while True:
+        last_id = conn.execute("SELECT COALESCE(MAX(id), 0) FROM transactions_minor").fetchone()[0]
+        rows = conn.execute(
+            "SELECT id, user_id, amount, creator_share, user_pool_share, network_fee, timestamp "
+            "FROM transactions WHERE id > ? ORDER BY id LIMIT ?",
+            (last_id, chunk),
+        ).fetchall()
+        if not rows:
+            break
+        converted = []
+        for row in rows:
+            minor = [to_minor(v, scale) for v in row[2:6]]
+            rounded += Decimal(repr(row[2])) * scale != minor[0]
+            converted.append((row[0], row[1], *minor, row[6]))
+        with conn:
+            conn.executemany("INSERT INTO transactions_minor VALUES (?, ?, ?, ?, ?, ?, ?)", converted)
+        copied += len(converted)
+        if progress:
+            progress(copied)
+
+    conn.execute("BEGIN IMMEDIATE")
+    try:
+        conn.execute("DROP TABLE transactions")
+        conn.execute("ALTER TABLE transactions_minor RENAME TO transactions")
+        conn.execute(LEDGER_INDEX_SQL)
+        conn.execute("DROP TABLE IF EXISTS balances")
+        ensure_balances(conn, scale)
+        if _has_table(conn, "rollup_state"):
+            drop_rollups(conn)
+            ensure_rollups(conn, scale)
+        if _has_table(conn, "merkle_nodes"):
+            save_frontier(conn, build_frontier(conn, persist=True))
+        _set_scale(conn, scale)
+        conn.commit()
+    except Exception:
+        conn.rollback()
+        raise
+    new_root = read_root(conn)["root"] if _has_table(conn, "merkle_state") else None
+    return {"rows": copied, "rounded": rounded, "scale": scale, "old_root": old_root, "new_root": new_root}
+
+def _has_table(conn: sqlite3.Connection, name: str) -> bool:
+    return conn.execute(
+        "SELECT 1 FROM sqlite_master WHERE type = 'table' AND name = ?", (name,)
+    ).fetchone() is not None
+
+# --- 4. CHUNKED MIGRATION (TEXT -> INTEGER MICROSECONDS) ---
+def migrate_timestamps(
+    conn: sqlite3.Connection,
+    chunk: int = MIGRATION_CHUNK,
+    finalize: bool = False,
+    progress: Optional[Callable[[int], None]] = None,
+) -> Dict[str, Any]:
+    """
+    Converts a TEXT-timestamp vault to INTEGER microseconds since the epoch.
+
+    The copy is safe against a live node: rows are copied in id order into
+    `transactions_us`, one short transaction per `chunk` rows, so the writer
+    waits at most one chunk and a re-run only copies what committed since.
+    With `finalize` (node stopped), the tail is copied and one short
+    transaction swaps the tables and rebuilds `idx_tx_user_ts_id` on the
+    integer column. Leaves hash the canonical text (merkle.py), so the root is
+    recomputed from the new table and must match before anything commits.
+    """
+    if ensure_ts_unit(conn) != TEXT:
+        raise ValueError("VAULT_ALREADY_INTEGER_TIMESTAMPS")
+    if _has_table(conn, "segments") and conn.execute("SELECT 1 FROM segments").fetchone():
+        raise ValueError("VAULT_HAS_SEGMENTS")  # Sealed files are immutable; convert before sealing
+    scale = ensure_scale(conn)
+    conn.commit()
+
+    conn.execute(LEDGER_DDL.format(table="transactions_us", money=money_type(scale), ts=ts_type(MICROS)))
+    conn.commit()
+    copied = _copy_micros(conn, chunk, progress)
+    if not finalize:
+        pending = conn.execute(
+            "SELECT COUNT(*) FROM transactions WHERE id > (SELECT COALESCE(MAX(id), 0) FROM transactions_us)"
+        ).fetchone()[0]
+        return {"rows": copied, "pending": pending, "finalized": False}
+
+    old_root = read_root(conn)["root"] if _has_table(conn, "merkle_state") else None
+    conn.execute("BEGIN IMMEDIATE")
+    try:
+        copied += _copy_micros(conn, chunk, progress, commit=False)
+        conn.execute("DROP TABLE transactions")
+        conn.execute("ALTER TABLE transactions_us RENAME TO transactions")
+        conn.execute(LEDGER_INDEX_SQL)
+        if old_root is not None and build_frontier(conn).root() != old_root:
+            raise ValueError("MIGRATION_ROOT_MISMATCH")
+        set_ts_unit(conn, MICROS)
+        conn.commit()
+    except Exception:
+        conn.rollback()
+        raise
+    return {"rows": copied, "pending": 0, "finalized": True, "root": old_root}
+
+def _copy_micros(
+    conn: sqlite3.Connection, chunk: int, progress: Optional[Callable[[int], None]], commit: bool = True
+) -> int:
+    """Copies rows above the target's max id, converting timestamps; one transaction per chunk with `commit`."""
+    copied = 0
+    while True:
+        last_id = conn.execute("SELECT COALESCE(MAX(id), 0) FROM transactions_us").fetchone()[0]
+        rows = conn.execute(
+            "SELECT id, user_id, amount, creator_share, user_pool_share, network_fee, timestamp "
+            "FROM transactions WHERE id > ? ORDER BY id LIMIT ?",
+            (last_id, chunk),
+        ).fetchall()
+        if not rows:
+            return copied
+        converted = [(*row[:6], to_stored(row[6], MICROS)) for row in rows]
+        conn.executemany("INSERT INTO transactions_us VALUES (?, ?, ?, ?, ?, ?, ?)", converted)
+        if commit:
+            conn.commit()
+        copied += len(converted)
+        if progress:
+            progress(copied)
@@ -0,0 +1,483 @@
+# Copyright 2026 Coreframe Systems (Nexus Protocol)
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#        http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+
+"""
+🏛️ NEXUS VAULT MODULE (Phase 1.4.x)
+
+Connection Pool & Single-Writer Ingest Stage for the Sovereign Vault.
+
+All vault connections are long-lived and created once in `lifespan`: a bounded
+pool of read-only reader connections plus exactly one writer connection. Every
+pooled connection receives the same hardening PRAGMAs and keeps its own
+prepared-statement cache, so hot queries are parsed once per connection
+instead of once per request.
+
+No vault call ever runs on the event loop. Reads are dispatched to a reader
+executor with one thread per pooled connection, so page reads and summaries
+run in parallel, while writes are serialized through the single writer thread.
+A slow commit therefore never stalls preflights, static assets or reads.
+
+Per-user totals are materialized in `balances`, maintained by the writer in
+the same transaction as the ledger rows they summarize, so a vault summary is
+a single primary-key lookup regardless of how many splits a user has. The
+ledger-wide Merkle frontier (see merkle.py) and the hour/day rollups (see
+rollups.py) are advanced in that same transaction, so the global root and
+the analytics totals always cover exactly the committed rows.
+
+SQLite admits exactly one writer per database file. Instead of letting every
+request open its own connection, fight for the WAL write lock and pay its own
+fsync, committed splits are funneled through one queue. A dedicated writer
+drains the queue and commits up to `WRITE_BATCH_SIZE` rows per transaction
+(or whatever arrived within `WRITE_LINGER_MS`), so N concurrent splits cost
+one fsync instead of N. Each caller is released only after its batch commits.
+If a batch fails, its entries are retried one transaction each, so one bad
+submission never fails the unrelated callers it was grouped with.
+"""
+
+import os
+import time
+import queue
+import asyncio
+import logging
+import sqlite3
+import threading
+from contextlib import contextmanager
+from concurrent.futures import ThreadPoolExecutor
+from typing import Optional, List, Tuple, Dict, Any, Iterator, Callable, TypeVar
+
+from backend.merkle import MerkleFrontier, hash_leaf, load_frontier, save_frontier, save_nodes
+from backend.rollups import accumulate as accumulate_rollup, apply_deltas as apply_rollups
+from backend.metrics import DB_SECONDS, MERKLE_SECONDS
+from backend import diagnostics
+
+T = TypeVar("T")
+_logger = logging.getLogger("nexus.vault")
+
+# --- 1. TUNABLES (Environment Overridable) ---
+WRITE_BATCH_SIZE = max(1, int(os.getenv("NEXUS_WRITE_BATCH_SIZE", "256")))
+WRITE_LINGER_MS = max(0.0, float(os.getenv("NEXUS_WRITE_LINGER_MS", "2")))
+READER_POOL_SIZE = max(1, int(os.getenv("NEXUS_READER_POOL_SIZE", "4")))
+POOL_TIMEOUT_S = float(os.getenv("NEXUS_POOL_TIMEOUT_S", "10"))
+# Sized for the hot set (summary, page, page+cursor, insert) with ample headroom
+STATEMENT_CACHE_SIZE = max(16, int(os.getenv("NEXUS_STATEMENT_CACHE_SIZE", "64")))
+MMAP_SIZE = int(os.getenv("NEXUS_MMAP_SIZE", str(256 * 1024 * 1024)))  # 256MB
+CACHE_SIZE_KIB = int(os.getenv("NEXUS_CACHE_SIZE_KIB", "16384"))        # 16MB per connection
+
+INSERT_TX_SQL = (
+    "INSERT INTO transactions (user_id, amount, creator_share, user_pool_share, network_fee, timestamp) "
+    "VALUES (?, ?, ?, ?, ?, ?)"
+)
+
+# (user_id, amount, creator_share, user_pool_share, network_fee, timestamp)
+# Money fields are floats, or ints in minor-unit vaults (see units.py)
+LedgerRow = Tuple[str, float, float, float, float, str]
+
+
+BALANCE_UPSERT_SQL = (
+    "INSERT INTO balances (user_id, creator_total, pool_total, fee_total, tx_count) VALUES (?, ?, ?, ?, ?) "
+    "ON CONFLICT(user_id) DO UPDATE SET "
+    "creator_total = creator_total + excluded.creator_total, "
+    "pool_total = pool_total + excluded.pool_total, "
+    "fee_total = fee_total + excluded.fee_total, "
+    "tx_count = tx_count + excluded.tx_count"
+)
+
+# Totals are compared at cent precision: float sums differ in the last ulp by summation order
+# (integer minor-unit vaults sum exactly, so any difference there is >= 1 and reported)
+BALANCE_TOLERANCE = 0.005
+
+
+class VaultUnavailable(RuntimeError):
+    """Raised when the vault cannot serve a request (offline or pool exhausted)."""
+
+
+# --- 2. MATERIALIZED BALANCES ---
+def ensure_balances(conn: sqlite3.Connection, scale: int = 0) -> bool:
+    """
+    Creates the `balances` table (INTEGER totals for minor-unit vaults, see
+    units.py); backfills it from the ledger when it is new.
+    Returns True if a backfill ran. The caller owns the transaction.
+    """
+    money = "INTEGER" if scale else "REAL"
+    exists = conn.execute(
+        "SELECT 1 FROM sqlite_master WHERE type = 'table' AND name = 'balances'"
+    ).fetchone()
+    conn.execute(f"""
+        CREATE TABLE IF NOT EXISTS balances (
+            user_id TEXT PRIMARY KEY,
+            creator_total {money} NOT NULL DEFAULT 0,
+            pool_total {money} NOT NULL DEFAULT 0,
+            fee_total {money} NOT NULL DEFAULT 0,
+            tx_count INTEGER NOT NULL DEFAULT 0
+        ) WITHOUT ROWID
+    """)
+    if exists:
+        return False
+    rebuild_balances(conn)
+    return True
+
+def rebuild_balances(conn: sqlite3.Connection) -> int:
+    """Recomputes every materialized balance from the raw ledger. Returns the user count."""
+    conn.execute("DELETE FROM balances")
+    conn.execute("""
+        INSERT INTO balances (user_id, creator_total, pool_total, fee_total, tx_count)
+        SELECT user_id, SUM(creator_share), SUM(user_pool_share), SUM(network_fee), COUNT(*)
+        FROM transactions
+        GROUP BY user_id
+    """)
+    return conn.execute("SELECT COUNT(*) FROM balances").fetchone()[0]
+
+def check_balances(conn: sqlite3.Connection) -> List[Dict[str, Any]]:
+    """
+    Compares every materialized balance against the raw ledger.
+    Returns one entry per drifted user (empty list == consistent).
+    """
+    drift = []
+    ledger = {
+        row[0]: row[1:]
+        for row in conn.execute("""
+            SELECT user_id, SUM(creator_share), SUM(user_pool_share), SUM(network_fee), COUNT(*)
+            FROM transactions
+            GROUP BY user_id
+        """)
+    }
+    stored = {
+        row[0]: row[1:]
+        for row in conn.execute("SELECT user_id, creator_total, pool_total, fee_total, tx_count FROM balances")
+    }
+    for user_id in sorted(ledger.keys() | stored.keys()):
+        expected = ledger.get(user_id, (0.0, 0.0, 0.0, 0))
+        actual = stored.get(user_id, (0.0, 0.0, 0.0, 0))
+        totals_match = all(abs(e - a) <= BALANCE_TOLERANCE for e, a in zip(expected[:3], actual[:3]))
+        if not totals_match or expected[3] != actual[3]:
+            drift.append({"user_id": user_id, "ledger": tuple(expected), "balances": tuple(actual)})
+    return drift
+
+
+# --- 3. CONNECTION POOL ---
+def open_connection(db_path: str, readonly: bool = False) -> sqlite3.Connection:
+    """
+    Opens a long-lived vault connection with the node-wide hardening PRAGMAs.
+    Connections may be handed between threads, but only one thread uses a
+    connection at a time (enforced by the pool checkout).
+    """
+    start = time.perf_counter()
+    conn = sqlite3.connect(
+        db_path,
+        timeout=10.0,
+        check_same_thread=False,
+        cached_statements=STATEMENT_CACHE_SIZE,
+        uri=True,  # Lets readers ATTACH sealed segments as read-only/immutable URIs
+    )
+    conn.row_factory = sqlite3.Row
+    conn.execute("PRAGMA synchronous=NORMAL;")
+    conn.execute("PRAGMA foreign_keys=ON;")
+    conn.execute(f"PRAGMA mmap_size={MMAP_SIZE};")
+    conn.execute(f"PRAGMA cache_size=-{CACHE_SIZE_KIB};")
+    conn.execute("PRAGMA temp_store=MEMORY;")
+    if readonly:
+        conn.execute("PRAGMA query_only=ON;")  # Readers can never mutate the ledger
+    if diagnostics.slow_log is not None:
+        diagnostics.slow_log.attach(conn)  # Opt-in: NEXUS_DIAGNOSTICS (see diagnostics.py)
+    DB_SECONDS.labels("connect").observe(time.perf_counter() - start)
+    return conn
+
+
+class VaultPool:
+    """
+    Bounded pool of reader connections plus one dedicated writer connection.
+    Tracks checkout counts and wait times so the pool can be sized from data.
+    `read()` runs a query function on the reader executor, off the event loop.
+    """
+
+    def __init__(self, size: int = READER_POOL_SIZE, timeout: float = POOL_TIMEOUT_S):
+        self.size = size
+        self.timeout = timeout
+        self.db_path: Optional[str] = None
+        self.writer: Optional[sqlite3.Connection] = None
+        self._idle: "queue.LifoQueue[sqlite3.Connection]" = queue.LifoQueue()
+        self._readers: List[sqlite3.Connection] = []
+        self._executor: Optional[ThreadPoolExecutor] = None
+        self._lock = threading.Lock()
+        self._reset_stats()
+
+    def _reset_stats(self) -> None:
+        self._checkouts = 0
+        self._waits = 0          # Checkouts that found no idle connection
+        self._timeouts = 0
+        self._wait_total = 0.0
+        self._wait_max = 0.0
+
+    @property
+    def is_open(self) -> bool:
+        return self.writer is not None
+
+    def open(self, db_path: str) -> None:
+        self.db_path = db_path
+        self.writer = open_connection(db_path)
+        for _ in range(self.size):
+            conn = open_connection(db_path, readonly=True)
+            self._readers.append(conn)
+            self._idle.put(conn)
+        # One thread per reader: a read never queues behind a thread without a connection
+        self._executor = ThreadPoolExecutor(max_workers=self.size, thread_name_prefix="nexus-vault-reader")
+        self._reset_stats()
+
+    def close(self) -> None:
+        if self._executor is not None:
+            self._executor.shutdown(wait=True)
+            self._executor = None
+        for conn in self._readers:
+            conn.close()
+        if self.writer is not None:
+            self.writer.close()
+        self._readers, self.writer = [], None
+        self._idle = queue.LifoQueue()
+
+    @contextmanager
+    def reader(self) -> Iterator[sqlite3.Connection]:
+        """Checks out a read-only connection, blocking up to `timeout` if all are busy."""
+        if not self.is_open:
+            raise VaultUnavailable("VAULT_OFFLINE")
+        start = time.perf_counter()
+        try:
+            conn = self._idle.get_nowait()
+        except queue.Empty:
+            try:
+                conn = self._idle.get(timeout=self.timeout)
+            except queue.Empty:
+                with self._lock:
+                    self._timeouts += 1
+                raise VaultUnavailable("VAULT_POOL_EXHAUSTED")
+        waited = time.perf_counter() - start
+        DB_SECONDS.labels("checkout").observe(waited)
+        with self._lock:
+            self._checkouts += 1
+            if waited > 1e-6:
+                self._waits += 1
+                self._wait_total += waited
+                self._wait_max = max(self._wait_max, waited)
+        try:
+            yield conn
+        finally:
+            if conn.in_transaction:
+                conn.rollback()
+            if diagnostics.slow_log is not None:
+                diagnostics.slow_log.flush(conn)
+            self._idle.put(conn)
+
+    def _run_read(self, fn: Callable[..., T], args: Tuple[Any, ...]) -> T:
+        with self.reader() as conn:
+            start = time.perf_counter()
+            try:
+                return fn(conn, *args)
+            finally:
+                DB_SECONDS.labels("query").observe(time.perf_counter() - start)
+
+    async def read(self, fn: Callable[..., T], *args: Any) -> T:
+        """Runs `fn(conn, *args)` with a pooled reader on the reader executor."""
+        if self._executor is None:
+            raise VaultUnavailable("VAULT_OFFLINE")
+        loop = asyncio.get_running_loop()
+        return await loop.run_in_executor(self._executor, self._run_read, fn, args)
+
+    def stats(self) -> Dict[str, Any]:
+        with self._lock:
+            return {
+                "readers": self.size,
+                "idle": self._idle.qsize(),
+                "checkouts": self._checkouts,
+                "waits": self._waits,
+                "timeouts": self._timeouts,
+                "wait_total_ms": round(self._wait_total * 1000, 3),
+                "wait_max_ms": round(self._wait_max * 1000, 3),
+                "statement_cache": STATEMENT_CACHE_SIZE,
+            }
+
+
+# --- 4. GROUP-COMMIT WRITER ---
+
+class VaultWriter:
+    """
+    Group-Commit Writer.
+    Drives the pool's only write connection and batches queued rows
+    into a single transaction on a dedicated thread.
+    """
+
+    def __init__(self, batch_size: int = WRITE_BATCH_SIZE, linger_ms: float = WRITE_LINGER_MS):
+        self.batch_size = batch_size
+        self.linger = linger_ms / 1000.0
+        self._queue: Optional[asyncio.Queue] = None
+        self._task: Optional[asyncio.Task] = None
+        self._conn: Optional[sqlite3.Connection] = None
+        self._executor: Optional[ThreadPoolExecutor] = None
+        self._closing = False
+        self._listeners: List[Callable[[List[LedgerRow]], None]] = []
+        self.merkle: Optional[MerkleFrontier] = None
+
+    def add_commit_listener(self, listener: Callable[[List[LedgerRow]], None]) -> None:
+        """Registers a callback run on the event loop after each batch commits, before callers resume."""
+        self._listeners.append(listener)
+
+    @property
+    def running(self) -> bool:
+        return self._task is not None and not self._task.done() and not self._closing
+
+    async def start(self, pool: VaultPool) -> None:
+        """Binds the pool's writer connection to the writer thread and arms the drain loop."""
+        self._executor = ThreadPoolExecutor(max_workers=1, thread_name_prefix="nexus-vault-writer")
+        self._conn = pool.writer
+        self.merkle = load_frontier(self._conn)
+        self._queue = asyncio.Queue()
+        self._closing = False
+        self._task = asyncio.create_task(self._drain())
+
+    async def stop(self) -> None:
+        """Flushes every queued row, then parks the writer thread (the pool owns the connection)."""
+        if self._task is None:
+            return
+        self._closing = True
+        await self._queue.put(None)  # Sentinel: drain what is queued, then exit
+        await self._task
+        self._executor.shutdown(wait=True)
+        self._task = self._conn = self._executor = self._queue = None
+
+    async def submit(self, row: LedgerRow) -> int:
+        """Enqueues a ledger row and resolves with its row id once its batch is durable."""
+        return (await self.submit_many([row]))[0]
+
+    async def submit_many(self, rows: List[LedgerRow]) -> List[int]:
+        """
+        Enqueues rows as one indivisible unit: they always land in the same
+        transaction (never split across batches). Resolves with their row ids.
+        """
+        if not self.running:
+            raise VaultUnavailable("VAULT_WRITER_OFFLINE")
+        future = asyncio.get_running_loop().create_future()
+        self._queue.put_nowait((rows, future))
+        return await future
+
+    # --- Writer Internals ---
+    def _commit_batch(self, rows: List[LedgerRow]) -> List[int]:
+        """Runs on the writer thread: one transaction, one fsync, for the whole batch."""
+        conn = self._conn
+        deltas: Dict[str, List[Any]] = {}
+        buckets: Dict[Tuple[str, str], List[Any]] = {}
+        merkle = self.merkle.copy()  # Only adopted if the transaction commits
+        nodes: List[Tuple[int, int, str]] = []
+        start = time.perf_counter()
+        with conn:  # Commits on success, rolls the whole batch back on failure
+            before = conn.total_changes
+            conn.executemany(INSERT_TX_SQL, rows)
+            if conn.total_changes - before != len(rows):
+                raise sqlite3.IntegrityError("VAULT_PARTIAL_INSERT")
+            # Sole writer + AUTOINCREMENT: the batch occupies a contiguous id block
+            last_id = conn.execute("SELECT last_insert_rowid()").fetchone()[0]
+            ids = list(range(last_id - len(rows) + 1, last_id + 1))
+            hashing = time.perf_counter()
+            leaves = [hash_leaf(row[1:]) for row in rows]
+            MERKLE_SECONDS.labels("leaf").observe(time.perf_counter() - hashing)
+            for row, row_id, leaf in zip(rows, ids, leaves):
+                nodes.extend(merkle.append(leaf, row_id))
+                delta = deltas.setdefault(row[0], [0.0, 0.0, 0.0, 0])
+                delta[0] += row[2]
+                delta[1] += row[3]
+                delta[2] += row[4]
+                delta[3] += 1
+                accumulate_rollup(buckets, *row)
+            # One upsert per user per batch keeps `balances` in lockstep with the ledger
+            conn.executemany(BALANCE_UPSERT_SQL, [(uid, *d) for uid, d in deltas.items()])
+            # Likewise one upsert per (user, bucket) for the hour/day rollups (see rollups.py)
+            apply_rollups(conn, buckets, last_id)
+            save_nodes(conn, nodes, [(row_id, pos) for pos, row_id in enumerate(ids, start=self.merkle.size)])
+            save_frontier(conn, merkle)
+        # Whole transaction: inserts, balances, rollups, Merkle nodes and the commit fsync
+        DB_SECONDS.labels("commit").observe(time.perf_counter() - start)
+        if diagnostics.slow_log is not None:
+            diagnostics.slow_log.flush(conn)
+        self.merkle = merkle
+        return ids
+
+    async def _collect(self, first: Any) -> Tuple[List[Any], bool]:
+        """Gathers entries up to `batch_size` rows, waiting at most `linger` for stragglers."""
+        loop = asyncio.get_running_loop()
+        batch, stop = [first], False
+        rows = len(first[0])
+        deadline = loop.time() + self.linger
+        while rows < self.batch_size:
+            try:
+                item = self._queue.get_nowait()
+            except asyncio.QueueEmpty:
+                remaining = deadline - loop.time()
+                if remaining <= 0:
+                    break
+                try:
+                    item = await asyncio.wait_for(self._queue.get(), remaining)
+                except asyncio.TimeoutError:
+                    break
+            if item is None:
+                stop = True
+                break
+            batch.append(item)
+            rows += len(item[0])
+        return batch, stop
+
+    def _notify(self, rows: List[LedgerRow]) -> None:
+        for listener in self._listeners:
+            try:
+                listener(rows)
+            except Exception as e:
+                _logger.error(f"🔥 VAULT_COMMIT_LISTENER_FAILED: {e}")
+
+    async def _drain(self) -> None:
+        loop = asyncio.get_running_loop()
+        stop = False
+        while not stop:
+            first = await self._queue.get()
+            if first is None:
+                break
+            batch, stop = await self._collect(first)
+            rows = [row for entry_rows, _ in batch for row in entry_rows]
+            try:
+                ids = await loop.run_in_executor(self._executor, self._commit_batch, rows)
+            except Exception as e:
+                if len(batch) == 1:
+                    if not batch[0][1].done():
+                        batch[0][1].set_exception(e)
+                else:
+                    await self._commit_alone(batch)
+                continue
+            self._notify(rows)
+            offset = 0
+            for entry_rows, future in batch:
+                if not future.done():
+                    future.set_result(ids[offset:offset + len(entry_rows)])
+                offset += len(entry_rows)
+
+    async def _commit_alone(self, batch: List[Any]) -> None:
+        """
+        The group transaction rolled back: replays each entry in its own
+        transaction so only the offending submitter sees the error.
+        """
+        loop = asyncio.get_running_loop()
+        for entry_rows, future in batch:
+            try:
+                ids = await loop.run_in_executor(self._executor, self._commit_batch, entry_rows)
+            except Exception as e:
+                if not future.done():
+                    future.set_exception(e)
+                continue
+            self._notify(entry_rows)
+            if not future.done():
+                future.set_result(ids)
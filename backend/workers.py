@@ -0,0 +1,495 @@
+# Copyright 2026 Coreframe Systems (Nexus Protocol)
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#        http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+
+"""
+🏛️ NEXUS MULTI-PROCESS WORKERS (Phase 1.4.x)
+
+One uvicorn process is one interpreter: reads, Merkle page roots and JSON
+encoding all share one GIL however many cores the host has. With
+`NEXUS_WORKERS=N` (N > 1, uvicorn `--workers N`) the node runs N processes
+over the same vault files. SQLite still admits one writer per file, so the
+processes take two roles:
+
+WRITER (exactly one):
+Elected through an exclusive `flock` on `<vault>.writer.lock`, held for the
+life of the process. It alone runs the schema bootstrap (`init_vault`), the
+group-commit writers, scheduled snapshots and the final WAL checkpoint, and
+serves writes for everyone else on a Unix socket (`<vault>.writer.sock`).
+
+FOLLOWERS (the rest):
+Serve reads from their own reader pools. Splits are forwarded to the writer
+(one JSON line per request, answered by id, so many are in flight on one
+connection) and land in the same group-commit batches as the writer's own.
+
+STARTUP:
+Workers boot one at a time under `<vault>.init.lock`; the first one in wins
+the election and builds the schema, later ones only read the recorded units.
+DDL therefore runs once, before any follower opens the files.
+
+CACHE INVALIDATION:
+`<vault>.version` is an 8-byte counter mapped into every worker (mmap). The
+writer bumps it after each commit, before callers resume; a follower's
+summary cache compares it on every lookup and drops everything when it moved
+(see cache.py). One memory read per lookup, no syscalls.
+
+FAILOVER:
+If the writer is gone (socket refused), the next follower that needs to write
+takes the free election lock and becomes the writer; the merkle frontier is
+reloaded from the vault. A request whose connection drops *after* it was sent
+fails with `VAULT_WRITER_LOST` (503): it may or may not have committed.
+
+POSIX only (`fcntl`). Metrics, node stats and the static manifest stay per
+process; scrape each worker or read them as a sample.
+"""
+
+import os
+import json
+import mmap
+import struct
+import asyncio
+import hashlib
+import itertools
+import sqlite3
+import tempfile
+from contextlib import contextmanager
+from typing import Optional, Dict, Any, Callable, Awaitable, Iterator, List, Set
+
+from backend.vault import VaultUnavailable
+
+try:
+    import fcntl
+except ImportError:  # Windows: single-process mode only
+    fcntl = None
+
+# --- 1. TUNABLES (Environment Overridable) ---
+# uvicorn reads WEB_CONCURRENCY as its own --workers default
+WORKERS = max(1, int(os.getenv("NEXUS_WORKERS", os.getenv("WEB_CONCURRENCY", "1"))))
+MULTIPROCESS = WORKERS > 1
+WRITER_SOCKET = os.getenv("NEXUS_WRITER_SOCKET", "")  # Default: next to the vault
+IPC_TIMEOUT_S = max(0.1, float(os.getenv("NEXUS_IPC_TIMEOUT_S", "30")))
+IPC_MAX_MESSAGE = 16 * 1024 * 1024  # A full MAX_BATCH_ITEMS batch is well under 1 MiB
+SOCKET_PATH_MAX = 100  # sun_path is 104-108 bytes depending on the platform
+
+SINGLE, WRITER, FOLLOWER = "single", "writer", "follower"
+
+_COUNTER = struct.Struct("<Q")
+
+
+class WriterUnreachable(VaultUnavailable):
+    """No writer accepted the request: nothing was sent, so it is safe to retry elsewhere."""
+
+
+# --- 2. RUN FILES & LOCKS ---
+def run_files(db_path: str) -> Dict[str, str]:
+    """Per-vault coordination files (runtime only; never part of a backup)."""
+    socket_path = WRITER_SOCKET or f"{db_path}.writer.sock"
+    if len(socket_path) > SOCKET_PATH_MAX:
+        digest = hashlib.sha256(os.path.abspath(db_path).encode()).hexdigest()[:16]
+        socket_path = os.path.join(tempfile.gettempdir(), f"nexus_{digest}.sock")
+    return {
+        "init_lock": f"{db_path}.init.lock",
+        "writer_lock": f"{db_path}.writer.lock",
+        "socket": socket_path,
+        "version": f"{db_path}.version",
+        "cursor_key": f"{db_path}.cursor_key",
+    }
+
+def _require_fcntl() -> None:
+    if fcntl is None:
+        raise RuntimeError("MULTIPROCESS_UNSUPPORTED: NEXUS_WORKERS > 1 needs POSIX file locks")
+
+@contextmanager
+def file_lock(path: str) -> Iterator[None]:
+    """Blocking exclusive lock, released on exit (or when the process dies)."""
+    _require_fcntl()
+    fd = os.open(path, os.O_RDWR | os.O_CREAT, 0o600)
+    try:
+        fcntl.flock(fd, fcntl.LOCK_EX)
+        yield
+    finally:
+        os.close(fd)  # Closing the descriptor drops the lock
+
+class Election:
+    """Non-blocking exclusive `flock`: whoever holds it is the writer until it exits."""
+
+    def __init__(self, path: str):
+        self.path = path
+        self._fd: Optional[int] = None
+
+    @property
+    def held(self) -> bool:
+        return self._fd is not None
+
+    def try_acquire(self) -> bool:
+        if self._fd is not None:
+            return True
+        _require_fcntl()
+        fd = os.open(self.path, os.O_RDWR | os.O_CREAT, 0o600)
+        try:
+            fcntl.flock(fd, fcntl.LOCK_EX | fcntl.LOCK_NB)
+        except OSError:
+            os.close(fd)
+            return False
+        os.ftruncate(fd, 0)
+        os.write(fd, f"{os.getpid()}\n".encode())  # Diagnostics only: who is the writer
+        self._fd = fd
+        return True
+
+    def release(self) -> None:
+        if self._fd is not None:
+            os.close(self._fd)
+            self._fd = None
+
+# --- 3. SHARED LEDGER VERSION ---
+class LedgerVersion:
+    """
+    Commit counter shared by every worker through one mmap'd 8-byte file.
+    Only the writer stores; a torn read can only look like a change, which
+    costs a spurious cache flush, never a stale hit.
+    """
+
+    def __init__(self):
+        self._map: Optional[mmap.mmap] = None
+
+    def open(self, path: str) -> None:
+        fd = os.open(path, os.O_RDWR | os.O_CREAT, 0o600)
+        try:
+            if os.fstat(fd).st_size < _COUNTER.size:
+                os.ftruncate(fd, _COUNTER.size)
+            self._map = mmap.mmap(fd, _COUNTER.size)
+        finally:
+            os.close(fd)  # The mapping keeps the file referenced
+
+    def read(self) -> int:
+        return _COUNTER.unpack_from(self._map)[0] if self._map is not None else 0
+
+    def bump(self) -> int:
+        value = self.read() + 1
+        if self._map is not None:
+            _COUNTER.pack_into(self._map, 0, value)
+        return value
+
+    def close(self) -> None:
+        if self._map is not None:
+            self._map.close()
+            self._map = None
+
+# --- 4. WRITER IPC (newline-delimited JSON over a Unix socket) ---
+Handler = Callable[[Dict[str, Any]], Awaitable[Any]]
+
+# Exception types re-raised in the follower; anything else surfaces as a 503
+_REMOTE_ERRORS = {
+    "VaultUnavailable": VaultUnavailable,
+    "WriterUnreachable": WriterUnreachable,
+    "RuntimeError": RuntimeError,
+    "ValueError": ValueError,
+    "IntegrityError": sqlite3.IntegrityError,
+}
+
+def _frame(message: Dict[str, Any]) -> bytes:
+    return json.dumps(message, separators=(",", ":")).encode() + b"\n"
+
+class WriterServer:
+    """The elected writer's end: runs one handler task per request and answers by id."""
+
+    def __init__(self, handlers: Dict[str, Handler]):
+        self.handlers = handlers
+        self.requests = 0
+        self._server: Optional[asyncio.AbstractServer] = None
+        self._connections: Set[asyncio.StreamWriter] = set()
+        self._tasks: Set[asyncio.Task] = set()
+        self._closing = False
+
+    async def start(self, path: str) -> None:
+        if os.path.exists(path):
+            os.unlink(path)  # Left by a dead writer; we hold the election, so nobody else serves here
+        self._server = await asyncio.start_unix_server(self._serve, path=path, limit=IPC_MAX_MESSAGE)
+        os.chmod(path, 0o600)
+
+    async def stop(self) -> None:
+        """Stops accepting, answers every request already running, then hangs up."""
+        if self._server is None:
+            return
+        self._closing = True
+        self._server.close()
+        if self._tasks:
+            await asyncio.gather(*self._tasks, return_exceptions=True)
+        for writer in list(self._connections):
+            writer.close()
+        await self._server.wait_closed()
+        self._server = None
+
+    async def _serve(self, reader: asyncio.StreamReader, writer: asyncio.StreamWriter) -> None:
+        self._connections.add(writer)
+        try:
+            while True:
+                line = await reader.readline()
+                if not line:
+                    break
+                task = asyncio.create_task(self._dispatch(json.loads(line), writer))
+                self._tasks.add(task)
+                task.add_done_callback(self._tasks.discard)
+        except (ConnectionError, ValueError):
+            pass  # Peer went away, or sent a line over IPC_MAX_MESSAGE
+        finally:
+            self._connections.discard(writer)
+            writer.close()
+
+    async def _dispatch(self, message: Dict[str, Any], writer: asyncio.StreamWriter) -> None:
+        reply: Dict[str, Any] = {"id": message.get("id")}
+        try:
+            if self._closing:
+                raise WriterUnreachable("VAULT_WRITER_OFFLINE")  # Not started: the follower may fail over
+            handler = self.handlers.get(message.get("op"))
+            if handler is None:
+                raise ValueError("IPC_UNKNOWN_OP")
+            self.requests += 1
+            reply["result"] = await handler(message)
+        except Exception as e:
+            reply["error"], reply["type"] = str(e), type(e).__name__
+        if not writer.is_closing():
+            writer.write(_frame(reply))
+
+class WriterClient:
+    """A follower's end: one lazily (re)connected socket, many requests in flight."""
+
+    def __init__(self, path: str, timeout: float = IPC_TIMEOUT_S):
+        self.path = path
+        self.timeout = timeout
+        self.calls = self.failures = 0
+        self._writer: Optional[asyncio.StreamWriter] = None
+        self._receiver: Optional[asyncio.Task] = None
+        self._pending: Dict[int, asyncio.Future] = {}
+        self._ids = itertools.count(1)
+        self._connecting: Optional[asyncio.Lock] = None
+
+    @property
+    def connected(self) -> bool:
+        return self._writer is not None and not self._writer.is_closing()
+
+    async def call(self, op: str, **payload: Any) -> Any:
+        """Sends one request and returns the handler's result (or re-raises its error)."""
+        await self.connect()
+        self.calls += 1
+        request_id = next(self._ids)
+        future = asyncio.get_running_loop().create_future()
+        self._pending[request_id] = future
+        try:
+            self._writer.write(_frame(dict(payload, id=request_id, op=op)))
+            reply = await asyncio.wait_for(future, self.timeout)
+        except asyncio.TimeoutError:
+            self.failures += 1
+            raise VaultUnavailable("VAULT_WRITER_TIMEOUT")
+        except VaultUnavailable:
+            self.failures += 1
+            raise
+        finally:
+            self._pending.pop(request_id, None)
+        if "error" in reply:
+            raise _REMOTE_ERRORS.get(reply.get("type"), VaultUnavailable)(reply["error"])
+        return reply.get("result")
+
+    async def connect(self) -> None:
+        if self.connected:
+            return
+        if self._connecting is None:
+            self._connecting = asyncio.Lock()  # Created on the serving loop
+        async with self._connecting:
+            if self.connected:
+                return
+            try:
+                reader, self._writer = await asyncio.open_unix_connection(self.path, limit=IPC_MAX_MESSAGE)
+            except OSError as e:
+                self.failures += 1
+                raise WriterUnreachable("VAULT_WRITER_UNREACHABLE") from e
+            self._receiver = asyncio.create_task(self._receive(reader, self._writer))
+
+    async def _receive(self, reader: asyncio.StreamReader, writer: asyncio.StreamWriter) -> None:
+        try:
+            while True:
+                line = await reader.readline()
+                if not line:
+                    break
+                reply = json.loads(line)
+                future = self._pending.get(reply.get("id"))
+                if future is not None and not future.done():
+                    future.set_result(reply)
+        except (ConnectionError, ValueError):
+            pass
+        finally:
+            writer.close()
+            # Sent but unanswered: the writer may have committed them (ambiguous, never retried)
+            for future in self._pending.values():
+                if not future.done():
+                    future.set_exception(VaultUnavailable("VAULT_WRITER_LOST"))
+
+    async def close(self) -> None:
+        if self._receiver is not None:
+            self._receiver.cancel()
+            try:
+                await self._receiver
+            except asyncio.CancelledError:
+                pass
+            self._receiver = None
+        self._writer = None
+
+class RemoteWriter:
+    """Stands in for a shard's `VaultWriter` in followers (same `submit` contract)."""
+
+    def __init__(self, coordinator: "WorkerCoordinator", shard: int):
+        self.coordinator = coordinator
+        self.shard = shard
+
+    @property
+    def running(self) -> bool:
+        return self.coordinator.role == FOLLOWER
+
+    async def start(self, pool: Any) -> None:
+        pass
+
+    async def stop(self) -> None:
+        pass
+
+    async def submit(self, row: tuple) -> int:
+        return (await self.submit_many([row]))[0]
+
+    async def submit_many(self, rows: List[tuple]) -> List[int]:
+        return await self.coordinator.submit(self.shard, rows)
+
+# --- 5. COORDINATOR ---
+class WorkerCoordinator:
+    """
+    This process's role and its coordination state. In single-process mode
+    (the default) every method is a no-op and the role is `single`.
+    """
+
+    def __init__(self, workers: int = WORKERS):
+        self.workers = workers
+        self.role = SINGLE
+        self.files: Dict[str, str] = {}
+        self.version = LedgerVersion()
+        self.server: Optional[WriterServer] = None
+        self.client: Optional[WriterClient] = None
+        self.promotions = 0
+        self._election: Optional[Election] = None
+        self._vault: Any = None
+        self._on_promote: Optional[Callable[[], Awaitable[None]]] = None
+        self._failover: Optional[asyncio.Lock] = None
+
+    @property
+    def writes(self) -> bool:
+        """True if this process owns the vault writers (single-process or elected)."""
+        return self.role != FOLLOWER
+
+    @contextmanager
+    def startup(self, db_path: str) -> Iterator[None]:
+        """
+        Serializes worker boot under the init lock and elects the writer first,
+        so whatever runs inside (schema bootstrap) sees a settled role.
+        """
+        if self.workers <= 1:
+            self.role = SINGLE
+            yield
+            return
+        self.files = run_files(db_path)
+        with file_lock(self.files["init_lock"]):
+            self._election = Election(self.files["writer_lock"])
+            self.role = WRITER if self._election.try_acquire() else FOLLOWER
+            self.version.open(self.files["version"])
+            yield
+
+    def bind(self, vault: Any, on_promote: Callable[[], Awaitable[None]]) -> None:
+        """`vault` is the ShardedVault; `on_promote` brings up local writers after a failover."""
+        self._vault = vault
+        self._on_promote = on_promote
+        if self.role == FOLLOWER:
+            self.client = WriterClient(self.files["socket"])
+
+    def on_commit(self, rows: List[tuple]) -> None:
+        """Commit listener: tells every other worker's caches that the ledger moved."""
+        if self.role == WRITER:
+            self.version.bump()
+
+    async def serve(self, handlers: Dict[str, Handler]) -> None:
+        if self.role != WRITER:
+            return
+        self.server = WriterServer(handlers)
+        await self.server.start(self.files["socket"])
+
+    async def submit(self, shard: int, rows: List[tuple]) -> List[int]:
+        """Follower write path; fails over once if no writer is reachable."""
+        for attempt in range(2):
+            if self.role != FOLLOWER:
+                return await self._vault.writers[shard].submit_many(rows)
+            try:
+                return await self.client.call("submit", shard=shard, rows=rows)
+            except WriterUnreachable:
+                if attempt or not await self.failover():
+                    raise
+        raise VaultUnavailable("VAULT_WRITER_OFFLINE")
+
+    async def call(self, op: str, **payload: Any) -> Any:
+        return await self.client.call(op, **payload)
+
+    async def failover(self) -> bool:
+        """
+        Waits up to the IPC timeout for either a reachable writer (another
+        follower won) or the free election lock (then promotes this process).
+        """
+        if self._failover is None:
+            self._failover = asyncio.Lock()
+        async with self._failover:
+            loop = asyncio.get_running_loop()
+            deadline = loop.time() + self.client.timeout
+            while self.role == FOLLOWER:
+                if self._election.try_acquire():
+                    await self.client.close()
+                    self.role = WRITER
+                    self.promotions += 1
+                    await self._on_promote()
+                    break
+                try:
+                    await self.client.connect()
+                    return True
+                except WriterUnreachable:
+                    pass
+                if loop.time() >= deadline:
+                    return False
+                await asyncio.sleep(0.05)
+            return True
+
+    async def stop_serving(self) -> None:
+        if self.server is not None:
+            await self.server.stop()
+            self.server = None
+        if self.client is not None:
+            await self.client.close()
+
+    def close(self) -> None:
+        """Releases the election (after the writers flushed) and the shared counter."""
+        if self._election is not None:
+            self._election.release()
+            self._election = None
+        self.version.close()
+
+    def stats(self) -> Dict[str, Any]:
+        stats: Dict[str, Any] = {"role": self.role, "pid": os.getpid(), "workers": self.workers}
+        if self.role != SINGLE:
+            stats["ledger_version"] = self.version.read()
+            stats["promotions"] = self.promotions
+        if self.server is not None:
+            stats["ipc_requests_served"] = self.server.requests
+        if self.client is not None:
+            stats["ipc_calls"], stats["ipc_failures"] = self.client.calls, self.client.failures
+        return stats
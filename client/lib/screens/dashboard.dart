@@ -26,7 +26,8 @@ class _NexusDashboardState extends State<NexusDashboard> with WidgetsBindingObse
   
   // DATA STATE
   List<VaultTransaction> _transactions = [];
-  Map<String, dynamic>? _cursor;
+  String? _cursor;
+  String? _newerCursor;
   bool _hasMore = true;
   
   // UI STATE
@@ -71,7 +72,7 @@ class _NexusDashboardState extends State<NexusDashboard> with WidgetsBindingObse
   @override
   void didChangeAppLifecycleState(AppLifecycleState state) {
     if (state == AppLifecycleState.resumed) {
-      _syncSovereignState(refresh: true);
+      _syncSovereignState();
     }
   }
 
@@ -120,30 +121,35 @@ class _NexusDashboardState extends State<NexusDashboard> with WidgetsBindingObse
       _statusMessage = "SYNCING_WITH_BRAIN";
     });
 
+    var reload = false;
     try {
+      // Incremental refresh: only rows committed since the newest one shown
+      final incremental = !refresh && _newerCursor != null;
       final results = await Future.wait([
         NexusApi.fetchVaultSummary(),
-        NexusApi.fetchTransactions(cursor: null), // Reset cursor on refresh
+        NexusApi.fetchTransactions(cursor: incremental ? _newerCursor : null),
       ]);
 
       final summary = results[0] as Map<String, dynamic>;
       final page = results[1] as CursorPage;
 
       if (!mounted) return;
+      // More new rows than one page, or a stale token: reload from the top
+      reload = incremental && (page.hasMore || page.failed);
 
       setState(() {
         final freshItems = page.items
             .map((e) => VaultTransaction.fromJson(e as Map<String, dynamic>))
             .toList();
         
-        if (refresh) {
+        if (!incremental) {
           _transactions = freshItems;
-        } else {
-          _transactions.addAll(freshItems);
+          _cursor = page.nextCursor;
+          _hasMore = page.nextCursor != null;
+        } else if (!reload) {
+          _transactions.insertAll(0, freshItems);
         }
-        
-        _cursor = page.nextCursor;
-        _hasMore = page.nextCursor != null;
+        _newerCursor = page.newerCursor ?? _newerCursor;
 
         _creatorTotal = (summary['creator_total'] as num? ?? 0).toDouble();
         _poolTotal = (summary['pool_total'] as num? ?? 0).toDouble();
@@ -162,6 +168,10 @@ class _NexusDashboardState extends State<NexusDashboard> with WidgetsBindingObse
         });
       }
     }
+
+    if (reload && mounted) {
+      await _syncSovereignState(refresh: true);
+    }
   }
 
   // 💸 TRANSACTION EXECUTION
@@ -188,7 +198,7 @@ class _NexusDashboardState extends State<NexusDashboard> with WidgetsBindingObse
       
       // Artificial delay for UX feel (Sovereign confirmation)
       await Future.delayed(const Duration(milliseconds: 800));
-      await _syncSovereignState(refresh: true);
+      await _syncSovereignState();
     } catch (e) {
       if (mounted) {
         // Extract cleaner error message if possible
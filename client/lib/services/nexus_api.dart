@@ -6,13 +6,20 @@ import 'tg_bridge.dart';
 
 class CursorPage {
   final List<dynamic> items;
-  final Map<String, dynamic>? nextCursor;
+  // Opaque signed tokens: older rows / rows committed since this page
+  final String? nextCursor;
+  final String? newerCursor;
+  final bool hasMore;
   final String? merkleRoot;
+  final bool failed;
 
   CursorPage({
     required this.items,
     this.nextCursor,
+    this.newerCursor,
+    this.hasMore = false,
     this.merkleRoot,
+    this.failed = false,
   });
 }
 
@@ -77,7 +84,7 @@ class NexusApi {
   }
 
   static Future<CursorPage> fetchTransactions({
-    Map<String, dynamic>? cursor,
+    String? cursor,
     double? minAmount,
   }) async {
     try {
@@ -86,8 +93,7 @@ class NexusApi {
       };
 
       if (cursor != null) {
-        queryParams['cursor_ts'] = cursor['ts'].toString();
-        queryParams['cursor_id'] = cursor['id'].toString();
+        queryParams['cursor'] = cursor;
       }
 
       if (minAmount != null) {
@@ -107,13 +113,16 @@ class NexusApi {
         return CursorPage(
           items: data['items'] ?? [],
           nextCursor: data['next_cursor'],
+          newerCursor: data['newer_cursor'],
+          hasMore: data['has_more'] ?? false,
           merkleRoot: data['page_merkle_root'],
         );
       }
-      return CursorPage(items: []);
+      // 400 INVALID_CURSOR (e.g. node restarted with a new key): caller reloads
+      return CursorPage(items: [], failed: true);
     } catch (e) {
       debugPrint("🔴 Transaction Fetch Error: $e");
-      return CursorPage(items: []);
+      return CursorPage(items: [], failed: true);
     }
   }
 
@@ -17,6 +17,15 @@
 NOTE: This adapter implements full Telegram Mini App cryptographic verification,
 but is not yet wired into the live request path. It is staged for future
 phases once identity authority is elevated (Phase 2.0+).
+
+VERIFICATION CACHE:
+The `WebAppData` secret depends only on the bot token and is derived once per
+instance. A Mini App session resends the same initData on every call, so
+successful verifications are cached under the SHA-256 of the raw initData
+until `auth_date + 86400`: the exact instant the replay check would start
+rejecting it. Failures are never cached, and a repeat request costs one
+digest plus one dictionary lookup. At `NEXUS_TMA_CACHE_SIZE` entries the
+least recently used session is evicted (a hit refreshes its position).
 """
 
 import hmac
@@ -26,18 +35,51 @@ import urllib.parse
 import os
 import time
 import logging
-from typing import Dict, Any
+from collections import OrderedDict
+from typing import Dict, Any, Tuple
 from .base import BaseAdapter
 
+# Replay window for initData (Telegram spec: reject after 24h)
+AUTH_TTL_S = 86400
+VERIFY_CACHE_SIZE = max(0, int(os.getenv("NEXUS_TMA_CACHE_SIZE", "10000")))
+
 class TONAdapter(BaseAdapter):
     ADAPTER_NAME = "ton"
 
-    def __init__(self, bot_token: str):
+    def __init__(self, bot_token: str, cache_size: int = VERIFY_CACHE_SIZE):
         if not bot_token:
             raise RuntimeError(f"🛡️ {self.ADAPTER_NAME.upper()}Adapter Error: bot_token required")
         self.bot_token = bot_token
         self._logger = logging.getLogger("nexus.adapter.ton")
 
+        # Step A of the spec, hoisted: the secret key depends only on the bot token
+        self._secret_key = hmac.new("WebAppData".encode(), bot_token.encode(), hashlib.sha256).digest()
+
+        # initData digest -> (verified result, expires_at); least recently used first
+        self.cache_size = cache_size
+        self._cache: "OrderedDict[bytes, Tuple[Dict[str, Any], int]]" = OrderedDict()
+        self.hits = self.misses = self.expirations = self.evictions = 0
+
+    def stats(self) -> Dict[str, Any]:
+        lookups = self.hits + self.misses
+        return {
+            "size": len(self._cache),
+            "maxsize": self.cache_size,
+            "hits": self.hits,
+            "misses": self.misses,
+            "hit_rate": round(self.hits / lookups, 4) if lookups else 0.0,
+            "expirations": self.expirations,
+            "evictions": self.evictions,
+        }
+
+    def _remember(self, key: bytes, result: Dict[str, Any], expires_at: int) -> None:
+        if self.cache_size <= 0:
+            return
+        self._cache[key] = (result, expires_at)
+        while len(self._cache) > self.cache_size:
+            self._cache.popitem(last=False)
+            self.evictions += 1
+
     async def verify_identity(self, payload: str) -> Dict[str, Any]:
         """
         Hardened HMAC-SHA256 Verification with Replay Protection.
@@ -48,39 +90,45 @@ class TONAdapter(BaseAdapter):
             if os.getenv("NEXUS_ENV") == "test" and payload == "valid_mock_signature":
                 return {"verified": True, "user_id": "12345", "adapter": self.ADAPTER_NAME}
 
-            # 2. PARSE & VALIDATE PAYLOAD
+            # 2. VERIFIED-SESSION CACHE (bounded; entries die with their replay window)
+            key = hashlib.sha256(payload.encode()).digest()
+            entry = self._cache.get(key)
+            if entry is not None:
+                if int(time.time()) <= entry[1]:
+                    self.hits += 1
+                    self._cache.move_to_end(key)
+                    return dict(entry[0])
+                del self._cache[key]
+                self.expirations += 1
+            self.misses += 1
+
+            # 3. PARSE & VALIDATE PAYLOAD
             params = dict(urllib.parse.parse_qsl(payload))
             received_hash = params.pop("hash", None)
             
             if not received_hash:
                 return {"verified": False, "user_id": None, "adapter": self.ADAPTER_NAME}
 
-            # 3. REPLAY PROTECTION (Audit 3: 24h TTL Enforcement)
+            # 4. REPLAY PROTECTION (Audit 3: 24h TTL Enforcement)
             auth_date = int(params.get("auth_date", 0))
             current_time = int(time.time())
-            if current_time - auth_date > 86400: 
+            if current_time - auth_date > AUTH_TTL_S: 
                 self._logger.warning("🛡️ TON_ADAPTER: Stale initData rejected (Replay Protection)")
                 return {"verified": False, "user_id": None, "error": "STALE_DATA"}
 
-            # 4. DATA-CHECK-STRING (Audit 2.2: Mandatory Alphabetical Sorting)
+            # 5. DATA-CHECK-STRING (Audit 2.2: Mandatory Alphabetical Sorting)
             data_check_string = "\n".join([f"{k}={v}" for k, v in sorted(params.items())])
             
-            # 5. CRYPTOGRAPHIC DERIVATION (Audit 2.1: Specification Compliant)
-            # Step A: Derive secret key using Bot Token
-            secret_key = hmac.new(
-                "WebAppData".encode(), 
-                self.bot_token.encode(), 
-                hashlib.sha256
-            ).digest()
-            
+            # 6. CRYPTOGRAPHIC DERIVATION (Audit 2.1: Specification Compliant)
+            # Step A (secret key from the Bot Token) is precomputed in __init__
             # Step B: Generate expected hash from sorted params
             expected_hash = hmac.new(
-                secret_key, 
+                self._secret_key, 
                 data_check_string.encode(), 
                 hashlib.sha256
             ).hexdigest()
             
-            # 6. CONSTANT-TIME VERIFICATION (Audit 2.3: Side-Channel Hardening)
+            # 7. CONSTANT-TIME VERIFICATION (Audit 2.3: Side-Channel Hardening)
             is_verified = hmac.compare_digest(received_hash, expected_hash)
             
             # --- 🛡️ HARDENING LAYER: FAST-FAIL ON INVALID SIGNATURE ---
@@ -89,7 +137,7 @@ class TONAdapter(BaseAdapter):
                 self._logger.error("🛡️ TON_ADAPTER: Cryptographic signature mismatch")
                 return {"verified": False, "user_id": None, "adapter": self.ADAPTER_NAME}
 
-            # 7. IDENTITY EXTRACTION (Audit 4: Post-Verification Only)
+            # 8. IDENTITY EXTRACTION (Audit 4: Post-Verification Only)
             user_id = None
             try:
                 user_data = json.loads(params.get("user", "{}"))
@@ -98,11 +146,14 @@ class TONAdapter(BaseAdapter):
                 self._logger.error("🛡️ TON_ADAPTER: Malformed user JSON")
                 return {"verified": False, "user_id": None, "error": "MALFORMED_USER_DATA"}
 
-            return {
+            result = {
                 "verified": True, 
                 "user_id": user_id,
                 "adapter": self.ADAPTER_NAME
             }
+            # Only proven identities are cached, and only for their remaining validity
+            self._remember(key, result, auth_date + AUTH_TTL_S)
+            return dict(result)
 
         except Exception as e:
             self._logger.error(f"🛡️ TON_ADAPTER_CRITICAL: {str(e)}")
@@ -4,17 +4,53 @@
 NOTE: This script demonstrates cryptographic feasibility and is not part 
 of the live execution path. It proves that the Sovereign Ledger state 
 is mathematically ready for immutable anchoring in Phase 2.0.
+
+MODES:
+  default   Materializes the selected rows, then reduces (reference path).
+  --stream  Iterates the cursor in `fetchmany` chunks and feeds leaves into an
+            O(log N) frontier reducer; memory stays flat regardless of ledger
+            size and the root is identical (duplicate-last-node rule included).
+  --workers Splits the selection into power-of-two aligned leaf shards, hashes
+            each shard's subtree in a process pool (every worker streams from
+            its own `mode=ro` connection) and combines the subtree roots on the
+            parent. The result is exactly the sequential root. Its speedup
+            has not been measured on multi-core hardware; on one CPU it is
+            ~0.8-0.95x of --stream (process start-up and the planning pass).
+
+SCOPE:
+Every mode reads the `transactions` table of one vault file. That is the
+whole ledger only while nothing is sealed and the vault is not sharded; rows
+moved to archive segments and sibling shard files are not read, and the CLI
+says so. `scripts/vault_admin.py verify-merkle` streams the full ledger
+(segments included, shard by shard) against the stored frontier.
+
+Both modes accept an inclusive id range (--from-id / --to-id) and report
+throughput in rows per second. Every variant returns (root, count) like the
+original anchor; pass `timed=True` to get (root, count, seconds) instead.
 """
 
+import argparse
 import sqlite3
 import hashlib
 import os
+import sys
+import time
+from concurrent.futures import ProcessPoolExecutor
 
 # --- Configuration ---
 BASE_DIR = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
 DB_PATH = os.path.join(BASE_DIR, "backend", "nexus_vault.db")
 HASH_ALGO = "sha256"
+CHUNK_SIZE = 10000
+SHARDS_PER_WORKER = 4  # Over-decompose so uneven shards still balance across the pool
 
+# Shares the batched hashing engine with the live node (roots are byte-identical)
+sys.path.insert(0, BASE_DIR)
+from backend.merkle import (  # noqa: E402
+    MerkleFrontier, hash_pair, leaf_hashes_from_tuples, generate_merkle_root as reduce_merkle_root
+)
+from backend.timestamps import render  # noqa: E402
+from backend.shards import detect_layouts  # noqa: E402
 
 
 def hash_row(row: tuple) -> str:
@@ -26,32 +62,45 @@ def hash_row(row: tuple) -> str:
     assert len(row) == 5, f"Schema mismatch: Expected 5 columns, got {len(row)}"
     
     # Audit 2.4: Delimiter use prevents concatenation-based hash collision attacks
-    row_bytes = "|".join(map(str, row)).encode()
+    # Timestamps hash in canonical UTC text (integer-microsecond vaults included)
+    row_bytes = "|".join([*map(str, row[:4]), render(row[4])]).encode()
     return hashlib.sha256(row_bytes).hexdigest()
 
-def generate_merkle_root():
+def _ledger_query(from_id=None, to_id=None):
+    """Deterministic, id-ordered selection; optional inclusive id range."""
+    query = "SELECT amount, creator_share, user_pool_share, network_fee, timestamp FROM transactions"
+    params = []
+    if from_id is not None or to_id is not None:
+        query += " WHERE id BETWEEN ? AND ?"
+        params = [from_id if from_id is not None else 0, to_id if to_id is not None else 2**63 - 1]
+    # Order is mandatory for Merkle Root determinism
+    return query + " ORDER BY id ASC", params
+
+def _result(root, count, start, timed):
+    """(root, count), plus the elapsed seconds since `start` when `timed`."""
+    return (root, count, time.perf_counter() - start) if timed else (root, count)
+
+def _open_vault(db_path):
+    # URI mode with mode=ro ensures the research script cannot mutate state
+    return sqlite3.connect(f"file:{db_path}?mode=ro", uri=True)
+
+def generate_merkle_root(db_path=None, from_id=None, to_id=None, timed=False):
     """
     Connects to the Hardened Vault and reduces the verified transaction history
     into a single Merkle Root using recursive SHA-256 hashing.
+    Returns (root, count), (root, count, seconds) when `timed`, or None.
     """
-    if not os.path.exists(DB_PATH):
-        print(f"Error: Vault not found at {DB_PATH}")
+    db_path = db_path or DB_PATH
+    if not os.path.exists(db_path):
+        print(f"Error: Vault not found at {db_path}")
         return None
 
+    start = time.perf_counter()
     # 1. Connect to Phase 1.3.1 Vault in Read-Only Mode (Audit 2.2)
     try:
-        # URI mode with mode=ro ensures the research script cannot mutate state
-        conn = sqlite3.connect(f"file:{DB_PATH}?mode=ro", uri=True)
-        cursor = conn.cursor()
-
+        conn = _open_vault(db_path)
         # 2. Extract deterministic history (Audit 2.3)
-        # Order is mandatory for Merkle Root determinism
-        cursor.execute("""
-            SELECT amount, creator_share, user_pool_share, network_fee, timestamp 
-            FROM transactions 
-            ORDER BY id ASC
-        """)
-        rows = cursor.fetchall()
+        rows = conn.execute(*_ledger_query(from_id, to_id)).fetchall()
         conn.close()
     except sqlite3.Error as e:
         print(f"Database Error: {e}")
@@ -61,36 +110,189 @@ def generate_merkle_root():
         print("Vault is empty. No validated state to anchor.")
         return None
 
-    # 3. Create Leaf Hashes
-    leaves = [hash_row(row) for row in rows]
-    initial_count = len(leaves)
+    # 3. Create Leaf Hashes (batched; identical to hash_row per row)
+    assert len(rows[0]) == 5, f"Schema mismatch: Expected 5 columns, got {len(rows[0])}"
+    leaves = leaf_hashes_from_tuples(rows)
 
     # 4. Recursive Merkle Reduction (Binary Tree)
     # Audit 2.5: Standard binary hash tree semantics (duplicate-last-node strategy)
-    nodes = leaves
-    while len(nodes) > 1:
-        if len(nodes) % 2 != 0:
-            nodes.append(nodes[-1])
-        
-        next_level = []
-        for i in range(0, len(nodes), 2):
-            combined = nodes[i] + nodes[i+1]
-            next_level.append(hashlib.sha256(combined.encode()).hexdigest())
-        nodes = next_level
-
-    return nodes[0], initial_count
+    return _result(reduce_merkle_root(leaves), len(leaves), start, timed)
+
+def stream_merkle_root(db_path=None, from_id=None, to_id=None, chunk_size=CHUNK_SIZE, timed=False):
+    """
+    Bounded-memory variant: O(chunk_size + log N) resident state.
+    Produces exactly the root of `generate_merkle_root` for the same selection
+    (same return shape).
+    """
+    db_path = db_path or DB_PATH
+    if not os.path.exists(db_path):
+        print(f"Error: Vault not found at {db_path}")
+        return None
+
+    start = time.perf_counter()
+    acc = MerkleFrontier()
+    try:
+        conn = _open_vault(db_path)
+        cursor = conn.execute(*_ledger_query(from_id, to_id))
+        while True:
+            chunk = cursor.fetchmany(chunk_size)
+            if not chunk:
+                break
+            assert len(chunk[0]) == 5, f"Schema mismatch: Expected 5 columns, got {len(chunk[0])}"
+            for leaf in leaf_hashes_from_tuples(chunk):
+                acc.append(leaf)
+        conn.close()
+    except sqlite3.Error as e:
+        print(f"Database Error: {e}")
+        return None
+
+    if acc.size == 0:
+        print("Vault is empty. No validated state to anchor.")
+        return None
+    return _result(acc.root(), acc.size, start, timed)
+
+def _stream_subtree(db_path, lo_id, hi_id, chunk_size):
+    """Worker: (root, leaf count) of one shard, streamed from a private read-only connection."""
+    acc = MerkleFrontier()
+    conn = _open_vault(db_path)
+    try:
+        cursor = conn.execute(*_ledger_query(lo_id, hi_id))
+        while True:
+            chunk = cursor.fetchmany(chunk_size)
+            if not chunk:
+                break
+            for leaf in leaf_hashes_from_tuples(chunk):
+                acc.append(leaf)
+    finally:
+        conn.close()
+    return acc.root(), acc.size
+
+def _shard_bounds(conn, from_id, to_id, workers):
+    """
+    Plans power-of-two aligned shards in leaf positions and maps them to id ranges.
+    Returns (shard_size, [(lo_id, hi_id), ...]); a single id-only pass over the selection.
+    """
+    query, params = _ledger_query(from_id, to_id)
+    id_query = query.replace(
+        "SELECT amount, creator_share, user_pool_share, network_fee, timestamp", "SELECT id", 1
+    )
+    total = conn.execute(f"SELECT COUNT(*) FROM ({id_query})", params).fetchone()[0]
+    if total == 0:
+        return 0, []
+
+    shard_size = 1
+    while -(-total // shard_size) > workers * SHARDS_PER_WORKER:
+        shard_size <<= 1
+
+    bounds, lo_id, pos, last_id = [], None, 0, None
+    cursor = conn.execute(id_query, params)
+    while True:
+        chunk = cursor.fetchmany(CHUNK_SIZE)
+        if not chunk:
+            break
+        for (row_id,) in chunk:
+            if pos % shard_size == 0:
+                if lo_id is not None:
+                    bounds.append((lo_id, last_id))
+                lo_id = row_id
+            last_id = row_id
+            pos += 1
+    bounds.append((lo_id, last_id))
+    return shard_size, bounds
+
+def parallel_merkle_root(db_path=None, from_id=None, to_id=None, workers=None, chunk_size=CHUNK_SIZE, timed=False):
+    """
+    Process-pool variant. Shard k covers leaf positions [k*S, (k+1)*S) with S a power
+    of two, so every full shard root is exactly the level-log2(S) node of the global
+    tree. The trailing shard is lifted to that height with the duplicate-last-node
+    rule before the shard roots are reduced. Same return shape as `generate_merkle_root`.
+    """
+    db_path = db_path or DB_PATH
+    workers = workers or os.cpu_count() or 1
+    if not os.path.exists(db_path):
+        print(f"Error: Vault not found at {db_path}")
+        return None
+
+    start = time.perf_counter()
+    try:
+        conn = _open_vault(db_path)
+        shard_size, bounds = _shard_bounds(conn, from_id, to_id, workers)
+        conn.close()
+        if not bounds:
+            print("Vault is empty. No validated state to anchor.")
+            return None
+
+        with ProcessPoolExecutor(max_workers=workers) as pool:
+            futures = [pool.submit(_stream_subtree, db_path, lo, hi, chunk_size) for lo, hi in bounds]
+            shards = [future.result() for future in futures]
+    except sqlite3.Error as e:
+        print(f"Database Error: {e}")
+        return None
+
+    count = sum(size for _, size in shards)
+    if len(shards) == 1:
+        return _result(shards[0][0], count, start, timed)
+
+    # Lift the trailing partial shard to the shard height (it is the last, even-indexed node)
+    target_height = shard_size.bit_length() - 1
+    tail_root, tail_size = shards[-1]
+    for _ in range((tail_size - 1).bit_length(), target_height):
+        tail_root = hash_pair(tail_root, tail_root)
+    roots = [root for root, _ in shards[:-1]] + [tail_root]
+    return _result(reduce_merkle_root(roots), count, start, timed)
+
+def coverage_gaps(db_path=None):
+    """Ledger parts this script does not read: sealed segment count and shard layouts next to `db_path`."""
+    db_path = db_path or DB_PATH
+    sealed = 0
+    try:
+        conn = _open_vault(db_path)
+        try:
+            sealed = conn.execute("SELECT COUNT(*) FROM segments").fetchone()[0]
+        finally:
+            conn.close()
+    except sqlite3.Error:
+        pass  # No segments table: nothing was ever sealed
+    return sealed, [n for n in detect_layouts(db_path) if n > 1]
+
+def parse_args(argv=None):
+    parser = argparse.ArgumentParser(description="Nexus ledger Merkle anchor (research).")
+    parser.add_argument("--db", default=DB_PATH, help="Path to the vault database.")
+    parser.add_argument("--stream", action="store_true", help="Bounded-memory chunked reduction.")
+    parser.add_argument("--chunk", type=int, default=CHUNK_SIZE, help="Rows per fetchmany() in streaming modes.")
+    parser.add_argument("--workers", type=int, default=0, help="Process-pool size for parallel mode (0 = off).")
+    parser.add_argument("--from-id", type=int, default=None, help="First transaction id (inclusive).")
+    parser.add_argument("--to-id", type=int, default=None, help="Last transaction id (inclusive).")
+    return parser.parse_args(argv)
 
 if __name__ == "__main__":
+    args = parse_args()
     print(f"--- Nexus Phase 1.3.1 Hardened State Anchor ({HASH_ALGO}) ---")
-    
-    result = generate_merkle_root()
-    
+
+    if args.workers:
+        mode = f"parallel x{args.workers}"
+        result = parallel_merkle_root(args.db, args.from_id, args.to_id, args.workers, args.chunk, timed=True)
+    elif args.stream:
+        mode = "stream"
+        result = stream_merkle_root(args.db, args.from_id, args.to_id, args.chunk, timed=True)
+    else:
+        mode = "materialized"
+        result = generate_merkle_root(args.db, args.from_id, args.to_id, timed=True)
+
+    sealed, sharded = coverage_gaps(args.db)
+    if sealed or sharded:
+        print(f"⚠️ Hot file only: {sealed} sealed segment(s), shard layouts {sharded or 'none'} not read. "
+              "This root is not /api/ledger_root; use scripts/vault_admin.py verify-merkle.")
+
     if result:
-        root_hash, count = result
+        root_hash, count, elapsed = result
+        if args.from_id is not None or args.to_id is not None:
+            print(f"Anchored Range    : id {args.from_id or 0} .. {args.to_id if args.to_id is not None else 'MAX'}")
         print(f"Validated Entries : {count}")
         print(f"Merkle State Root   : {root_hash}")
+        print(f"Throughput        : {count / max(elapsed, 1e-9):,.0f} rows/s ({elapsed:.2f}s, {mode})")
         print("-" * 55)
         print("Status: Perimeter-Verified State Root Generated.")
         print("Roadmap: Ready for Phase 2.0 Blockchain Anchoring.")
     
-    print("\n© 2026 Nexus Protocol")
\ No newline at end of file
+    print("\n© 2026 Nexus Protocol")
@@ -0,0 +1,74 @@
+"""
+NEXUS MERKLE ANCHOR PARALLEL-MODE BENCHMARK
+
+Builds a synthetic vault (default 1M rows) and times the research anchor in
+streaming mode against the parallel mode at 1, 2, 4 and 8 workers, asserting
+that every run produces the same root. Speedup is bounded by physical cores;
+the core count is printed with the results.
+
+Only single-CPU results exist so far (200k rows, 1 core): stream 161k rows/s,
+parallel x1/x2/x4/x8 at 0.94x/0.81x/0.77x/0.76x. No multi-core speedup has
+been measured, so none is claimed.
+
+Usage:
+    python scripts/bench_merkle_anchor.py [ROWS] [--db PATH]
+"""
+
+import argparse
+import os
+import random
+import sqlite3
+import sys
+import tempfile
+
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), "..", "research")))
+import merkle_anchor  # noqa: E402
+
+WORKER_COUNTS = (1, 2, 4, 8)
+
+def build_vault(path, rows):
+    conn = sqlite3.connect(path)
+    conn.execute("PRAGMA journal_mode=WAL;")
+    conn.execute("""
+        CREATE TABLE transactions (
+            id INTEGER PRIMARY KEY AUTOINCREMENT, user_id TEXT NOT NULL, amount REAL NOT NULL,
+            creator_share REAL NOT NULL, user_pool_share REAL NOT NULL, network_fee REAL NOT NULL,
+            timestamp TEXT NOT NULL
+        )""")
+    def generate():
+        for i in range(rows):
+            amount = round(random.uniform(1.0, 1000.0), 2)
+            yield (str(random.randint(1, 5000)), amount, round(amount * 0.6, 2), round(amount * 0.3, 2),
+                   round(amount * 0.1, 2), f"2026-01-01 {i // 3600 % 24:02d}:{i // 60 % 60:02d}:{i % 60:02d}")
+    conn.executemany(
+        "INSERT INTO transactions (user_id, amount, creator_share, user_pool_share, network_fee, timestamp) "
+        "VALUES (?, ?, ?, ?, ?, ?)", generate())
+    conn.commit()
+    conn.close()
+
+def main():
+    parser = argparse.ArgumentParser()
+    parser.add_argument("rows", nargs="?", type=int, default=1_000_000)
+    parser.add_argument("--db", default=None, help="Benchmark an existing vault instead of a synthetic one.")
+    args = parser.parse_args()
+
+    db_path = args.db
+    if db_path is None:
+        db_path = os.path.join(tempfile.mkdtemp(prefix="nexus_anchor_"), "vault.db")
+        print(f"🌱 Building synthetic vault ({args.rows:,} rows)...")
+        random.seed(11)
+        build_vault(db_path, args.rows)
+
+    print(f"🖥️ cores available: {os.cpu_count()}")
+    root, count, base = merkle_anchor.stream_merkle_root(db_path, timed=True)
+    print(f"{'mode':<14} | {'seconds':>8} | {'rows/s':>12} | speedup")
+    print("-" * 52)
+    print(f"{'stream':<14} | {base:>8.2f} | {count / base:>12,.0f} | 1.00x")
+    for workers in WORKER_COUNTS:
+        p_root, _, elapsed = merkle_anchor.parallel_merkle_root(db_path, workers=workers, timed=True)
+        assert p_root == root, f"Root divergence at {workers} workers"
+        print(f"{f'parallel x{workers}':<14} | {elapsed:>8.2f} | {count / elapsed:>12,.0f} | {base / elapsed:.2f}x")
+    print(f"✅ Root {root} identical across all modes.")
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,86 @@
+"""
+NEXUS MERKLE HASHING BENCHMARK
+
+Compares the legacy per-row / per-node hashing (string concatenation and
+hexdigest at every node) with the batched engine in backend/merkle.py at
+100, 10k and 1M leaves, and asserts both produce byte-identical roots.
+Reports best-of-N wall time for the leaf and reduction stages.
+
+FINDINGS (CPython 3.11, 1M leaves):
+Both paths are bound by one hashlib call per node and `str(float)` per leaf
+column; batching removes interpreter overhead (attribute lookups, per-node
+append, index arithmetic) but not those costs. Contiguous raw-digest level
+buffers were prototyped and measured *slower* with higher peak memory,
+because the parent preimage is hex text and every node must be re-encoded.
+Large ledgers are therefore served by the streaming and parallel modes of
+research/merkle_anchor.py rather than a faster per-node kernel.
+"""
+
+import gc
+import hashlib
+import os
+import random
+import sys
+import time
+
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), "..")))
+from backend.merkle import leaf_hashes, generate_merkle_root  # noqa: E402
+
+SIZES = (100, 10_000, 1_000_000)
+REPEATS = 3  # Best-of-N damps scheduler and GC noise
+
+# --- Legacy reference (verbatim Phase 1.4.0 semantics) ---
+def legacy_leaf(row):
+    payload = "|".join([
+        str(row["amount"]), str(row["creator_share"]), str(row["user_pool_share"]),
+        str(row["network_fee"]), str(row["timestamp"]),
+    ])
+    return hashlib.sha256(payload.encode("utf-8")).hexdigest()
+
+def legacy_root(hashes):
+    nodes = hashes[:]
+    while len(nodes) > 1:
+        if len(nodes) % 2 != 0:
+            nodes.append(nodes[-1])
+        nodes = [hashlib.sha256((nodes[i] + nodes[i + 1]).encode("utf-8")).hexdigest()
+                 for i in range(0, len(nodes), 2)]
+    return nodes[0]
+
+def make_rows(n):
+    rows = []
+    for i in range(n):
+        amount = round(random.uniform(1.0, 1000.0), 2)
+        rows.append({
+            "amount": amount, "creator_share": round(amount * 0.6, 2),
+            "user_pool_share": round(amount * 0.3, 2), "network_fee": round(amount * 0.1, 2),
+            "timestamp": f"2026-01-01 00:{i // 60 % 60:02d}:{i % 60:02d}",
+        })
+    return rows
+
+def timed(fn):
+    best, result = float("inf"), None
+    for _ in range(REPEATS):
+        gc.collect()
+        start = time.perf_counter()
+        result = fn()
+        best = min(best, time.perf_counter() - start)
+    return result, best
+
+def main():
+    random.seed(7)
+    print(f"{'leaves':>10} | {'stage':>6} | {'legacy':>10} | {'batched':>10} | speedup")
+    print("-" * 58)
+    for n in SIZES:
+        rows = make_rows(n)
+        old_leaves, old_leaf_t = timed(lambda: [legacy_leaf(r) for r in rows])
+        new_leaves, new_leaf_t = timed(lambda: leaf_hashes(rows))
+        assert old_leaves == new_leaves, f"Leaf divergence at {n} leaves"
+        old_root, old_root_t = timed(lambda: legacy_root(old_leaves))
+        new_root, new_root_t = timed(lambda: generate_merkle_root(new_leaves))
+        assert old_root == new_root, f"Root divergence at {n} leaves"
+        for stage, old_t, new_t in (("leaves", old_leaf_t, new_leaf_t), ("reduce", old_root_t, new_root_t)):
+            print(f"{n:>10} | {stage:>6} | {old_t * 1000:>8.1f}ms | {new_t * 1000:>8.1f}ms | {old_t / new_t:.2f}x")
+    print("✅ Roots byte-identical at every size.")
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,107 @@
+"""
+NEXUS READ-UNDER-WRITE BENCHMARK
+
+Measures /api/transactions?limit=50 latency (rotating user ids) on an idle
+node, then again while /api/execute_split is saturated by concurrent writers.
+History pages are never cached, so every read checks out a pooled `query_only`
+reader (the pool's checkout counter is printed to prove it); the summary
+route would mostly be answered by the LRU cache and measure nothing.
+
+Runs in-process over ASGI against a throwaway vault (no server, no network).
+"""
+
+import asyncio
+import os
+import sys
+import tempfile
+import time
+import statistics
+
+import httpx
+
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), "..")))
+import backend.main as brain  # noqa: E402
+
+# CONFIGURATION
+READ_SAMPLES = 2000
+READ_CONCURRENCY = 8
+WRITER_TASKS = 16
+SEED_USERS = 50
+SEED_ROWS_PER_USER = 200
+
+def percentile(samples, pct):
+    ordered = sorted(samples)
+    return ordered[min(len(ordered) - 1, int(len(ordered) * pct / 100))]
+
+def report(label, samples):
+    print(f"📊 {label:<26} p50={percentile(samples, 50) * 1000:7.2f}ms "
+          f"p99={percentile(samples, 99) * 1000:7.2f}ms "
+          f"mean={statistics.mean(samples) * 1000:7.2f}ms")
+
+def checkouts_total():
+    return sum(pool.stats()["checkouts"] for pool in brain.vault.pools)
+
+async def read_wave(client):
+    latencies = []
+    per_task = READ_SAMPLES // READ_CONCURRENCY
+
+    async def reader(worker):
+        for i in range(per_task):
+            uid = (worker * per_task + i) % SEED_USERS + 1
+            start = time.perf_counter()
+            resp = await client.get("/api/transactions?limit=50", headers={"X-Nexus-TMA": f"id={uid}"})
+            latencies.append(time.perf_counter() - start)
+            assert resp.status_code == 200
+
+    await asyncio.gather(*(reader(w) for w in range(READ_CONCURRENCY)))
+    return latencies
+
+async def saturate_writes(client, stop, counter):
+    async def writer(worker):
+        headers = {"X-Nexus-TMA": f"id={worker % SEED_USERS + 1}"}
+        while not stop.is_set():
+            resp = await client.post("/api/execute_split", json={"amount": 10.0}, headers=headers)
+            if resp.status_code == 200:
+                counter[0] += 1
+
+    await asyncio.gather(*(writer(w) for w in range(WRITER_TASKS)))
+
+async def main():
+    workdir = tempfile.mkdtemp(prefix="nexus_bench_")
+    brain.DB_PATH = os.path.join(workdir, "vault.db")
+
+    async with brain.app.router.lifespan_context(brain.app):
+        transport = httpx.ASGITransport(app=brain.app)
+        async with httpx.AsyncClient(transport=transport, base_url="http://bench") as client:
+            print(f"🌱 Seeding {SEED_USERS * SEED_ROWS_PER_USER} rows...")
+            for uid in range(1, SEED_USERS + 1):
+                headers = {"X-Nexus-TMA": f"id={uid}"}
+                await asyncio.gather(*(
+                    client.post("/api/execute_split", json={"amount": 1.0}, headers=headers)
+                    for _ in range(SEED_ROWS_PER_USER)
+                ))
+
+            checkouts = checkouts_total()
+            idle = await read_wave(client)
+            idle_checkouts = checkouts_total() - checkouts
+
+            stop, counter = asyncio.Event(), [0]
+            writers = asyncio.create_task(saturate_writes(client, stop, counter))
+            await asyncio.sleep(0.5)  # Let the writer queue fill up
+            start = time.perf_counter()
+            saturated = await read_wave(client)
+            elapsed = time.perf_counter() - start
+            stop.set()
+            await writers
+            saturated_checkouts = checkouts_total() - checkouts - idle_checkouts
+
+    print("=" * 64)
+    report("transactions (idle)", idle)
+    report("transactions (saturated)", saturated)
+    print(f"🔌 pooled reader checkouts: idle={idle_checkouts} saturated={saturated_checkouts} "
+          f"(reads per wave: {len(idle)})")
+    print(f"✍️ execute_split throughput during wave: {counter[0] / elapsed:.0f} splits/s")
+    print("=" * 64)
+
+if __name__ == "__main__":
+    asyncio.run(main())
@@ -0,0 +1,90 @@
+"""
+NEXUS SHARDED WRITE BENCHMARK
+
+Measures committed splits/s for a vault split into K = 1, 2, 4 and 8 shard
+files. Each shard has its own group-commit writer thread and WAL, so commits
+on different shards proceed in parallel (SQLite releases the GIL while it
+writes and syncs).
+
+Default mode drives the shard writers directly, isolating vault capacity from
+the HTTP stack. `--http` posts to /api/execute_split over in-process ASGI
+instead (end-to-end, but the single event loop then dominates).
+
+Results depend on core count and on the disk's fsync cost; on a single core
+expect little or no gain beyond K = 1. Only 1-CPU runs exist (≈10.4k / 12.6k /
+13.2k / 11.4k splits/s for K = 1 / 2 / 4 / 8); multi-core scaling has not been
+measured and none is claimed. Run on the target hardware.
+
+Usage:
+    python scripts/bench_sharded_writes.py [--seconds 5] [--tasks 64] [--users 1024] [--http]
+"""
+
+import argparse
+import asyncio
+import os
+import sys
+import tempfile
+import time
+
+import httpx
+
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), "..")))
+import backend.main as brain  # noqa: E402
+
+SHARD_COUNTS = (1, 2, 4, 8)
+
+async def drive_writers(seconds: float, tasks: int, users: int) -> int:
+    stop, committed = time.perf_counter() + seconds, [0]
+
+    async def worker(w):
+        i = w
+        while time.perf_counter() < stop:
+            uid = str(i % users + 1)
+            await brain.vault.writer(uid).submit((uid, 10.0, 6.0, 3.0, 1.0, "2026-01-01 00:00:00"))
+            committed[0] += 1
+            i += tasks
+
+    await asyncio.gather(*(worker(w) for w in range(tasks)))
+    return committed[0]
+
+async def drive_http(seconds: float, tasks: int, users: int) -> int:
+    stop, committed = time.perf_counter() + seconds, [0]
+    transport = httpx.ASGITransport(app=brain.app)
+    async with httpx.AsyncClient(transport=transport, base_url="http://bench") as client:
+        async def worker(w):
+            i = w
+            while time.perf_counter() < stop:
+                headers = {"X-Nexus-TMA": f"id={i % users + 1}"}
+                resp = await client.post("/api/execute_split", json={"amount": 10.0}, headers=headers)
+                committed[0] += resp.status_code == 200
+                i += tasks
+
+        await asyncio.gather(*(worker(w) for w in range(tasks)))
+    return committed[0]
+
+async def run(shards: int, args) -> float:
+    brain.DB_PATH = os.path.join(tempfile.mkdtemp(prefix=f"nexus_shards{shards}_"), "vault.db")
+    brain.VAULT_SHARDS = shards
+    async with brain.app.router.lifespan_context(brain.app):
+        drive = drive_http if args.http else drive_writers
+        start = time.perf_counter()
+        committed = await drive(args.seconds, args.tasks, args.users)
+        return committed / (time.perf_counter() - start)
+
+def main():
+    parser = argparse.ArgumentParser(description="Write TPS for K shard files.")
+    parser.add_argument("--seconds", type=float, default=5.0)
+    parser.add_argument("--tasks", type=int, default=64, help="Concurrent submitters.")
+    parser.add_argument("--users", type=int, default=1024, help="Distinct sovereign ids.")
+    parser.add_argument("--http", action="store_true", help="Go through /api/execute_split.")
+    args = parser.parse_args()
+
+    results = {k: asyncio.run(run(k, args)) for k in SHARD_COUNTS}
+    print("=" * 64)
+    print(f"🧪 mode={'http' if args.http else 'writer'} tasks={args.tasks} users={args.users} cpus={os.cpu_count()}")
+    for k, tps in results.items():
+        print(f"📊 K={k:<2} {tps:10.0f} splits/s   x{tps / results[1]:.2f}")
+    print("=" * 64)
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,135 @@
+"""
+NEXUS ONLINE SNAPSHOT BENCHMARK
+
+Measures what an online snapshot costs a live node: copy throughput (MB/s)
+and the writer stall it causes. A throwaway in-process node is preloaded,
+then splits arrive at a constant rate (open loop, latency from the scheduled
+start) for a baseline window and again while a snapshot runs on the node's
+snapshot thread. Split latency percentiles for both windows, the snapshot's
+throughput and the WAL growth while its read snapshot was pinned are
+reported. Sweep `--pages` / `--sleep-ms` to pick NEXUS_SNAPSHOT_PAGES and
+NEXUS_SNAPSHOT_SLEEP_MS for a host.
+
+Usage:
+    python scripts/bench_snapshot.py [--rows 200000] [--rate 200] [--pages 256] [--sleep-ms 5] [--json out.json]
+"""
+
+import argparse
+import asyncio
+import json
+import os
+import sys
+import tempfile
+import time
+
+import httpx
+
+from load_bench import LogHistogram, _git_commit
+
+ROOT = os.path.abspath(os.path.join(os.path.dirname(__file__), ".."))
+sys.path.insert(0, ROOT)
+
+import backend.main as brain  # noqa: E402
+from backend import snapshots  # noqa: E402
+
+
+async def preload(client: httpx.AsyncClient, rows: int, users: int) -> None:
+    for start in range(0, rows, 1000):
+        uid = 1_000_000 + (start // 1000) % users
+        items = [{"amount": 12.5}] * min(1000, rows - start)
+        resp = await client.post("/api/execute_split/batch", json={"items": items},
+                                 headers={"X-Nexus-TMA": f"user=%7B%22id%22%3A{uid}%7D"})
+        resp.raise_for_status()
+
+async def drive(client: httpx.AsyncClient, rate: float, until, users: int) -> LogHistogram:
+    """Splits at `rate`/s until `until()` is true; latency measured from each scheduled start."""
+    loop = asyncio.get_running_loop()
+    hist = LogHistogram()
+    inflight = set()
+
+    async def fire(i: int, scheduled: float):
+        uid = 2_000_000 + i % users
+        resp = await client.post("/api/execute_split", json={"amount": 10.0},
+                                 headers={"X-Nexus-TMA": f"user=%7B%22id%22%3A{uid}%7D"})
+        resp.raise_for_status()
+        hist.record(loop.time() - scheduled)
+
+    start, i = loop.time(), 0
+    while not until():
+        scheduled = start + i / rate
+        delay = scheduled - loop.time()
+        if delay > 0:
+            await asyncio.sleep(delay)
+        task = asyncio.create_task(fire(i, scheduled))
+        inflight.add(task)
+        task.add_done_callback(inflight.discard)
+        i += 1
+    if inflight:
+        await asyncio.gather(*inflight)
+    return hist
+
+async def run(args) -> dict:
+    brain.DB_PATH = os.path.join(tempfile.mkdtemp(prefix="nexus_snap_"), "vault.db")
+    snapshots.SNAPSHOT_PAGES, snapshots.SNAPSHOT_SLEEP_MS = args.pages, args.sleep_ms
+    service = snapshots.SnapshotService()
+    root = snapshots.snapshot_root(brain.DB_PATH)
+    wal = brain.DB_PATH + "-wal"
+
+    async with brain.app.router.lifespan_context(brain.app):
+        transport = httpx.ASGITransport(app=brain.app)
+        async with httpx.AsyncClient(transport=transport, base_url="http://bench", timeout=30.0) as client:
+            await preload(client, args.rows, args.users)
+            size = os.path.getsize(brain.DB_PATH)
+
+            deadline = time.monotonic() + args.window
+            baseline = await drive(client, args.rate, lambda: time.monotonic() >= deadline, args.users)
+
+            wal_start, wal_peak = os.path.getsize(wal), 0
+            task = service.start([brain.DB_PATH], root)
+            deadline = time.monotonic() + args.window
+
+            def done() -> bool:
+                nonlocal wal_peak
+                wal_peak = max(wal_peak, os.path.getsize(wal))
+                return task.done() and time.monotonic() >= deadline
+
+            during = await drive(client, args.rate, done, args.users)
+            manifest = await task
+
+    copy = manifest["files"][0]["copy"]
+    return {
+        "meta": {"commit": _git_commit(), "cpus": os.cpu_count(), "args": vars(args)},
+        "vault_mb": round(size / 1e6, 1),
+        "snapshot": {"seconds": copy["seconds"], "mb_per_s": copy["mb_per_s"], "steps": copy["steps"],
+                     "wal_growth_mb": round(max(0, wal_peak - wal_start) / 1e6, 2)},
+        "splits_baseline": baseline.summary(),
+        "splits_during_snapshot": during.summary(),
+    }
+
+def main():
+    parser = argparse.ArgumentParser(description="Online snapshot throughput and writer stall.")
+    parser.add_argument("--rows", type=int, default=200_000, help="Splits preloaded before measuring.")
+    parser.add_argument("--users", type=int, default=1000)
+    parser.add_argument("--rate", type=float, default=200.0, help="Split arrival rate (per second).")
+    parser.add_argument("--window", type=float, default=5.0, help="Minimum seconds per measured window.")
+    parser.add_argument("--pages", type=int, default=snapshots.SNAPSHOT_PAGES, help="Pages copied per step.")
+    parser.add_argument("--sleep-ms", type=float, default=snapshots.SNAPSHOT_SLEEP_MS, help="Pause between steps.")
+    parser.add_argument("--json", help="Write the report here.")
+    args = parser.parse_args()
+
+    report = asyncio.run(run(args))
+    snap, base, during = report["snapshot"], report["splits_baseline"], report["splits_during_snapshot"]
+    print("=" * 78)
+    print(f"📸 {report['vault_mb']} MB vault copied in {snap['seconds']}s ({snap['mb_per_s']} MB/s, "
+          f"{snap['steps']} steps of {args.pages} pages, sleep {args.sleep_ms:g}ms); WAL grew {snap['wal_growth_mb']} MB")
+    for label, hist in (("baseline", base), ("snapshot", during)):
+        print(f"✍️ {label:<9} n={hist['count']:<6} p50={hist.get('p50_ms', 0):8.2f}ms "
+              f"p99={hist.get('p99_ms', 0):8.2f}ms max={hist.get('max_ms', 0):8.2f}ms")
+    print("=" * 78)
+    if args.json:
+        with open(args.json, "w") as f:
+            json.dump(report, f, indent=2)
+        print(f"💾 Report written to {args.json}")
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,195 @@
+"""
+NEXUS MULTI-PROCESS READ SCALING BENCHMARK
+
+Starts a real `uvicorn --workers N` node (N = 1, 2, 4 by default) on a
+throwaway vault, preloads it through the HTTP API (so followers' splits go
+through the elected writer's socket, see backend/workers.py), then measures
+read throughput: closed-loop keep-alive clients, spread over several client
+processes so the load generator is not the bottleneck.
+
+Routes:
+    transactions    /api/transactions (index range scan + page Merkle root)
+    summary         /api/vault_summary (mostly per-worker cache hits)
+    mixed           2:1 transactions:summary
+
+Scaling is bounded by cores: each worker is one interpreter, and the client
+processes compete for the same CPUs. Compare runs on the target hardware;
+`cpus` is printed with the results. Only 1-CPU runs have been recorded so far
+(no scaling, ±40% run-to-run noise; see backend/README.md); a multi-core
+curve is still missing. Never touches backend/nexus_vault.db.
+
+Usage:
+    python scripts/bench_workers.py [--workers 1,2,4] [--seconds 10] [--route transactions] [--json out.json]
+"""
+
+import argparse
+import asyncio
+import json
+import multiprocessing
+import os
+import platform
+import random
+import shutil
+import signal
+import socket
+import subprocess
+import sys
+import tempfile
+import time
+
+import httpx
+
+ROOT = os.path.abspath(os.path.join(os.path.dirname(__file__), ".."))
+ADMIN_TOKEN = "bench-" + os.urandom(8).hex()  # The throwaway node's operator token (/api/node_stats)
+
+# Points the node at a throwaway vault without touching the real one
+APP_SHIM = """import backend.main as brain
+brain.DB_PATH = {db_path!r}
+app = brain.app
+"""
+
+
+def _free_port() -> int:
+    with socket.socket() as s:
+        s.bind(("127.0.0.1", 0))
+        return s.getsockname()[1]
+
+def start_node(workers: int, workdir: str, port: int) -> subprocess.Popen:
+    with open(os.path.join(workdir, "nexus_bench_app.py"), "w") as f:
+        f.write(APP_SHIM.format(db_path=os.path.join(workdir, "vault.db")))
+    env = dict(os.environ, NEXUS_WORKERS=str(workers), NEXUS_ADMIN_TOKEN=ADMIN_TOKEN,
+               PYTHONPATH=os.pathsep.join([ROOT, workdir]))
+    env.pop("NEXUS_ADMIN_IDS", None)
+    env.pop("WEB_CONCURRENCY", None)
+    return subprocess.Popen(
+        [sys.executable, "-m", "uvicorn", "nexus_bench_app:app", "--host", "127.0.0.1", "--port", str(port),
+         "--workers", str(workers), "--log-level", "warning"],
+        cwd=workdir, env=env, stdout=open(os.path.join(workdir, "node.log"), "w"), stderr=subprocess.STDOUT,
+    )
+
+def wait_ready(base: str, workers: int, timeout: float = 60.0) -> set:
+    """Polls until every worker answered once (fresh connection per probe). Returns their roles by pid."""
+    deadline, seen = time.time() + timeout, {}
+    while time.time() < deadline:
+        try:
+            stats = httpx.get(f"{base}/api/node_stats", headers={"X-Nexus-Admin-Token": ADMIN_TOKEN},
+                              timeout=2.0).json()["worker"]
+            seen[stats["pid"]] = stats["role"]
+            if len(seen) >= workers:
+                return seen
+        except (httpx.HTTPError, KeyError, ValueError):
+            pass
+        time.sleep(0.05)
+    if seen:
+        return seen  # The kernel may keep routing probes to the same few workers
+    raise RuntimeError("NODE_NOT_READY")
+
+async def preload(base: str, users: int, rows: int) -> None:
+    async with httpx.AsyncClient(base_url=base, timeout=30.0) as client:
+        async def load(uid):
+            left = rows
+            while left:
+                n = min(left, 1000)
+                resp = await client.post("/api/execute_split/batch", headers={"X-Nexus-TMA": f"id={uid}"},
+                                         json={"items": [{"amount": 10.0 + i % 7} for i in range(n)]})
+                resp.raise_for_status()
+                left -= n
+        await asyncio.gather(*(load(uid) for uid in range(1, users + 1)))
+
+async def _drive(base: str, route: str, users: int, seconds: float, concurrency: int, seed: int):
+    rng = random.Random(seed)
+    latencies, errors = [], 0
+    stop = time.perf_counter() + seconds
+    limits = httpx.Limits(max_connections=concurrency, max_keepalive_connections=concurrency)
+    async with httpx.AsyncClient(base_url=base, timeout=30.0, limits=limits) as client:
+        async def loop():
+            nonlocal errors
+            while time.perf_counter() < stop:
+                uid = rng.randint(1, users)
+                pick = route if route != "mixed" else rng.choice(("transactions", "transactions", "summary"))
+                path = "/api/transactions?limit=50" if pick == "transactions" else "/api/vault_summary"
+                start = time.perf_counter()
+                resp = await client.get(path, headers={"X-Nexus-TMA": f"id={uid}"})
+                if resp.status_code == 200:
+                    latencies.append(time.perf_counter() - start)
+                else:
+                    errors += 1
+        await asyncio.gather(*(loop() for _ in range(concurrency)))
+    return latencies, errors
+
+def _client_process(args):
+    return asyncio.run(_drive(*args))
+
+def measure(base: str, args) -> dict:
+    jobs = [(base, args.route, args.users, args.seconds, args.concurrency, seed) for seed in range(args.clients)]
+    start = time.perf_counter()
+    with multiprocessing.Pool(args.clients) as pool:
+        results = pool.map(_client_process, jobs)
+    elapsed = time.perf_counter() - start
+    latencies = sorted(l for lat, _ in results for l in lat)
+    pct = lambda p: latencies[min(len(latencies) - 1, int(len(latencies) * p / 100))] * 1000 if latencies else 0.0
+    return {
+        "requests": len(latencies),
+        "errors": sum(e for _, e in results),
+        "rps": len(latencies) / min(elapsed, args.seconds),
+        "p50_ms": round(pct(50), 3),
+        "p99_ms": round(pct(99), 3),
+    }
+
+def run(workers: int, args) -> dict:
+    workdir = tempfile.mkdtemp(prefix=f"nexus_workers{workers}_")
+    port = _free_port()
+    base = f"http://127.0.0.1:{port}"
+    node = start_node(workers, workdir, port)
+    try:
+        roles = wait_ready(base, workers)
+        asyncio.run(preload(base, args.users, args.rows))
+        result = measure(base, args)
+        result["workers"] = workers
+        result["roles_seen"] = sorted(roles.values())
+        return result
+    finally:
+        node.send_signal(signal.SIGINT)
+        try:
+            node.wait(timeout=30)
+        except subprocess.TimeoutExpired:
+            node.kill()
+        shutil.rmtree(workdir, ignore_errors=True)
+
+def _git_commit():
+    try:
+        return subprocess.run(["git", "rev-parse", "--short", "HEAD"], cwd=ROOT, capture_output=True,
+                              text=True, timeout=5).stdout.strip() or None
+    except (OSError, subprocess.SubprocessError):
+        return None
+
+def main():
+    parser = argparse.ArgumentParser(description="Read throughput of a multi-process node vs worker count.")
+    parser.add_argument("--workers", default="1,2,4", help="Comma-separated worker counts.")
+    parser.add_argument("--seconds", type=float, default=10.0)
+    parser.add_argument("--route", choices=("transactions", "summary", "mixed"), default="transactions")
+    parser.add_argument("--users", type=int, default=200, help="Distinct sovereign ids.")
+    parser.add_argument("--rows", type=int, default=200, help="Preloaded splits per user.")
+    parser.add_argument("--clients", type=int, default=max(2, (os.cpu_count() or 2) // 2),
+                        help="Client processes driving the load.")
+    parser.add_argument("--concurrency", type=int, default=16, help="Keep-alive connections per client process.")
+    parser.add_argument("--json", help="Write the results here.")
+    args = parser.parse_args()
+
+    counts = [int(n) for n in args.workers.split(",")]
+    results = [run(n, args) for n in counts]
+    base = results[0]["rps"] or 1.0
+    print("=" * 72)
+    print(f"🧪 route={args.route} users={args.users} rows/user={args.rows} clients={args.clients}x{args.concurrency} "
+          f"cpus={os.cpu_count()}")
+    for r in results:
+        print(f"📊 workers={r['workers']:<2} {r['rps']:9.0f} req/s  x{r['rps'] / base:.2f}  "
+              f"p50={r['p50_ms']:.2f}ms p99={r['p99_ms']:.2f}ms errors={r['errors']}  roles={r['roles_seen']}")
+    print("=" * 72)
+    if args.json:
+        with open(args.json, "w") as f:
+            json.dump({"git_commit": _git_commit(), "python": platform.python_version(), "cpus": os.cpu_count(),
+                       "args": vars(args), "results": results}, f, indent=2)
+
+if __name__ == "__main__":
+    main()
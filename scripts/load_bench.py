@@ -0,0 +1,294 @@
+"""
+NEXUS OPEN-LOOP LOAD BENCHMARK
+
+Replaces the closed-loop `stress_test_1m.py`. Requests are issued at a
+constant arrival rate whether or not earlier ones have completed, and each
+latency is measured from the request's *scheduled* start. A stalled node
+therefore shows up in the tail instead of silently slowing the load down
+(coordinated omission). Time from the actual send is reported as `service`.
+
+Workload profiles mix the three user-facing routes (execute_split,
+vault_summary, transactions); sovereign ids are drawn from a Zipf
+distribution, so a few heavy users dominate as they do in production.
+
+Modes:
+    (default)   In-process over ASGI against a throwaway vault: server cost
+                without sockets (client and node share one event loop).
+    --url URL   A running node. Nothing is reset or deleted.
+
+Latencies land in a log-bucketed histogram (1% relative precision, HDR
+style). `--json` writes the run (percentiles, buckets, git commit, args) for
+comparison across commits. Never prompts; safe for CI.
+
+Usage:
+    python scripts/load_bench.py [--profile mixed] [--rate 500] [--duration 30] [--json out.json]
+    python scripts/load_bench.py --url http://localhost:8000 --rate 200 --profile read-heavy
+"""
+
+import argparse
+import asyncio
+import bisect
+import json
+import math
+import os
+import platform
+import random
+import subprocess
+import sys
+import tempfile
+import time
+from collections import Counter, defaultdict
+
+import httpx
+
+ROOT = os.path.abspath(os.path.join(os.path.dirname(__file__), ".."))
+
+# Route weights per profile: (execute_split, vault_summary, transactions)
+PROFILES = {
+    "write-heavy": (0.80, 0.10, 0.10),
+    "mixed": (0.20, 0.50, 0.30),
+    "read-heavy": (0.05, 0.60, 0.35),
+    "write-only": (1.00, 0.00, 0.00),
+}
+ROUTES = ("execute_split", "vault_summary", "transactions")
+PERCENTILES = (50, 90, 99, 99.9, 99.99)
+
+
+# --- 1. HDR-STYLE HISTOGRAM ---
+class LogHistogram:
+    """Log-bucketed latency histogram: every bucket spans `precision` relative width."""
+
+    def __init__(self, precision: float = 0.01, lowest_us: float = 1.0):
+        self.base = math.log1p(precision)
+        self.lowest = lowest_us
+        self.buckets = Counter()
+        self.count = 0
+        self.total = 0.0
+        self.min = math.inf
+        self.max = 0.0
+
+    def record(self, seconds: float) -> None:
+        us = max(seconds * 1e6, self.lowest)
+        self.buckets[int(math.log(us / self.lowest) / self.base)] += 1
+        self.count += 1
+        self.total += us
+        self.min = min(self.min, us)
+        self.max = max(self.max, us)
+
+    def upper_us(self, index: int) -> float:
+        return self.lowest * math.exp((index + 1) * self.base)
+
+    def percentile(self, pct: float) -> float:
+        if not self.count:
+            return 0.0
+        rank, seen = math.ceil(self.count * pct / 100), 0
+        for index in sorted(self.buckets):
+            seen += self.buckets[index]
+            if seen >= rank:
+                return min(self.upper_us(index), self.max)
+        return self.max
+
+    def summary(self) -> dict:
+        ms = lambda us: round(us / 1000, 3)  # noqa: E731
+        out = {"count": self.count}
+        if self.count:
+            out.update({"min_ms": ms(self.min), "mean_ms": ms(self.total / self.count), "max_ms": ms(self.max)})
+            out.update({f"p{p:g}_ms": ms(self.percentile(p)) for p in PERCENTILES})
+        return out
+
+    def export(self) -> dict:
+        """Bucket upper bounds (µs) -> counts; merge runs by summing counts per bound."""
+        return {f"{self.upper_us(i):.1f}": n for i, n in sorted(self.buckets.items())}
+
+
+# --- 2. WORKLOAD ---
+class Workload:
+    def __init__(self, profile: str, users: int, skew: float, seed: int):
+        self.rng = random.Random(seed)
+        self.route_cum = list(_cumulative(PROFILES[profile]))
+        # Zipf: user of rank k is drawn with weight 1 / k^skew
+        self.user_cum = list(_cumulative([1.0 / (k ** skew) for k in range(1, users + 1)]))
+
+    def user(self) -> str:
+        return str(1_000_000 + bisect.bisect_left(self.user_cum, self.rng.random() * self.user_cum[-1]))
+
+    def next(self):
+        route = ROUTES[bisect.bisect_left(self.route_cum, self.rng.random() * self.route_cum[-1])]
+        uid = self.user()
+        headers = {"X-Nexus-TMA": f"user=%7B%22id%22%3A{uid}%7D"}
+        if route == "execute_split":
+            return route, "POST", "/api/execute_split", headers, {"amount": round(self.rng.uniform(1.0, 1000.0), 2)}
+        if route == "vault_summary":
+            return route, "GET", f"/api/vault_summary/{uid}", headers, None
+        return route, "GET", "/api/transactions?limit=50", headers, None
+
+def _cumulative(weights):
+    total = 0.0
+    for w in weights:
+        total += w
+        yield total
+
+
+# --- 3. OPEN-LOOP DRIVER ---
+class Results:
+    def __init__(self):
+        self.latency = defaultdict(LogHistogram)   # From scheduled start
+        self.service = defaultdict(LogHistogram)   # From actual send
+        self.status = defaultdict(Counter)
+        self.dropped = 0
+        self.max_lag_ms = 0.0
+
+async def preload(client: httpx.AsyncClient, workload: Workload, rows: int) -> None:
+    """Seeds history with the same user skew, through the batch endpoint."""
+    per_user = Counter(workload.user() for _ in range(rows))
+    for uid, n in per_user.items():
+        headers = {"X-Nexus-TMA": f"user=%7B%22id%22%3A{uid}%7D"}
+        for start in range(0, n, 1000):
+            items = [{"amount": 10.0}] * min(1000, n - start)
+            resp = await client.post("/api/execute_split/batch", json={"items": items}, headers=headers)
+            resp.raise_for_status()
+
+async def drive(client: httpx.AsyncClient, workload: Workload, args, results: Results) -> float:
+    loop = asyncio.get_running_loop()
+    interval = 1.0 / args.rate
+    total = int(args.rate * args.duration)
+    warmup = int(args.rate * args.warmup)
+    inflight = set()
+
+    async def fire(i: int, scheduled: float):
+        route, method, path, headers, body = workload.next()
+        sent = loop.time()
+        try:
+            resp = await client.request(method, path, headers=headers, json=body)
+            code = resp.status_code
+        except httpx.HTTPError as e:
+            code = type(e).__name__
+        done = loop.time()
+        if i >= warmup:
+            results.latency[route].record(done - scheduled)
+            results.service[route].record(done - sent)
+            results.status[route][code] += 1
+
+    start = loop.time()
+    for i in range(total):
+        scheduled = start + i * interval
+        delay = scheduled - loop.time()
+        if delay > 0:
+            await asyncio.sleep(delay)
+        elif i >= warmup:
+            results.max_lag_ms = max(results.max_lag_ms, -delay * 1000)
+        if len(inflight) >= args.max_inflight:
+            results.dropped += 1  # Generator saturated; reported, never silently delayed
+            continue
+        task = asyncio.create_task(fire(i, scheduled))
+        inflight.add(task)
+        task.add_done_callback(inflight.discard)
+    if inflight:
+        await asyncio.gather(*inflight)
+    return loop.time() - start
+
+async def run(args) -> dict:
+    workload = Workload(args.profile, args.users, args.skew, args.seed)
+    results = Results()
+    timeout = httpx.Timeout(args.timeout)
+    limits = httpx.Limits(max_connections=args.max_inflight, max_keepalive_connections=args.max_inflight)
+
+    if args.url:
+        async with httpx.AsyncClient(base_url=args.url, timeout=timeout, limits=limits) as client:
+            if args.preload:
+                await preload(client, workload, args.preload)
+            elapsed = await drive(client, workload, args, results)
+    else:
+        sys.path.insert(0, ROOT)
+        import backend.main as brain
+        brain.DB_PATH = os.path.join(tempfile.mkdtemp(prefix="nexus_load_"), "vault.db")
+        async with brain.app.router.lifespan_context(brain.app):
+            transport = httpx.ASGITransport(app=brain.app)
+            async with httpx.AsyncClient(transport=transport, base_url="http://bench", timeout=timeout) as client:
+                if args.preload:
+                    await preload(client, workload, args.preload)
+                elapsed = await drive(client, workload, args, results)
+
+    measured = sum(h.count for h in results.latency.values())
+    overall = LogHistogram()
+    for hist in results.latency.values():
+        overall.buckets.update(hist.buckets)
+        overall.count += hist.count
+        overall.total += hist.total
+        overall.min, overall.max = min(overall.min, hist.min), max(overall.max, hist.max)
+    return {
+        "meta": {
+            "commit": _git_commit(),
+            "timestamp": time.strftime("%Y-%m-%dT%H:%M:%SZ", time.gmtime()),
+            "python": platform.python_version(),
+            "cpus": os.cpu_count(),
+            "mode": "http" if args.url else "asgi",
+            "args": vars(args),
+        },
+        "offered_rate": args.rate,
+        "achieved_rate": round(measured / max(1e-9, elapsed - args.warmup), 1),
+        "dropped": results.dropped,
+        "max_schedule_lag_ms": round(results.max_lag_ms, 3),
+        "overall": overall.summary(),
+        "routes": {
+            route: {
+                "latency": results.latency[route].summary(),
+                "service": results.service[route].summary(),
+                "status": {str(k): v for k, v in results.status[route].items()},
+                "buckets_us": results.latency[route].export(),
+            }
+            for route in ROUTES if route in results.latency
+        },
+    }
+
+def _git_commit():
+    try:
+        return subprocess.run(["git", "rev-parse", "--short", "HEAD"], cwd=ROOT, capture_output=True,
+                              text=True, timeout=5).stdout.strip() or None
+    except (OSError, subprocess.SubprocessError):
+        return None
+
+def print_report(report: dict) -> None:
+    meta = report["meta"]
+    print("=" * 78)
+    print(f"🧪 mode={meta['mode']} profile={meta['args']['profile']} rate={report['offered_rate']}/s "
+          f"achieved={report['achieved_rate']}/s commit={meta['commit']} cpus={meta['cpus']}")
+    if report["dropped"] or report["max_schedule_lag_ms"] > 10:
+        print(f"⚠️ generator saturated: dropped={report['dropped']} max lag={report['max_schedule_lag_ms']}ms")
+    for route, data in report["routes"].items():
+        lat = data["latency"]
+        errors = sum(v for k, v in data["status"].items() if k != "200")
+        print(f"📊 {route:<14} n={lat['count']:<7} p50={lat.get('p50_ms', 0):8.2f}ms p99={lat.get('p99_ms', 0):8.2f}ms "
+              f"p99.9={lat.get('p99.9_ms', 0):8.2f}ms max={lat.get('max_ms', 0):8.2f}ms errors={errors}")
+    print("=" * 78)
+
+def main():
+    parser = argparse.ArgumentParser(description="Open-loop, constant-arrival-rate load benchmark.")
+    parser.add_argument("--url", help="Target a running node instead of the in-process ASGI app.")
+    parser.add_argument("--profile", choices=sorted(PROFILES), default="mixed")
+    parser.add_argument("--rate", type=float, default=500.0, help="Requests per second (arrival rate).")
+    parser.add_argument("--duration", type=float, default=30.0, help="Seconds of load, warmup included.")
+    parser.add_argument("--warmup", type=float, default=2.0, help="Leading seconds excluded from results.")
+    parser.add_argument("--users", type=int, default=10000, help="Distinct sovereign ids.")
+    parser.add_argument("--skew", type=float, default=1.1, help="Zipf exponent of per-user activity (0 = uniform).")
+    parser.add_argument("--preload", type=int, default=0, help="Splits to seed before measuring.")
+    parser.add_argument("--seed", type=int, default=1, help="RNG seed (same seed = same request sequence).")
+    parser.add_argument("--max-inflight", type=int, default=1000, help="Requests in flight before arrivals are dropped.")
+    parser.add_argument("--timeout", type=float, default=15.0)
+    parser.add_argument("--json", help="Write the full report here ('-' for stdout).")
+    args = parser.parse_args()
+    if args.warmup >= args.duration:
+        parser.error("--warmup must be shorter than --duration")
+
+    report = asyncio.run(run(args))
+    print_report(report)
+    if args.json == "-":
+        json.dump(report, sys.stdout, indent=2)
+        print()
+    elif args.json:
+        with open(args.json, "w") as f:
+            json.dump(report, f, indent=2)
+        print(f"💾 Report written to {args.json}")
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,297 @@
+# Copyright 2026 Coreframe Systems (Nexus Protocol)
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#        http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+
+"""
+🏛️ NEXUS VAULT ADMIN
+
+Maintenance commands for the Sovereign Vault. Every command is one-shot and
+safe to run against a live node: mutations take the SQLite write lock for a
+single transaction, checks only read.
+
+Usage:
+    python scripts/vault_admin.py rebuild-balances [--db PATH]
+    python scripts/vault_admin.py check-balances   [--db PATH]
+    python scripts/vault_admin.py rebuild-merkle   [--db PATH]
+    python scripts/vault_admin.py verify-merkle    [--db PATH]
+    python scripts/vault_admin.py rebuild-rollups  [--db PATH]
+    python scripts/vault_admin.py check-rollups    [--db PATH]
+    python scripts/vault_admin.py migrate-minor-units [--scale 100] [--chunk 10000] [--db PATH]
+    python scripts/vault_admin.py migrate-timestamps [--finalize] [--chunk 10000] [--db PATH]
+
+    python scripts/vault_admin.py seal-segments [--hot-days 90] [--archive-dir DIR] [--db PATH]
+    python scripts/vault_admin.py verify-segments [--db PATH]
+    python scripts/vault_admin.py reshard --to K --renumber [--shards K_OLD] [--db PATH]
+
+    python scripts/vault_admin.py snapshot [--dir DIR] [--pages 256] [--sleep-ms 5] [--db PATH]
+    python scripts/vault_admin.py restore-snapshot [--from SNAPSHOT_DIR] [--db PATH]
+
+On a sharded vault (`--shards K`, default NEXUS_VAULT_SHARDS) every per-file
+command runs once per shard file; `reshard` rewrites the whole layout and must
+run with the node stopped. It gives every row a new id, so it refuses to run
+without `--renumber`; ids issued before it stay provable through
+`/api/proof/{id}?shard=&layout=K_OLD`.
+
+`snapshot` copies every shard (and its sealed segments) through the SQLite
+online backup API and is safe against a live node; `restore-snapshot`
+verifies a snapshot against its manifest and swaps it in with the node
+stopped (default: the newest snapshot).
+
+`migrate-minor-units` rewrites the ledger and must run with the node stopped.
+It commits per chunk and resumes after an interruption. `migrate-timestamps`
+copies the ledger into integer-microsecond form against a live node (re-run it
+to catch up); `--finalize` copies the tail and swaps the tables with the node
+stopped. `seal-segments` is safe against a live node (e.g. from a daily cron).
+"""
+
+import argparse
+import os
+import sqlite3
+import sys
+
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), "..")))
+from backend.vault import ensure_balances, rebuild_balances, check_balances  # noqa: E402
+from backend.merkle import ensure_merkle, save_frontier, verify_frontier  # noqa: E402
+from backend.units import MIGRATION_CHUNK, migrate_timestamps, migrate_to_minor_units  # noqa: E402
+from backend.segments import HOT_DAYS, ARCHIVE_DIR, iter_ledger, seal_segments, verify_segments  # noqa: E402
+from backend.rollups import ensure_rollups, rebuild_rollups, check_rollups  # noqa: E402
+from backend.shards import VAULT_SHARDS, RESHARD_CHUNK, reshard, shard_paths  # noqa: E402
+from backend import snapshots  # noqa: E402
+
+BASE_DIR = os.path.dirname(os.path.abspath(__file__))
+DB_PATH = os.path.abspath(os.path.join(BASE_DIR, "..", "backend", "nexus_vault.db"))
+
+def cmd_rebuild_balances(conn: sqlite3.Connection, args) -> int:
+    with conn:
+        ensure_balances(conn)
+        users = rebuild_balances(conn)
+    print(f"🧮 [OK] Balances rebuilt for {users} sovereign ids.")
+    return 0
+
+def cmd_check_balances(conn: sqlite3.Connection, args) -> int:
+    drift = check_balances(conn)
+    if not drift:
+        print("✅ [OK] Balances consistent with ledger.")
+        return 0
+    for entry in drift:
+        print(f"❌ [DRIFT] {entry['user_id']}: ledger={entry['ledger']} balances={entry['balances']}")
+    print(f"⚠️ {len(drift)} drifted ids. Run 'rebuild-balances' to repair.")
+    return 1
+
+def cmd_rebuild_rollups(conn: sqlite3.Connection, args) -> int:
+    with conn:
+        ensure_rollups(conn)
+        rows = rebuild_rollups(conn)
+    print(f"📅 [OK] Hour/day rollups rebuilt over {rows} ledger rows (hot + sealed).")
+    return 0
+
+def cmd_check_rollups(conn: sqlite3.Connection, args) -> int:
+    problems = check_rollups(conn)
+    for problem in problems[:50]:
+        print(f"❌ [DRIFT] {problem}")
+    if problems:
+        print(f"⚠️ {len(problems)} drifted buckets. Run 'rebuild-rollups' to repair.")
+        return 1
+    print("✅ [OK] Rollups consistent with ledger.")
+    return 0
+
+def _describe(label, acc) -> None:
+    print(f"   {label:<8} size={acc.size} last_id={acc.last_tx_id} root={acc.root()}")
+
+def cmd_verify_merkle(conn: sqlite3.Connection, args) -> int:
+    match, rebuilt, stored = verify_frontier(conn, iter_ledger(conn))
+    _describe("ledger", rebuilt)
+    _describe("stored", stored)
+    if match:
+        print("✅ [OK] Stored Merkle frontier matches the ledger.")
+        return 0
+    print("❌ [DRIFT] Stored Merkle frontier diverges. Run 'rebuild-merkle' to repair.")
+    return 1
+
+def cmd_rebuild_merkle(conn: sqlite3.Connection, args) -> int:
+    with conn:
+        ensure_merkle(conn)
+        match, rebuilt, stored = verify_frontier(conn, iter_ledger(conn))
+        save_frontier(conn, rebuilt)
+    _describe("ledger", rebuilt)
+    if not match:
+        _describe("replaced", stored)
+    print(f"🌳 [OK] Merkle frontier rebuilt ({'unchanged' if match else 'repaired'}).")
+    return 0
+
+def cmd_migrate_minor_units(conn: sqlite3.Connection, args) -> int:
+    try:
+        result = migrate_to_minor_units(
+            conn, args.scale, args.chunk, progress=lambda n: print(f"   copied {n} rows", end="\r")
+        )
+    except ValueError as e:
+        print(f"❌ [REFUSED] {e}")
+        return 1
+    print(f"💱 [OK] {result['rows']} rows converted to INTEGER x{result['scale']} "
+          f"({result['rounded']} amounts rounded to the scale).")
+    print(f"   old root={result['old_root']}")
+    print(f"   new root={result['new_root']}")
+    return 0
+
+def cmd_migrate_timestamps(conn: sqlite3.Connection, args) -> int:
+    try:
+        result = migrate_timestamps(
+            conn, args.chunk, args.finalize, progress=lambda n: print(f"   copied {n} rows", end="\r")
+        )
+    except ValueError as e:
+        print(f"❌ [REFUSED] {e}")
+        return 1
+    if not result["finalized"]:
+        print(f"🕒 [OK] {result['rows']} rows copied to INTEGER µs ({result['pending']} committed since). "
+              "Re-run to catch up; stop the node and run with --finalize to switch.")
+        return 0
+    print(f"🕒 [OK] Ledger switched to INTEGER µs timestamps ({result['rows']} rows copied in the final pass); "
+          "index rebuilt.")
+    print(f"   root={result['root']} (unchanged)")
+    return 0
+
+def cmd_seal_segments(conn: sqlite3.Connection, args) -> int:
+    # Sealed file names are per month: each shard gets its own archive directory
+    archive_dir = args.archive_dir if args.shards == 1 else os.path.join(args.archive_dir, f"shard{args.shard}")
+    sealed = seal_segments(conn, args.hot_days, archive_dir)
+    for meta in sealed:
+        print(f"🧊 [SEALED] {meta['month']}: {meta['tx_count']} rows -> {meta['path']} root={meta['root']}")
+    print(f"✅ [OK] {len(sealed)} segments sealed (hot window: {args.hot_days} days).")
+    return 0
+
+def cmd_verify_segments(conn: sqlite3.Connection, args) -> int:
+    problems = verify_segments(conn)
+    for problem in problems:
+        print(f"❌ [DRIFT] {problem}")
+    if problems:
+        return 1
+    print("✅ [OK] Sealed segments match their recorded roots and archive totals.")
+    return 0
+
+def run_reshard(args) -> int:
+    if not args.renumber:
+        print("❌ [REFUSED] Resharding gives every transaction a new id, so tx ids and proofs held by clients change.")
+        print(f"   Old ids stay resolvable via /api/proof/{{id}}?shard=i&layout={args.shards}. Re-run with --renumber.")
+        return 1
+    try:
+        result = reshard(args.db, args.shards, args.to, args.chunk, renumber=True,
+                         progress=lambda n: print(f"   moved {n} rows", end="\r"))
+    except ValueError as e:
+        print(f"❌ [REFUSED] {e}")
+        return 1
+    print(f"🔀 [OK] {result['rows']} rows resharded {args.shards} -> {args.to}. Sources kept in {result['backup_dir']}")
+    for path, root in zip(result["targets"], result["new_roots"]):
+        print(f"   {os.path.basename(path)} root={root}")
+    print(f"   Start the node with NEXUS_VAULT_SHARDS={args.to}.")
+    return 0
+
+def run_snapshot(args) -> int:
+    root = snapshots.snapshot_root(args.db, args.dir)  # An absolute --dir is used as-is
+    os.makedirs(root, exist_ok=True)
+    manifest = snapshots.take_snapshot(shard_paths(args.db, args.shards), root, args.pages, args.sleep_ms, args.keep)
+    for entry in manifest["files"]:
+        copy = entry["copy"]
+        print(f"📸 [COPIED] {entry['file']}: {copy['bytes'] / 1e6:.1f} MB in {copy['seconds']}s "
+              f"({copy['mb_per_s']} MB/s, {copy['steps']} steps) max_id={entry['max_id']} root={entry['merkle_root']}")
+    print(f"✅ [OK] Snapshot written to {manifest['path']} in {manifest['seconds']}s.")
+    return 0
+
+def run_restore_snapshot(args) -> int:
+    snapshot = args.source
+    if snapshot is None:
+        available = snapshots.list_snapshots(snapshots.snapshot_root(args.db))
+        if not available:
+            print("Error: No snapshots found.")
+            return 2
+        snapshot = available[0]
+    expected = sorted(os.path.basename(p) for p in shard_paths(args.db, args.shards))
+    files = sorted(entry["file"] for entry in snapshots.load_manifest(snapshot)["files"])
+    if files != expected:
+        print(f"❌ [REFUSED] Snapshot holds {files}, vault layout expects {expected} (check --shards).")
+        return 1
+    try:
+        result = snapshots.restore_snapshot(snapshot, os.path.dirname(os.path.abspath(args.db)))
+    except ValueError as e:
+        print(f"❌ [REFUSED] {e}")
+        return 1
+    print(f"♻️ [OK] Restored {result['snapshot']} ({len(result['files'])} files). "
+          f"Previous files kept in {result['moved_aside']}")
+    return 0
+
+COMMANDS = {
+    "rebuild-balances": (cmd_rebuild_balances, "Recompute the materialized balances from the raw ledger."),
+    "check-balances": (cmd_check_balances, "Compare materialized balances against the raw ledger."),
+    "rebuild-rollups": (cmd_rebuild_rollups, "Recompute the hour/day rollups from the ledger (hot + sealed)."),
+    "check-rollups": (cmd_check_rollups, "Compare the hour/day rollups against the ledger."),
+    "rebuild-merkle": (cmd_rebuild_merkle, "Stream the ledger in id order and rewrite the Merkle frontier."),
+    "verify-merkle": (cmd_verify_merkle, "Stream the ledger and compare its root with the stored frontier."),
+    "migrate-minor-units": (cmd_migrate_minor_units, "Convert REAL amounts to INTEGER minor units (node stopped)."),
+    "migrate-timestamps": (cmd_migrate_timestamps, "Copy TEXT timestamps to INTEGER microseconds (--finalize: node stopped)."),
+    "seal-segments": (cmd_seal_segments, "Move months older than the hot window into sealed archive files."),
+    "verify-segments": (cmd_verify_segments, "Recompute sealed segment roots and archive totals."),
+    "reshard": (None, "Rewrite the vault into a different number of shard files (node stopped)."),
+    "snapshot": (None, "Online backup of every shard into a timestamped snapshot directory."),
+    "restore-snapshot": (None, "Verify a snapshot and swap it in for the live files (node stopped)."),
+}
+
+def main(argv=None) -> int:
+    parser = argparse.ArgumentParser(description="Nexus Sovereign Vault maintenance.")
+    parser.add_argument("--db", default=DB_PATH, help="Path to the vault database.")
+    parser.add_argument("--shards", type=int, default=VAULT_SHARDS, help="Shard count of the vault at --db.")
+    sub = parser.add_subparsers(dest="command", required=True)
+    commands = {name: sub.add_parser(name, help=help_text) for name, (_, help_text) in COMMANDS.items()}
+    commands["migrate-minor-units"].add_argument("--scale", type=int, default=100, help="Minor units per unit.")
+    commands["migrate-minor-units"].add_argument("--chunk", type=int, default=MIGRATION_CHUNK, help="Rows per transaction.")
+    commands["migrate-timestamps"].add_argument("--chunk", type=int, default=MIGRATION_CHUNK, help="Rows per transaction.")
+    commands["migrate-timestamps"].add_argument("--finalize", action="store_true", help="Copy the tail and swap tables.")
+    commands["seal-segments"].add_argument("--hot-days", type=int, default=HOT_DAYS, help="Days kept in the hot vault.")
+    commands["seal-segments"].add_argument("--archive-dir", default=ARCHIVE_DIR, help="Sealed file directory.")
+    commands["reshard"].add_argument("--to", type=int, required=True, help="Target shard count.")
+    commands["reshard"].add_argument("--chunk", type=int, default=RESHARD_CHUNK, help="Rows buffered per write.")
+    commands["reshard"].add_argument("--renumber", action="store_true", help="Acknowledge that every tx id changes.")
+    commands["snapshot"].add_argument("--dir", default=snapshots.SNAPSHOT_DIR, help="Snapshot directory (relative to the vault).")
+    commands["snapshot"].add_argument("--pages", type=int, default=snapshots.SNAPSHOT_PAGES, help="Pages copied per step.")
+    commands["snapshot"].add_argument("--sleep-ms", type=float, default=snapshots.SNAPSHOT_SLEEP_MS, help="Pause between steps.")
+    commands["snapshot"].add_argument("--keep", type=int, default=snapshots.SNAPSHOT_KEEP, help="Snapshots retained.")
+    commands["restore-snapshot"].add_argument("--from", dest="source", help="Snapshot directory (default: newest).")
+    args = parser.parse_args(argv)
+
+    if args.command == "reshard":
+        return run_reshard(args)
+    if args.command == "snapshot":
+        return run_snapshot(args)
+    if args.command == "restore-snapshot":
+        return run_restore_snapshot(args)
+
+    paths = shard_paths(args.db, args.shards)
+    for path in paths:
+        if not os.path.exists(path):
+            print(f"Error: Vault not found at {path}")
+            return 2
+    status = 0
+    for args.shard, path in enumerate(paths):
+        if len(paths) > 1:
+            print(f"🔀 [SHARD {args.shard}] {path}")
+        conn = sqlite3.connect(path, timeout=30.0)
+        try:
+            handler, _ = COMMANDS[args.command]
+            status = max(status, handler(conn, args))
+        except sqlite3.Error as e:
+            print(f"Database Error: {e}")
+            status = 1
+        finally:
+            conn.close()
+    return status
+
+if __name__ == "__main__":
+    sys.exit(main())